@@ -0,0 +1,272 @@
+"""
+Benchmark every solver on CVRPLIB / Solomon instances, as text files or
+compiled bundles (python -m vrp_core.bundle), which are memory-mapped.
+
+    python benchmarks/benchmark.py INSTANCE_DIR --out results.csv \
+        --solvers ALNS LNS VNS SA --seeds 0 1 2 --budget 10 --time-limit 60
+
+Each (instance, solver, seed) run happens in a fresh process, so peak RSS
+is the run's own, and a run that exceeds --time-limit is killed and
+recorded as "timeout". --budget instead stops the metaheuristics
+gracefully (vrp_core.Termination) and keeps their incumbent. A
+`<name>.sol` next to an instance supplies the best-known cost for the
+gap; infeasible runs get no gap. Solvers that ignore time windows (all
+but CG) are recorded as "unsupported" on VRPTW instances. Results go to
+CSV or JSON (by extension), tagged with the current git commit so runs
+can be compared across commits.
+--decompose N runs the solver on sub-instances of about N customers in
+parallel worker processes (vrp_core.Decomposition), for large instances.
+"""
+import argparse
+import contextlib
+import functools
+import csv
+import importlib.util
+import json
+import math
+import multiprocessing as mp
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from vrp_core import (Decomposition, GreenCost, Termination, is_bundle, read_instance, read_solution,
+                      route_feasible)
+
+INSTANCE_EXTENSIONS = (".vrp", ".txt")
+FIELDS = ["commit", "instance", "n", "solver", "seed", "iterations", "status", "stop_reason", "cost",
+          "distance", "feasible", "bks", "gap", "wall_time", "evals_per_sec", "peak_rss_mb"]
+
+
+# ===========================
+# Solver adapters
+# ===========================
+# The scripts keep their instance in module globals; each adapter loads the
+# script, points those globals at the benchmark instance and runs it.
+# Adapters return (routes, objective reported by the solver).
+def _load_script(relpath):
+    path = os.path.join(ROOT, relpath)
+    name = os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _use_instance(module, instance):
+    module.instance = instance
+    module.customers = list(range(instance.n))
+    module.demand = {i: int(d) for i, d in enumerate(instance.demand)}
+    module.vehicle_capacity = instance.capacity
+
+
+def run_alns(instance, iterations, termination=None):
+    module = _load_script("paper3_network_vrp/ALNS.py")
+    _use_instance(module, instance)
+    n_remove = max(1, (instance.n - 1) // 10)
+    return module.ALNS(max_iterations=iterations, n_remove=n_remove, termination=termination)
+
+
+def run_lns(instance, iterations, termination=None):
+    module = _load_script("paper4_general_gvrp/LNS_for_generalvrp.py")
+    _use_instance(module, instance)
+    return module.LNS(max_iterations=iterations, destroy_fraction=0.2, termination=termination)
+
+
+def run_vns(instance, iterations, termination=None):
+    module = _load_script("paper4_general_gvrp/VSN.py")
+    _use_instance(module, instance)
+    return module.VNS(max_iterations=iterations, granular_k=min(10, instance.n - 2),
+                      termination=termination)
+
+
+def run_sa(instance, iterations, termination=None):
+    module = _load_script("paper2_gvrp_survey/GVRP_SA.py")
+    coords = instance.coords if instance.coords is not None else np.zeros((instance.n, 2))
+    module.instance = instance
+    module.customers = [(i, int(instance.demand[i]), x, y) for i, (x, y) in enumerate(coords)]
+    module.vehicle_capacity = instance.capacity
+    module.num_vehicles = max(2, math.ceil(instance.demand.sum() / instance.capacity))
+    # benchmark instances have no refuelling stations: no range limit
+    module.green = GreenCost(instance, module.fuel_model)
+    return module.simulated_annealing(max_iter=iterations, termination=termination)
+
+
+def run_column_generation(instance, iterations, termination=None):
+    # LP relaxation only: the returned cost is a lower bound, with no routes;
+    # column generation has no anytime stop, so termination is ignored
+    module = _load_script("paper3_network_vrp/column_generation.py")
+    _use_instance(module, instance)
+    model, _, _ = module.column_generation(module.initial_routes(instance), max_iterations=iterations)
+    return None, model.objective.value()
+
+
+SOLVERS = {
+    "ALNS": run_alns,
+    "LNS": run_lns,
+    "VNS": run_vns,
+    "SA": run_sa,
+    "CG": run_column_generation,
+}
+
+# solvers that model time windows; the others are not run on VRPTW instances.
+# CG prices with the instance's windows; the metaheuristics' moves and
+# insertions only check capacity.
+TIME_WINDOW_SOLVERS = {"CG"}
+
+
+# ===========================
+# Single run (child process)
+# ===========================
+def has_time_windows(instance):
+    return bool(np.isfinite(instance.due).any() or (instance.ready > 0).any())
+
+
+def check_routes(instance, routes):
+    """Every customer exactly once, no route over capacity or outside a time window."""
+    visited = sorted(c for route in routes for c in route[1:-1])
+    if visited != list(range(1, instance.n)):
+        return False
+    if not all(instance.route_load(route) <= instance.capacity for route in routes):
+        return False
+    return not has_time_windows(instance) or all(route_feasible(instance, r) for r in routes)
+
+
+def _run(path, solver, seed, iterations, budget, decompose, conn):
+    random.seed(seed)
+    np.random.seed(seed)
+    instance = read_instance(path)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        termination = Termination(time_limit=budget) if budget else None
+        if decompose:
+            # sub-instances of `decompose` customers, `iterations` each
+            run = functools.partial(SOLVERS[solver], iterations=iterations)
+            routes, cost, _ = Decomposition(instance, run, size=decompose, seed=seed).solve(
+                termination=termination, verbose=False)
+        else:
+            routes, cost = SOLVERS[solver](instance, iterations, termination)
+    wall_time = time.perf_counter() - start
+    done = iterations
+    if termination is not None and termination.reason is not None:
+        # stopped early: count only the iterations actually run
+        done = termination.iteration
+    row = {"n": instance.n, "cost": cost, "wall_time": wall_time,
+           "stop_reason": termination.reason if termination is not None else None,
+           "evals_per_sec": done / wall_time if done and wall_time > 0 else None,
+           # ru_maxrss is in KiB on Linux
+           "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if routes is not None:
+        routes = [list(map(int, r)) for r in routes if len(r) > 2]
+        row["distance"] = sum(instance.route_cost(r) for r in routes)
+        row["feasible"] = check_routes(instance, routes)
+    conn.send(row)
+    conn.close()
+
+
+def run_one(path, solver, seed, iterations, time_limit=None, budget=None, decompose=None):
+    """
+    (instance, solver, seed) in its own process. `iterations` and the
+    `budget` in seconds are handed to the solver; evals_per_sec counts one
+    candidate solution per iteration. A run still going after `time_limit`
+    is killed. With decompose, the solver runs on sub-instances of that many
+    customers through vrp_core.Decomposition.
+    """
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run, args=(path, solver, seed, iterations, budget, decompose, child))
+    proc.start()
+    child.close()
+    row = {"instance": os.path.basename(path), "solver": solver, "seed": seed, "iterations": iterations}
+    if not parent.poll(time_limit):
+        row["status"] = "timeout"
+    else:
+        try:
+            row.update(parent.recv(), status="ok")
+        except EOFError:
+            # the child died before reporting
+            row["status"] = "error"
+    proc.kill()
+    proc.join()
+    return row
+
+
+# ===========================
+# Suite
+# ===========================
+def best_known(path):
+    sol = os.path.splitext(path)[0] + ".sol"
+    return read_solution(sol)[1] if os.path.exists(sol) else None
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(instance_dir, solvers=None, seeds=(0,), iterations=1000, time_limit=None, budget=None,
+              decompose=None):
+    paths = sorted(os.path.join(instance_dir, f) for f in os.listdir(instance_dir)
+                   if f.endswith(INSTANCE_EXTENSIONS) or is_bundle(os.path.join(instance_dir, f)))
+    commit = git_commit()
+    rows = []
+    for path in paths:
+        bks = best_known(path)
+        time_windows = has_time_windows(read_instance(path))
+        for solver in solvers or SOLVERS:
+            for seed in seeds:
+                if time_windows and solver not in TIME_WINDOW_SOLVERS:
+                    # its routes would ignore the windows: no meaningful cost or gap
+                    row = {"instance": os.path.basename(path), "solver": solver, "seed": seed,
+                           "iterations": iterations, "status": "unsupported"}
+                else:
+                    row = run_one(path, solver, seed, iterations, time_limit, budget, decompose)
+                row["commit"], row["bks"] = commit, bks
+                value = row.get("distance", row.get("cost"))
+                if bks and value is not None and row.get("feasible") is not False:
+                    row["gap"] = (value - bks) / bks
+                rows.append(row)
+                print(", ".join(f"{k}={row.get(k)}" for k in ("instance", "solver", "seed", "status", "gap", "wall_time")))
+    return rows
+
+
+def write_results(rows, out):
+    if out.endswith(".json"):
+        with open(out, "w") as f:
+            json.dump(rows, f, indent=2)
+        return
+    with open(out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row.get(k) for k in FIELDS})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("instance_dir")
+    parser.add_argument("--out", default="benchmark_results.csv")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--time-limit", type=float, default=None, help="kill a run after this many seconds")
+    parser.add_argument("--budget", type=float, default=None, help="solver time budget in seconds")
+    parser.add_argument("--decompose", type=int, default=None,
+                        help="solve sub-instances of this many customers in parallel")
+    args = parser.parse_args(argv)
+    rows = run_suite(args.instance_dir, args.solvers, args.seeds, args.iterations, args.time_limit,
+                     args.budget, args.decompose)
+    write_results(rows, args.out)
+
+
+if __name__ == "__main__":
+    main()
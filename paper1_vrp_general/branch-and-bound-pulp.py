@@ -1,3 +1,4 @@
+import highspy
 import pulp
 import networkx as nx
 import matplotlib.pyplot as plt
@@ -9,17 +10,13 @@ best_solution = ((None, None), float('-inf'))
 node_values = {}
 
 
-def branch_and_bound(x1_range=(0, None), x2_range=(0, None)):
-    global node_counter, best_solution, edges, node_values
-
+def build_model():
     # Create the PuLP problem
     U34 = pulp.LpProblem("U34", pulp.LpMaximize)
 
     # Define variables with bounds
-    x1 = pulp.LpVariable('x1', lowBound=x1_range[0],
-                         upBound=x1_range[1] if x1_range[1] is not None else None)
-    x2 = pulp.LpVariable('x2', lowBound=x2_range[0],
-                         upBound=x2_range[1] if x2_range[1] is not None else None)
+    x1 = pulp.LpVariable('x1', lowBound=0)
+    x2 = pulp.LpVariable('x2', lowBound=0)
 
     # Constraints
     U34 += 50 * x1 + 31 * x2 <= 250
@@ -27,17 +24,73 @@ def branch_and_bound(x1_range=(0, None), x2_range=(0, None)):
 
     # Objective function
     U34 += x1 + 0.64 * x2
+    return U34
+
+
+class NodeLP:
+    """
+    LP relaxation of a PuLP model loaded once into an in-process HiGHS
+    instance. Nodes only change column bounds and re-solve, warm-started
+    from the basis of their parent; no MPS file or CBC process per node.
+    """
+
+    def __init__(self, problem):
+        self.names = [v.name for v in problem.variables()]
+        index = {name: k for k, name in enumerate(self.names)}
+        self.highs = highspy.Highs()
+        self.highs.setOptionValue("output_flag", False)
+        inf = highspy.kHighsInf
+        for v in problem.variables():
+            self.highs.addVar(-inf if v.lowBound is None else v.lowBound,
+                              inf if v.upBound is None else v.upBound)
+        for v, coef in problem.objective.items():
+            self.highs.changeColCost(index[v.name], coef)
+        self.highs.changeObjectiveOffset(problem.objective.constant)
+        sense = highspy.ObjSense.kMaximize if problem.sense == pulp.LpMaximize else highspy.ObjSense.kMinimize
+        self.highs.changeObjectiveSense(sense)
+        for constraint in problem.constraints.values():
+            rhs = -constraint.constant
+            lower = rhs if constraint.sense in (pulp.LpConstraintGE, pulp.LpConstraintEQ) else -inf
+            upper = rhs if constraint.sense in (pulp.LpConstraintLE, pulp.LpConstraintEQ) else inf
+            cols = [index[v.name] for v in constraint.keys()]
+            self.highs.addRow(lower, upper, len(cols), np.array(cols, dtype=np.int32),
+                              np.array(list(constraint.values()), dtype=np.float64))
+
+    def solve(self, bounds, basis=None):
+        """
+        Re-solve with `bounds` ({name: (low, up)}, None = unbounded).
+        Returns (values by name, objective, basis) or None if infeasible.
+        """
+        inf = highspy.kHighsInf
+        for name, (low, up) in bounds.items():
+            self.highs.changeColBounds(self.names.index(name),
+                                       -inf if low is None else low, inf if up is None else up)
+        if basis is not None:
+            self.highs.setBasis(basis)
+        self.highs.run()
+        if self.highs.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+            return None
+        # + 0.0 turns HiGHS' -0.0 into 0.0
+        values = {name: v + 0.0 for name, v in zip(self.names, self.highs.getSolution().col_value)}
+        return values, self.highs.getInfo().objective_function_value, self.highs.getBasis()
+
+
+node_lp = NodeLP(build_model())
+
+
+def branch_and_bound(x1_range=(0, None), x2_range=(0, None), basis=None):
+    global node_counter, best_solution, edges, node_values
 
-    # Solve using the default CBC solver
-    U34.solve(pulp.PULP_CBC_CMD(msg=0))
+    # Re-solve the shared LP with this node's bounds, from the parent's basis
+    result = node_lp.solve({'x1': x1_range, 'x2': x2_range}, basis)
 
     node_id = node_counter
     node_counter += 1
 
-    if pulp.LpStatus[U34.status] == "Optimal":
-        x1_val = pulp.value(x1)
-        x2_val = pulp.value(x2)
-        objective = pulp.value(U34.objective)
+    if result is not None:
+        values, objective, basis = result
+        x1_val = values['x1']
+        x2_val = values['x2']
 
         node_values[node_id] = (round(x1_val, 2), round(x2_val, 2), round(objective, 2))
 
@@ -48,16 +101,16 @@ def branch_and_bound(x1_range=(0, None), x2_range=(0, None)):
         if not float(x1_val).is_integer():
             x1_floor = int(np.floor(x1_val))
             edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=(x1_range[0], x1_floor), x2_range=x2_range)
+            branch_and_bound(x1_range=(x1_range[0], x1_floor), x2_range=x2_range, basis=basis)
             edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=(x1_floor + 1, x1_range[1]), x2_range=x2_range)
+            branch_and_bound(x1_range=(x1_floor + 1, x1_range[1]), x2_range=x2_range, basis=basis)
 
         if not float(x2_val).is_integer():
             x2_floor = int(np.floor(x2_val))
             edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=x1_range, x2_range=(x2_range[0], x2_floor))
+            branch_and_bound(x1_range=x1_range, x2_range=(x2_range[0], x2_floor), basis=basis)
             edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=x1_range, x2_range=(x2_floor + 1, x2_range[1]))
+            branch_and_bound(x1_range=x1_range, x2_range=(x2_floor + 1, x2_range[1]), basis=basis)
 
 
 def visualize_tree(edges, node_values):
@@ -78,10 +131,11 @@ def visualize_tree(edges, node_values):
     plt.show()
 
 
-# Run the Branch-and-Bound algorithm
-branch_and_bound()
+if __name__ == "__main__":
+    # Run the Branch-and-Bound algorithm
+    branch_and_bound()
 
-print(f"Best integer result: x={best_solution[0][0]}, y={best_solution[0][1]}")
+    print(f"Best integer result: x={best_solution[0][0]}, y={best_solution[0][1]}")
 
-# Visualize the tree
-visualize_tree(edges, node_values)
+    # Visualize the tree
+    visualize_tree(edges, node_values)
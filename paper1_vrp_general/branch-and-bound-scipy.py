@@ -1,59 +1,116 @@
+import heapq
+import itertools
+
 import numpy as np
 from scipy.optimize import linprog
 import matplotlib.pyplot as plt
 import networkx as nx
 import matplotlib.patches as mpatches
 
-node_counter = 0
-edges = []
-best_solution = ((None, None), float('-inf')) 
-node_values = {}
-
+# Problem: maximize x1 + 0.64 x2 (linprog minimizes, hence the sign)
+c = [-1, -0.64]
+A_ub = [[50, 31], [-3, 2]]
+b_ub = [250, 4]
 
-def branch_and_bound(x1_range=(0, None), x2_range=(0, None)):
-    global node_counter, best_solution, edges, node_values
+NODE_SELECTION = ("best-first", "depth-first", "best-estimate")
 
-    c = [-1, -0.64]
-    A_ub = [[50, 31], [-3, 2]]
-    b_ub = [250, 4]
-
-    bounds = [x1_range, x2_range]
 
+def solve_node(bounds):
     res = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
-
-    node_id = node_counter
-    node_counter += 1
-
-    if res.success:
-        x1_val, x2_val = res.x
-        objective = -res.fun  
-
-        
-        node_values[node_id] = (round(x1_val, 2), round(x2_val, 2), round(objective, 2))
-
-       
-        if x1_val.is_integer() and x2_val.is_integer() and objective > best_solution[1]:
-            best_solution = ((x1_val, x2_val), objective)
-
-   
-        if not x1_val.is_integer():
-            x1_floor = int(np.floor(x1_val))
-            edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=(0, x1_floor), x2_range=x2_range)
-            edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=(x1_floor+1, None), x2_range=x2_range)
-
-        
-        if not x2_val.is_integer():
-            x2_floor = int(np.floor(x2_val))
-            edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=x1_range, x2_range=(0, x2_floor))
-            edges.append((node_id, node_counter))
-            branch_and_bound(x1_range=x1_range, x2_range=(x2_floor+1, None))
+    if not res.success:
+        return None, None
+    return res.x, -res.fun
+
+
+def most_fractional(x, tol):
+    frac = np.abs(x - np.round(x))
+    k = int(np.argmax(frac))
+    return k if frac[k] > tol else None
+
+
+def branch_and_bound(bounds=((0, None), (0, None)), strategy="best-first", node_limit=None, tol=1e-6):
+    """
+    Branch-and-bound over an explicit node queue.
+
+    strategy: "best-first" pops the node with the largest LP bound,
+        "depth-first" the newest node, and "best-estimate" the node with the
+        largest bound minus a pseudocost estimate of the cost of integrality.
+    Nodes whose bound cannot beat the incumbent are pruned, and each node
+    branches on its most fractional variable only. node_limit caps the
+    number of node LPs solved.
+
+    Returns (best_solution, stats, edges, node_values); best_solution is
+    ((x1, x2), objective) and stats holds the explored/pruned/open node
+    counts and the final gap.
+    """
+    if strategy not in NODE_SELECTION:
+        raise ValueError(f"strategy must be one of {NODE_SELECTION}")
+    best_solution = ((None, None), float('-inf'))
+    edges = []
+    node_values = {}
+    stats = {"explored": 0, "pruned": 0, "open": 0, "gap": None}
+    # per-variable average objective loss per unit of rounding, for best-estimate
+    pseudocost = np.ones(len(c))
+    node_ids = itertools.count()
+    order = itertools.count()
+
+    def priority(objective, x, depth, seq):
+        if strategy == "best-first":
+            return (-objective, seq)
+        if strategy == "depth-first":
+            return (-depth, -seq)
+        frac = np.abs(x - np.round(x))
+        return (-(objective - pseudocost @ frac), seq)
+
+    # open nodes are solved when popped, so node_limit caps the LP solves;
+    # until then a node carries its parent's bound, x and branching rounding
+    seq = next(order)
+    queue = [((0, seq), seq, float('inf'), None, list(bounds), 0, None, None)]
+    while queue:
+        if node_limit is not None and stats["explored"] >= node_limit:
+            break
+        _, _, bound, parent, node_bounds, depth, k, rounding = heapq.heappop(queue)
+        # prune by the parent's bound before solving
+        if bound <= best_solution[1] + tol:
+            stats["pruned"] += 1
+            continue
+        node_id = next(node_ids)
+        stats["explored"] += 1
+        if parent is not None:
+            edges.append((parent, node_id))
+        x, objective = solve_node(node_bounds)
+        if x is None:
+            stats["pruned"] += 1
+            continue
+        node_values[node_id] = (round(x[0], 2), round(x[1], 2), round(objective, 2))
+        if k is not None:
+            pseudocost[k] = 0.5 * (pseudocost[k] + (bound - objective) / max(rounding, tol))
+        if objective <= best_solution[1] + tol:
+            stats["pruned"] += 1
+            continue
+        k = most_fractional(x, tol)
+        if k is None:
+            best_solution = (tuple(float(v) + 0.0 for v in np.round(x)), objective)
+            continue
+        floor = int(np.floor(x[k]))
+        lower, upper = node_bounds[k]
+        for child_bound, child_rounding in (((lower, floor), x[k] - floor), ((floor + 1, upper), floor + 1 - x[k])):
+            child_bounds = list(node_bounds)
+            child_bounds[k] = child_bound
+            seq = next(order)
+            heapq.heappush(queue, (priority(objective, x, depth + 1, seq), seq, objective, node_id,
+                                   child_bounds, depth + 1, k, child_rounding))
+
+    stats["open"] = len(queue)
+    open_bound = max((node[2] for node in queue), default=best_solution[1])
+    if best_solution[0][0] is not None:
+        stats["gap"] = max(0.0, open_bound - best_solution[1]) / max(abs(best_solution[1]), 1e-9)
+    return best_solution, stats, edges, node_values
 
 
 def visualize_tree(edges, node_values):
     G = nx.DiGraph()
+    G.add_nodes_from(node_values)
     G.add_edges_from(edges)
     
     pos = nx.drawing.nx_agraph.graphviz_layout(G, prog='dot')
@@ -74,10 +131,11 @@ def visualize_tree(edges, node_values):
     plt.show()
 
 
-# Execute the Branch-and-Bound algorithm and then print and visualize the result
-branch_and_bound()
-
-print(f"Best integer result: x={best_solution[0][0]}, y={best_solution[0][1]}")
+if __name__ == "__main__":
+    # Execute the Branch-and-Bound algorithm and then print and visualize the result
+    best_solution, stats, edges, node_values = branch_and_bound()
 
+    print(f"Best integer result: x={best_solution[0][0]}, y={best_solution[0][1]}")
+    print(f"Nodes explored: {stats['explored']}, pruned: {stats['pruned']}, open: {stats['open']}, gap: {stats['gap']}")
 
-visualize_tree(edges, node_values)
\ No newline at end of file
+    visualize_tree(edges, node_values)
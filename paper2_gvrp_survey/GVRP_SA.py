@@ -1,6 +1,14 @@
+import itertools
 import random
 import math
-import copy
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import FuelModel, GreenCost, Instance
 
 # ===========================
 # Define problem instance
@@ -15,49 +23,63 @@ customers = [
     (4, 1, 80, 80)
 ]
 
+# Alternative-fuel stations: (id, x, y); ids follow the customers
+stations = [
+    (5, 30, 50),
+    (6, 70, 60)
+]
+
 vehicle_capacity = 3
 num_vehicles = 2
 
-# Fuel/emission factor: fuel cost per distance unit
-fuel_factor = 1.5  # can be tuned
+# Fuel cost per distance unit: 1.5 when empty, +0.25 per unit of load
+# (FuelModel.cmem gives the comprehensive modal emission model rates)
+fuel_model = FuelModel(empty_rate=1.5, load_rate=0.25)
+vehicle_range = 100  # distance on a full tank
 
 # ===========================
 # Distance calculation
 # ===========================
-def euclidean_distance(a, b):
-    return math.sqrt((a[2]-b[2])**2 + (a[3]-b[3])**2)
+# Coordinate instance: the Euclidean distance table is computed once.
+# With max_bytes set, rows are computed lazily within that memory budget.
+# Stations are zero-demand nodes after the customers.
+def build_instance(max_bytes=None):
+    coords = [(c[2], c[3]) for c in customers] + [(s[1], s[2]) for s in stations]
+    demands = [c[1] for c in customers] + [0] * len(stations)
+    return Instance.from_coords(coords, demands, vehicle_capacity, max_bytes=max_bytes)
+
+instance = build_instance()
 
 def total_distance(tour):
-    dist = 0
-    for i in range(len(tour)-1):
-        dist += euclidean_distance(customers[tour[i]], customers[tour[i+1]])
-    return dist
+    return instance.route_cost(tour)
 
 # ===========================
 # Cost function (green VRP)
 # ===========================
+# Load-dependent fuel cost with a range limit; station detours are inserted
+# automatically from the per-arc best-station table.
+green = GreenCost(instance, fuel_model, stations=[s[0] for s in stations],
+                  vehicle_range=vehicle_range, penalty=1000)
+
+def route_load(route):
+    return instance.route_load(route)
+
+def route_green_cost(route):
+    # fuel cost plus penalties for capacity and range violations
+    return green.route_cost(route)
+
 def compute_cost(solution):
     """
     solution: list of routes, each route is a list of customer ids
     """
-    total = 0
-    for route in solution:
-        dist = 0
-        load = 0
-        for i in range(len(route)-1):
-            dist += euclidean_distance(customers[route[i]], customers[route[i+1]])
-            load += customers[route[i]][1]
-        # Penalize capacity violation
-        penalty = max(0, load - vehicle_capacity) * 1000
-        total += dist * fuel_factor + penalty
-    return total
+    return green.solution_cost(solution)
 
 # ===========================
 # Initial solution (simple split)
 # ===========================
-def initial_solution():
+def initial_solution(rng=random):
     customer_ids = [c[0] for c in customers if c[0] != 0]
-    random.shuffle(customer_ids)
+    rng.shuffle(customer_ids)
     # Split customers evenly into vehicles
     solution = []
     per_vehicle = len(customer_ids) // num_vehicles
@@ -70,55 +92,177 @@ def initial_solution():
         solution[-1] = solution[-1][:-1] + remaining + [0]
     return solution
 
+# ===========================
+# In-place search state
+# ===========================
+class SAState:
+    """
+    Routes plus their cached green cost. Moves are applied in place and
+    return an undo record; only the touched routes are re-costed, each in
+    one pass over the route (the load on every arc changes with a swap).
+    """
+
+    def __init__(self, solution):
+        self.routes = [list(r) for r in solution]
+        self.route_cost = [route_green_cost(r) for r in self.routes]
+        self.cost = sum(self.route_cost)
+
+    def apply_swap(self, r1, i, r2, j):
+        """Swap routes[r1][i] with routes[r2][j] in place; returns the undo record for `undo`."""
+        record = (r1, i, r2, j, self.route_cost[r1], self.route_cost[r2], self.cost)
+        route1, route2 = self.routes[r1], self.routes[r2]
+        route1[i], route2[j] = route2[j], route1[i]
+        cost1, cost2 = route_green_cost(route1), route_green_cost(route2)
+        self.cost += cost1 + cost2 - self.route_cost[r1] - self.route_cost[r2]
+        self.route_cost[r1], self.route_cost[r2] = cost1, cost2
+        return record
+
+    def undo(self, record):
+        r1, i, r2, j, cost1, cost2, cost = record
+        route1, route2 = self.routes[r1], self.routes[r2]
+        route1[i], route2[j] = route2[j], route1[i]
+        self.route_cost[r1], self.route_cost[r2] = cost1, cost2
+        self.cost = cost
+
+    def snapshot(self):
+        """Compact copy: all routes as one int array plus their split points."""
+        flat = np.fromiter((c for r in self.routes for c in r), dtype=np.int32)
+        bounds = np.cumsum([len(r) for r in self.routes])[:-1]
+        return flat, bounds
+
+def routes_from_snapshot(snapshot):
+    flat, bounds = snapshot
+    return [part.tolist() for part in np.split(flat, bounds)]
+
 # ===========================
 # Neighborhood: swap two customers
 # ===========================
-def neighbor(solution):
-    new_solution = copy.deepcopy(solution)
+def neighbor(state, rng=random):
+    """Apply a random two-route swap to `state` in place; returns the undo record or None."""
     # pick two routes randomly
-    r1, r2 = random.sample(range(len(solution)), 2)
+    r1, r2 = rng.sample(range(len(state.routes)), 2)
     # pick random customer (not depot)
-    if len(new_solution[r1]) <= 2 or len(new_solution[r2]) <= 2:
-        return new_solution
-    i = random.randint(1, len(new_solution[r1])-2)
-    j = random.randint(1, len(new_solution[r2])-2)
+    if len(state.routes[r1]) <= 2 or len(state.routes[r2]) <= 2:
+        return None
+    i = rng.randint(1, len(state.routes[r1])-2)
+    j = rng.randint(1, len(state.routes[r2])-2)
     # swap customers
-    new_solution[r1][i], new_solution[r2][j] = new_solution[r2][j], new_solution[r1][i]
-    return new_solution
+    return state.apply_swap(r1, i, r2, j)
 
 # ===========================
 # Simulated Annealing
 # ===========================
-def simulated_annealing(max_iter=500, initial_temp=1000, cooling_rate=0.995):
-    current_solution = initial_solution()
-    current_cost = compute_cost(current_solution)
-    best_solution = copy.deepcopy(current_solution)
+def anneal(state, T, n_iter, cooling_rate, rng=random, start=0, trace=None, verbose=True, tol=1e-9,
+           telemetry=None, termination=None):
+    """
+    Run n_iter SA steps on `state` in place, starting at temperature T
+    (n_iter=None runs until `termination` fires).
+    Appends (iteration, best cost) to `trace` on every improvement and
+    returns (best snapshot, best cost, final T). Improvements below `tol`
+    are ignored, as the incrementally updated cost drifts by rounding.
+    telemetry: optional vrp_core.Telemetry receiving one event per step.
+    termination: optional (already started) vrp_core.Termination checked
+    before every step; annealing stops there and returns the best so far.
+    """
+    current_cost = state.cost
+    best_snapshot = state.snapshot()
     best_cost = current_cost
-    T = initial_temp
-
-    for iteration in range(max_iter):
-        new_solution = neighbor(current_solution)
-        new_cost = compute_cost(new_solution)
-        delta = new_cost - current_cost
-        if delta < 0 or random.random() < math.exp(-delta / T):
-            current_solution = new_solution
-            current_cost = new_cost
-            if current_cost < best_cost:
-                best_solution = copy.deepcopy(current_solution)
+
+    steps = itertools.count(start) if n_iter is None else range(start, start + n_iter)
+    for iteration in steps:
+        if termination is not None and termination.should_stop(iteration, best_cost):
+            break
+        watch = telemetry.stopwatch() if telemetry is not None else None
+        record = neighbor(state, rng)
+        if watch is not None:
+            watch.lap("move")
+        delta = state.cost - current_cost
+        accepted = new_best = False
+        if delta < 0 or rng.random() < math.exp(-delta / T):
+            accepted = True
+            current_cost = state.cost
+            if current_cost < best_cost - tol:
+                new_best = True
+                best_snapshot = state.snapshot()
                 best_cost = current_cost
+                if trace is not None:
+                    trace.append((iteration, best_cost))
+        elif record is not None:
+            state.undo(record)
+        if watch is not None:
+            watch.lap("accept")
+            telemetry.emit(iteration, current_cost, best_cost, operator="swap",
+                           accepted=accepted, new_best=new_best, temperature=T, stopwatch=watch)
         T *= cooling_rate
 
-        if iteration % 50 == 0:
+        if verbose and iteration % 50 == 0:
             print(f"Iteration {iteration}, best cost: {best_cost:.2f}")
 
-    return best_solution, best_cost
+    return best_snapshot, best_cost, T
+
+def simulated_annealing(max_iter=500, initial_temp=1000, cooling_rate=0.995, telemetry=None,
+                        termination=None):
+    """max_iter=None leaves stopping to `termination` alone."""
+    state = SAState(initial_solution())
+    if telemetry is not None:
+        telemetry.start("SA")
+    if termination is not None:
+        termination.start()
+    best_snapshot, best_cost, _ = anneal(state, initial_temp, max_iter, cooling_rate,
+                                         telemetry=telemetry, termination=termination)
+    return routes_from_snapshot(best_snapshot), best_cost
+
+# ===========================
+# Parallel multi-start SA
+# ===========================
+def _run_chain(args):
+    routes, T, start, n_iter, cooling_rate, rng_state = args
+    rng = random.Random()
+    rng.setstate(rng_state)
+    state = SAState(routes if routes is not None else initial_solution(rng))
+    trace = [(start, state.cost)]
+    best_snapshot, best_cost, T = anneal(state, T, n_iter, cooling_rate, rng, start, trace, verbose=False)
+    return state.routes, routes_from_snapshot(best_snapshot), best_cost, T, rng.getstate(), trace
+
+def multi_start_sa(n_chains=4, max_iter=500, initial_temp=1000, cooling_rate=0.995, seed=0,
+                   migrate_every=None, max_workers=None):
+    """
+    Run n_chains independent SA chains in a process pool. Chain k is seeded
+    from `seed` through np.random.SeedSequence, so runs are reproducible.
+    With migrate_every, chains synchronize every that many iterations and
+    all restart from the global best (keeping their own temperature and RNG).
+    Returns (best routes, best cost, traces); traces[k] lists (iteration, cost)
+    for chain k at every segment start and every new best of the segment.
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(n_chains)
+    rng_states = [random.Random(int(s)).getstate() for s in seeds]
+    segment = migrate_every or max_iter
+    chains = [(None, initial_temp) for _ in range(n_chains)]
+    traces = [[] for _ in range(n_chains)]
+    best_solution, best_cost = None, math.inf
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for start in range(0, max_iter, segment):
+            n_iter = min(segment, max_iter - start)
+            jobs = [(routes, T, start, n_iter, cooling_rate, rng_states[k])
+                    for k, (routes, T) in enumerate(chains)]
+            for k, (routes, chain_best, chain_cost, T, rng_state, trace) in enumerate(pool.map(_run_chain, jobs)):
+                rng_states[k] = rng_state
+                traces[k].extend(trace)
+                chains[k] = (routes, T)
+                if chain_cost < best_cost:
+                    best_solution, best_cost = chain_best, chain_cost
+            if migrate_every:
+                chains = [(best_solution, T) for _, T in chains]
+
+    return best_solution, best_cost, traces
 
 # ===========================
 # Main
 # ===========================
 if __name__ == "__main__":
     best_solution, best_cost = simulated_annealing()
-    print("\nBest solution routes:")
+    print("\nBest solution routes (with refuelling stops):")
     for route in best_solution:
-        print(route)
+        print(green.plan(route))
     print(f"\nTotal green cost: {best_cost:.2f}")
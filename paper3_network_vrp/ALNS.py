@@ -1,6 +1,16 @@
 import random
 import copy
+import itertools
 import math
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import Instance, best_insertion, regret_insertion
 
 # ===========================
 # Problem instance (small VRP)
@@ -16,20 +26,16 @@ distance = {
     (3,0):20, (3,1):25, (3,2):30
 }
 
+instance = Instance.from_dicts(customers, demand, vehicle_capacity, distance)
+
 # ===========================
 # Cost function
 # ===========================
 def route_cost(route):
-    return sum(distance[(route[i], route[i+1])] for i in range(len(route)-1))
+    return instance.route_cost(route)
 
 def solution_cost(solution):
-    total = 0
-    for route in solution:
-        load = sum(demand[c] for c in route if c != 0)
-        if load > vehicle_capacity:
-            total += 1000*(load-vehicle_capacity)  # penalty
-        total += route_cost(route)
-    return total
+    return instance.solution_cost(solution, penalty=1000)
 
 # ===========================
 # Initial solution (simple sequential)
@@ -53,8 +59,15 @@ def initial_solution():
     return routes
 
 # ===========================
-# ALNS operators
+# Destroy operators
 # ===========================
+# Each destroy operator returns (partial solution, removed customers) and
+# leaves its input untouched; emptied routes are dropped.
+def _remove(solution, removed):
+    removed = set(removed)
+    new_solution = [[c for c in route if c not in removed] for route in solution]
+    return [route for route in new_solution if len(route) > 2]
+
 def random_removal(solution, n_remove=1):
     new_solution = copy.deepcopy(solution)
     all_customers = [c for route in new_solution for c in route if c != 0]
@@ -63,53 +76,244 @@ def random_removal(solution, n_remove=1):
         route[:] = [c for c in route if c not in removed]
     return new_solution, removed
 
+def worst_removal(solution, n_remove=1, p=3):
+    """
+    Remove the customers whose removal saves the most distance,
+    d[i,c] + d[c,j] - d[i,j], with randomness p (higher = greedier).
+    """
+    dist = instance.dist
+    customers, savings = [], []
+    for route in solution:
+        r = np.asarray(route)
+        if len(r) <= 2:
+            continue
+        prev, c, nxt = r[:-2], r[1:-1], r[2:]
+        customers.extend(c.tolist())
+        savings.append(dist[prev, c] + dist[c, nxt] - dist[prev, nxt])
+    if not customers:
+        return solution, []
+    order = [customers[i] for i in np.argsort(-np.concatenate(savings), kind="stable")]
+    removed = []
+    for _ in range(min(n_remove, len(order))):
+        removed.append(order.pop(int(random.random() ** p * len(order))))
+    return _remove(solution, removed), removed
+
+def shaw_removal(solution, n_remove=1, p=6, phi=1.0, chi=5.0):
+    """
+    Remove related customers (Shaw): start from a random customer and keep
+    removing customers related to an already removed one. Relatedness is
+    phi * normalized distance + chi * normalized demand difference (lower =
+    more related), computed for all candidates at once from the matrix rows.
+    """
+    candidates = np.array([c for route in solution for c in route[1:-1]])
+    if len(candidates) == 0:
+        return solution, []
+    dist, q = instance.dist, instance.demand
+    q_max = max(float(q[candidates].max() - q[candidates].min()), 1e-12)
+    seed = int(random.choice(candidates))
+    removed = [seed]
+    remaining = candidates[candidates != seed]
+    while len(removed) < n_remove and len(remaining):
+        r = random.choice(removed)
+        d = np.asarray(dist[r, remaining], dtype=float)
+        relatedness = (phi * d / max(d.max(), 1e-12)
+                       + chi * np.abs(q[remaining] - q[r]) / q_max)
+        i = np.argsort(relatedness, kind="stable")[int(random.random() ** p * len(remaining))]
+        removed.append(int(remaining[i]))
+        remaining = np.delete(remaining, i)
+    return _remove(solution, removed), removed
+
+def route_removal(solution, n_remove=1):
+    """Remove whole random routes until at least n_remove customers are out."""
+    order = random.sample(range(len(solution)), len(solution))
+    removed, dropped = [], set()
+    for r_idx in order:
+        if len(removed) >= n_remove:
+            break
+        removed.extend(solution[r_idx][1:-1])
+        dropped.add(r_idx)
+    new_solution = [route[:] for r_idx, route in enumerate(solution) if r_idx not in dropped]
+    return new_solution, removed
+
+# ===========================
+# Repair operators
+# ===========================
 def greedy_insertion(solution, removed):
-    new_solution = copy.deepcopy(solution)
+    new_solution = [route[:] for route in solution]
+    loads = [instance.route_load(route) for route in new_solution]
     for c in removed:
-        best_cost = math.inf
-        best_pos = None
-        best_route_idx = None
-        for r_idx, route in enumerate(new_solution):
-            for i in range(1, len(route)):
-                temp_route = route[:i] + [c] + route[i:]
-                load = sum(demand[cust] for cust in temp_route if cust != 0)
-                if load <= vehicle_capacity:
-                    cost = route_cost(temp_route)
-                    if cost < best_cost:
-                        best_cost = cost
-                        best_pos = i
-                        best_route_idx = r_idx
+        _, best_route_idx, best_pos = best_insertion(instance, new_solution, loads, c)
         if best_route_idx is not None:
-            new_solution[best_route_idx] = new_solution[best_route_idx][:best_pos] + [c] + new_solution[best_route_idx][best_pos:]
+            new_solution[best_route_idx].insert(best_pos, c)
+            loads[best_route_idx] += demand[c]
         else:
             # if no feasible insertion, start new route
             new_solution.append([0, c, 0])
+            loads.append(demand[c])
     return new_solution
 
+def regret_repair(solution, removed, k=2):
+    new_solution = [route[:] for route in solution]
+    loads = [instance.route_load(route) for route in new_solution]
+    return regret_insertion(instance, new_solution, loads, removed, k)
+
+DESTROY_OPERATORS = {
+    "random": random_removal,
+    "worst": worst_removal,
+    "shaw": shaw_removal,
+    "route": route_removal,
+}
+
+REPAIR_OPERATORS = {
+    "greedy": greedy_insertion,
+    "regret2": partial(regret_repair, k=2),
+    "regret3": partial(regret_repair, k=3),
+}
+
+# ===========================
+# Adaptive operator selection
+# ===========================
+class OperatorSelector:
+    """
+    Roulette-wheel choice among named operators. Every `segment_length`
+    iterations each used operator's weight moves towards its mean score in
+    the segment (33 new best / 9 improving / 13 accepted by default) with
+    reaction factor `reaction`. With time_weighted, that mean score is divided
+    by the operator's mean CPU time relative to the others used in the
+    segment, so cheap operators win when quality is equal.
+    """
+
+    def __init__(self, operators, segment_length=50, reaction=0.1,
+                 scores=(33, 9, 13), time_weighted=True, rng=random):
+        self.operators = dict(operators)
+        self.names = list(self.operators)
+        self.segment_length = segment_length
+        self.reaction = reaction
+        self.scores = scores
+        self.time_weighted = time_weighted
+        self.rng = rng
+        self.weights = {name: 1.0 for name in self.names}
+        self.calls = {name: 0 for name in self.names}
+        self.cpu_time = {name: 0.0 for name in self.names}
+        self._reset_segment()
+
+    def _reset_segment(self):
+        self._seg_score = {name: 0.0 for name in self.names}
+        self._seg_calls = {name: 0 for name in self.names}
+        self._seg_time = {name: 0.0 for name in self.names}
+        self._seg_iterations = 0
+
+    def select(self):
+        total = sum(self.weights.values())
+        x = self.rng.random() * total
+        for name in self.names:
+            x -= self.weights[name]
+            if x < 0:
+                return name
+        return self.names[-1]
+
+    def __call__(self, name, *args, **kwargs):
+        """Run operator `name`, charging its CPU time."""
+        start = time.process_time()
+        result = self.operators[name](*args, **kwargs)
+        elapsed = time.process_time() - start
+        self.calls[name] += 1
+        self.cpu_time[name] += elapsed
+        self._seg_calls[name] += 1
+        self._seg_time[name] += elapsed
+        return result
+
+    def update(self, name, outcome):
+        """
+        Credit `name` with the score for outcome 0 (new best), 1 (improving)
+        or 2 (accepted); None scores nothing.
+        """
+        if outcome is not None:
+            self._seg_score[name] += self.scores[outcome]
+        self._seg_iterations += 1
+        if self._seg_iterations >= self.segment_length:
+            self._end_segment()
+
+    def _end_segment(self):
+        used = [name for name in self.names if self._seg_calls[name]]
+        mean_time = {name: self._seg_time[name] / self._seg_calls[name] for name in used}
+        avg_time = sum(mean_time.values()) / len(used) if used else 0.0
+        for name in used:
+            perf = self._seg_score[name] / self._seg_calls[name]
+            if self.time_weighted and avg_time > 0:
+                perf /= max(mean_time[name] / avg_time, 1e-3)
+            self.weights[name] = (1 - self.reaction) * self.weights[name] + self.reaction * perf
+            # keep every operator selectable
+            self.weights[name] = max(self.weights[name], 1e-2)
+        self._reset_segment()
+
+    def stats(self):
+        """{name: (weight, calls, cpu seconds)}."""
+        return {name: (self.weights[name], self.calls[name], self.cpu_time[name])
+                for name in self.names}
+
 # ===========================
 # ALNS main loop
 # ===========================
-def ALNS(max_iterations=100, n_remove=1):
+def ALNS(max_iterations=100, n_remove=1, destroy=None, repair=None, telemetry=None, termination=None):
+    """
+    destroy / repair: OperatorSelector instances; by default all registered
+    operators with default adaptation settings. Pass your own to tune them
+    or to read their weights and CPU times afterwards.
+    telemetry: optional vrp_core.Telemetry receiving one event per iteration.
+    termination: optional vrp_core.Termination, checked before every
+    iteration; the best solution so far is returned as soon as it fires.
+    max_iterations=None leaves stopping to it alone.
+    """
+    destroy = destroy or OperatorSelector(DESTROY_OPERATORS)
+    repair = repair or OperatorSelector(REPAIR_OPERATORS)
     current_solution = initial_solution()
+    current_cost = solution_cost(current_solution)
     best_solution = copy.deepcopy(current_solution)
-    best_cost = solution_cost(best_solution)
+    best_cost = current_cost
+    if telemetry is not None:
+        telemetry.start("ALNS")
+    if termination is not None:
+        termination.start()
 
-    for iteration in range(max_iterations):
+    for iteration in itertools.count() if max_iterations is None else range(max_iterations):
+        if termination is not None and termination.should_stop(iteration, best_cost):
+            break
+        watch = telemetry.stopwatch() if telemetry is not None else None
+        d_name, r_name = destroy.select(), repair.select()
+        n = min(n_remove, sum(len(r) - 2 for r in current_solution))
         # Destroy
-        destroyed_solution, removed = random_removal(current_solution, n_remove)
+        destroyed_solution, removed = destroy(d_name, current_solution, n)
+        if watch is not None:
+            watch.lap("destroy")
         # Repair
-        new_solution = greedy_insertion(destroyed_solution, removed)
+        new_solution = repair(r_name, destroyed_solution, removed)
+        if watch is not None:
+            watch.lap("repair")
         # Evaluate
         new_cost = solution_cost(new_solution)
-        delta = new_cost - solution_cost(current_solution)
+        delta = new_cost - current_cost
 
         # Acceptance criterion (Simulated Annealing style)
-        T = max(0.01, 1.0 - iteration/max_iterations)
+        progress = iteration/max_iterations if max_iterations else 0.0
+        if termination is not None:
+            progress = max(progress, termination.progress(iteration))
+        T = max(0.01, 1.0 - progress)
+        outcome = None
         if delta < 0 or random.random() < math.exp(-delta/T):
-            current_solution = new_solution
+            outcome = 1 if delta < 0 else 2
+            current_solution, current_cost = new_solution, new_cost
             if new_cost < best_cost:
                 best_solution = copy.deepcopy(new_solution)
                 best_cost = new_cost
+                outcome = 0
+        destroy.update(d_name, outcome)
+        repair.update(r_name, outcome)
+        if watch is not None:
+            watch.lap("evaluate")
+            telemetry.emit(iteration, current_cost, best_cost, operator=f"{d_name}+{r_name}",
+                           accepted=outcome is not None, new_best=outcome == 0,
+                           temperature=T, stopwatch=watch)
 
         if iteration % 10 == 0:
             print(f"Iteration {iteration}, best cost: {best_cost}")
@@ -1,5 +1,9 @@
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpStatus
-import itertools
+from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpStatus, PULP_CBC_CMD
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import BranchAndPrice, Instance, PricingProblem
 
 # ===========================
 # Problem instance
@@ -17,70 +21,101 @@ distance = {
     (3,0):20, (3,1):25, (3,2):30
 }
 
+instance = Instance.from_dicts(customers, demand, vehicle_capacity, distance)
+
 # ===========================
-# Generate all feasible routes (any subset of customers)
+# Initial columns: one route per customer
 # ===========================
-def generate_feasible_routes(customers, demand, capacity):
+def initial_routes(instance):
     routes = []
-    cust_list = customers[1:]  # exclude depot
-    for L in range(1, len(cust_list)+1):  # subsets of length 1..N
-        for subset in itertools.permutations(cust_list, L):
-            load = sum(demand[c] for c in subset)
-            if load <= capacity:
-                route = [0] + list(subset) + [0]
-                routes.append(route)
+    for c in range(1, instance.n):
+        if instance.demand[c] > instance.capacity:
+            print(f"Error: Customer {c} exceeds vehicle capacity. LP infeasible!")
+            exit()
+        routes.append([0, c, 0])
     return routes
 
-feasible_routes = generate_feasible_routes(customers, demand, vehicle_capacity)
-
-# Check if feasible routes exist
-if len(feasible_routes) == 0:
-    print("Error: No feasible routes generated. Adjust vehicle capacity or customer demands.")
-    exit()
-
-print("Feasible routes generated:")
-for r in feasible_routes:
-    print(r)
-print(f"Total feasible routes: {len(feasible_routes)}\n")
-
 # ===========================
 # Route cost
 # ===========================
 def route_cost(route):
-    return sum(distance[(route[i], route[i+1])] for i in range(len(route)-1))
-
-# Convert routes to tuple keys
-route_costs = {tuple(r): route_cost(r) for r in feasible_routes}
+    return instance.route_cost(route)
 
 # ===========================
-# Master problem
+# Restricted master problem
 # ===========================
 def solve_master(routes, costs):
     model = LpProblem("VRP_Master", LpMinimize)
-    # Convert routes to tuples for keys
-    x = {tuple(r): LpVariable(f"x_{tuple(r)}", lowBound=0, upBound=1) for r in routes}
+    # Convert routes to tuples for keys; no upper bound so that the
+    # partitioning rows carry the whole dual information
+    x = {tuple(r): LpVariable(f"x_{k}", lowBound=0) for k, r in enumerate(routes)}
 
     # Objective
     model += lpSum([costs[tuple(r)] * x[tuple(r)] for r in routes])
 
-    # Constraints: each customer visited exactly once
+    # Constraints: each customer visited exactly once (ng-routes may visit twice)
     for cust in customers[1:]:
-        customer_in_routes = [x[tuple(r)] for r in routes if cust in r]
+        customer_in_routes = [r.count(cust) * x[tuple(r)] for r in routes if cust in r]
         if len(customer_in_routes) == 0:
             print(f"Error: Customer {cust} not in any route. LP infeasible!")
             exit()
-        model += lpSum(customer_in_routes) == 1
+        model += lpSum(customer_in_routes) == 1, f"visit_{cust}"
 
-    model.solve()
+    model.solve(PULP_CBC_CMD(msg=0))
     return model, x
 
+def master_duals(model):
+    """Customer duals indexed by node (depot = 0)."""
+    return [0.0] + [model.constraints[f"visit_{cust}"].pi for cust in customers[1:]]
+
+# ===========================
+# Column generation
+# ===========================
+def column_generation(routes, max_iterations=1000, max_routes=50, bidirectional=True, ng_size=8,
+                      heuristic_labels=20):
+    """
+    Alternate between the restricted master LP and ESPPRC pricing until no
+    route with negative reduced cost remains. Pricing first keeps only
+    `heuristic_labels` labels per node and falls back to exact labeling
+    when that finds nothing, so the final LP bound is exact. Pricing is
+    over ng-routes with ng_size nearest-customer memories (None for
+    elementary routes, practical only up to about 50 customers).
+    """
+    routes = [list(r) for r in routes]
+    costs = {tuple(r): route_cost(r) for r in routes}
+    pricing = PricingProblem(instance, bidirectional=bidirectional, ng_size=ng_size)
+    for iteration in range(max_iterations):
+        model, x = solve_master(routes, costs)
+        duals = master_duals(model)
+        priced = pricing.solve(duals, max_routes, label_limit=heuristic_labels) or pricing.solve(duals, max_routes)
+        new_routes = [r for _, r in priced if tuple(r) not in costs]
+        print(f"Iteration {iteration}, LP bound: {model.objective.value():.2f}, new columns: {len(new_routes)}")
+        if not new_routes:
+            break
+        for r in new_routes:
+            routes.append(r)
+            costs[tuple(r)] = route_cost(r)
+    return model, x, costs
+
 # ===========================
 # Solve master LP
 # ===========================
-master_model, x_vars = solve_master(feasible_routes, route_costs)
+if __name__ == "__main__":
+    master_model, x_vars, route_costs = column_generation(initial_routes(instance))
+
+    print("LP Status:", LpStatus[master_model.status])
+    print(f"Total columns: {len(route_costs)}")
+    print("\nSelected routes in LP solution:")
+    for r, var in x_vars.items():
+        if var.varValue > 1e-5:
+            print(f"Route {r} -> Fractional assignment: {var.varValue:.2f}, Cost: {route_costs[r]}")
 
-print("LP Status:", LpStatus[master_model.status])
-print("\nSelected routes in LP solution:")
-for r, var in x_vars.items():
-    if var.varValue > 1e-5:
-        print(f"Route {r} -> Fractional assignment: {var.varValue:.2f}, Cost: {route_costs[r]}")
+    # ===========================
+    # Integer solution by branch-and-price
+    # ===========================
+    print("\nBranch-and-price:")
+    routes, cost, stats = BranchAndPrice(instance).solve()
+    print(f"Status: {stats['status']}, nodes: {stats['explored']}, gap: {stats['gap']}")
+    for r in routes or []:
+        print(f"Route {tuple(r)}, Cost: {route_cost(r)}")
+    print(f"Total cost: {cost}")
@@ -1,5 +1,11 @@
 import random
 import copy
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import Instance, regret_insertion
 
 # ===========================
 # Problem instance (GVRP)
@@ -15,20 +21,16 @@ distance = {
     (3,0):20, (3,1):25, (3,2):30
 }
 
+instance = Instance.from_dicts(customers, demand, vehicle_capacity, distance)
+
 # ===========================
 # Cost functions
 # ===========================
 def route_cost(route):
-    return sum(distance[(route[i], route[i+1])] for i in range(len(route)-1))
+    return instance.route_cost(route)
 
 def solution_cost(solution):
-    total = 0
-    for route in solution:
-        load = sum(demand[c] for c in route if c != 0)
-        if load > vehicle_capacity:
-            total += 1000*(load-vehicle_capacity)  # penalty
-        total += route_cost(route)
-    return total
+    return instance.solution_cost(solution, penalty=1000)
 
 # ===========================
 # Initial solution
@@ -54,13 +56,17 @@ def initial_solution():
 # ===========================
 # Destroy operator: remove a large part of customers
 # ===========================
-def destroy(solution, n_remove):
-    new_solution = copy.deepcopy(solution)
-    all_customers = [c for route in new_solution for c in route if c != 0]
-    if len(all_customers) == 0:
+def sample_removal(solution, n_remove):
+    all_customers = [c for route in solution for c in route if c != 0]
+    # sorted: the repair result then depends only on which customers are removed
+    return sorted(random.sample(all_customers, min(n_remove, len(all_customers))))
+
+def destroy(solution, n_remove, removed_customers=None):
+    new_solution = [route[:] for route in solution]
+    if removed_customers is None:
+        removed_customers = sample_removal(new_solution, n_remove)
+    if len(removed_customers) == 0:
         return new_solution, []
-    n_remove = min(n_remove, len(all_customers))
-    removed_customers = random.sample(all_customers, n_remove)
     # remove customers from routes
     for route in new_solution:
         route[:] = [c for c in route if c not in removed_customers]
@@ -69,52 +75,79 @@ def destroy(solution, n_remove):
     return new_solution, removed_customers
 
 # ===========================
-# Repair operator: greedy insertion
+# Repair operator: regret-k insertion
 # ===========================
-def repair(solution, removed_customers):
-    new_solution = copy.deepcopy(solution)
-    for c in removed_customers:
-        best_cost = float('inf')
-        best_pos = None
-        best_route_idx = None
-        for r_idx, route in enumerate(new_solution):
-            for i in range(1, len(route)):
-                temp_route = route[:i] + [c] + route[i:]
-                load = sum(demand[x] for x in temp_route if x != 0)
-                if load <= vehicle_capacity:
-                    cost = route_cost(temp_route)
-                    if cost < best_cost:
-                        best_cost = cost
-                        best_pos = i
-                        best_route_idx = r_idx
-        if best_route_idx is not None:
-            new_solution[best_route_idx] = new_solution[best_route_idx][:best_pos] + [c] + new_solution[best_route_idx][best_pos:]
-        else:
-            # start a new route
-            new_solution.append([0, c, 0])
-    return new_solution
+def repair(solution, removed_customers, k=2):
+    new_solution = [route[:] for route in solution]
+    loads = [instance.route_load(route) for route in new_solution]
+    return regret_insertion(instance, new_solution, loads, removed_customers, k)
 
 # ===========================
 # LNS main loop
 # ===========================
-def LNS(max_iterations=100, destroy_fraction=0.5):
+def LNS(max_iterations=100, destroy_fraction=0.5, regret_k=2, telemetry=None, termination=None,
+        memory=None):
+    """
+    telemetry: optional vrp_core.Telemetry receiving one event per iteration.
+    termination: optional vrp_core.Termination, checked before every
+    iteration; the best solution so far is returned as soon as it fires.
+    max_iterations=None leaves stopping to it alone.
+    memory: optional vrp_core.SolutionMemory. Destroy and regret repair are
+    deterministic given the current solution and the removed customers, so
+    that pair is hashed (O(removed), the current hash is recomputed only on
+    acceptance) and a pair seen before skips destroy, repair and costing:
+    it was rejected then and would be rejected again. A cached cost that
+    would be accepted can only come from a hash collision, so that pair is
+    rebuilt. Telemetry events carry memory.stats().
+    """
     current_solution = initial_solution()
+    current_cost = solution_cost(current_solution)
     best_solution = copy.deepcopy(current_solution)
-    best_cost = solution_cost(best_solution)
+    best_cost = current_cost
+    current_key = memory.solution_hash(current_solution) if memory is not None else None
+    if telemetry is not None:
+        telemetry.start("LNS")
+    if termination is not None:
+        termination.start()
 
-    for iteration in range(max_iterations):
+    for iteration in itertools.count() if max_iterations is None else range(max_iterations):
+        if termination is not None and termination.should_stop(iteration, best_cost):
+            break
+        watch = telemetry.stopwatch() if telemetry is not None else None
         n_remove = max(1, int(destroy_fraction * sum(len(r)-2 for r in current_solution)))
-        # Destroy
-        destroyed_solution, removed_customers = destroy(current_solution, n_remove)
-        # Repair
-        new_solution = repair(destroyed_solution, removed_customers)
-        # Evaluate
-        new_cost = solution_cost(new_solution)
-        if new_cost < solution_cost(current_solution):
-            current_solution = new_solution
-            if new_cost < best_cost:
+        removed_customers = sample_removal(current_solution, n_remove)
+        if memory is not None:
+            key = current_key ^ memory.set_hash(removed_customers)
+            new_cost = memory.lookup(key)
+            if new_cost is not None and new_cost < current_cost:
+                new_cost = None
+        if memory is None or new_cost is None:
+            # Destroy
+            destroyed_solution, removed_customers = destroy(current_solution, n_remove, removed_customers)
+            if watch is not None:
+                watch.lap("destroy")
+            # Repair
+            new_solution = repair(destroyed_solution, removed_customers, regret_k)
+            if watch is not None:
+                watch.lap("repair")
+            # Evaluate
+            new_cost = solution_cost(new_solution)
+            if memory is not None:
+                memory.store(key, new_cost)
+        accepted = new_cost < current_cost
+        new_best = accepted and new_cost < best_cost
+        if accepted:
+            current_solution, current_cost = new_solution, new_cost
+            if memory is not None:
+                current_key = memory.solution_hash(current_solution)
+            if new_best:
                 best_solution = copy.deepcopy(new_solution)
                 best_cost = new_cost
+        if watch is not None:
+            watch.lap("evaluate")
+            telemetry.emit(iteration, current_cost, best_cost, operator=f"regret{regret_k}",
+                           accepted=accepted, new_best=new_best, stopwatch=watch,
+                           memory=memory.stats() if memory is not None else None)
 
         if iteration % 10 == 0:
             print(f"Iteration {iteration}, best cost: {best_cost}")
@@ -1,5 +1,10 @@
+import itertools
 import random
-import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import Instance, InterRouteSearch, RouteOptimizer, Solution, nearest_neighbors
 
 # ===========================
 # Problem instance (GVRP)
@@ -15,20 +20,16 @@ distance = {
     (3,0):20, (3,1):25, (3,2):30
 }
 
+instance = Instance.from_dicts(customers, demand, vehicle_capacity, distance)
+
 # ===========================
 # Cost functions
 # ===========================
 def route_cost(route):
-    return sum(distance[(route[i], route[i+1])] for i in range(len(route)-1))
+    return instance.route_cost(route)
 
 def solution_cost(solution):
-    total = 0
-    for route in solution:
-        load = sum(demand[c] for c in route if c != 0)
-        if load > vehicle_capacity:
-            total += 1000*(load-vehicle_capacity)  # penalty
-        total += route_cost(route)
-    return total
+    return instance.solution_cost(solution, penalty=1000)
 
 # ===========================
 # Initial solution
@@ -54,46 +55,207 @@ def initial_solution():
 # ===========================
 # Neighborhood operators
 # ===========================
-def swap_customers(solution):
-    new_solution = copy.deepcopy(solution)
-    all_customers = [c for route in new_solution for c in route if c != 0]
-    if len(all_customers) < 2:
-        return new_solution
-    a, b = random.sample(all_customers, 2)
-    for route in new_solution:
-        for i in range(1, len(route)-1):
-            if route[i] == a:
-                route[i] = b
-            elif route[i] == b:
-                route[i] = a
-    # remove routes that have only depots
-    new_solution = [r for r in new_solution if len(r) > 2]
-    return new_solution
-
-def relocate_customer(solution):
-    new_solution = copy.deepcopy(solution)
+# Each operator returns (neighbor, delta) where delta is the change in
+# solution_cost. The input Solution is left untouched.
+#
+# Given `neighbors` (k-nearest candidate lists, see nearest_neighbors) the
+# operators are granular: they only try moves that create an arc (b, a) or
+# (a, b) with b one of a's nearest customers. best=False samples one such
+# move (shaking); best=True evaluates all of them and returns the best.
+# With a SolutionMemory, candidates are hashed before they are built:
+# tabu ones are skipped and cached costs replace re-costing. Sampled
+# (non-granular) moves are hashed once built, from the changed routes only,
+# and a tabu result is dropped; they never read the cost cache, since
+# re-costing the changed routes is no dearer than hashing them.
+def _granular_arcs(solution, neighbors, best):
+    if best:
+        return [(a, int(b)) for a in solution.customers() for b in neighbors[a]]
+    n = solution.num_customers()
+    if n == 0 or neighbors.shape[1] == 0:
+        return []
+    r_idx, i = solution.position(random.randrange(n))
+    a = solution.routes[r_idx][i]
+    return [(a, int(random.choice(neighbors[a])))]
+
+def _route_delta(solution, r, dcost, dload):
+    # objective change of route r when its cost and load change by dcost, dload
+    load, cap, penalty = solution.route_load(r), instance.capacity, solution.penalty
+    return dcost + penalty * (max(0, load + dload - cap) - max(0, load - cap))
+
+def _best_move(solution, neighbors, best, move, memory=None):
+    # moves return (delta, changes, arcs) with changes = {route_idx: new_route};
+    # the delta is O(1) arc arithmetic, or None to have the changed routes
+    # re-costed, and arcs = (broken, created) when the move hash is O(1).
+    # The cost cache is only read for moves without an O(1) delta: a lookup
+    # is no cheaper than that arithmetic
+    pos = solution.positions()
+    # the base hash is cached on the Solution: O(changed routes) per call
+    h = solution.zobrist(memory) if memory is not None else None
+    best_changes, best_delta = None, None
+    for a, b in _granular_arcs(solution, neighbors, best):
+        result = move(solution, pos, a, b)
+        if result is None:
+            continue
+        delta, changes, arcs = result
+        if memory is not None:
+            if arcs is not None:
+                key = memory.move_hash(h, *arcs)
+            else:
+                changes = changes()
+                key = h
+                for r, route in changes.items():
+                    key ^= solution.route_zobrist(r, memory) ^ memory.route_hash(route)
+            if memory.is_tabu(key):
+                continue
+            if delta is None:
+                cached = memory.lookup(key)
+                if cached is not None:
+                    delta = cached - solution.cost()
+        if delta is None:
+            if callable(changes):
+                changes = changes()
+            delta = sum(solution.evaluate(route) - solution.route_objective(r) for r, route in changes.items())
+            if memory is not None:
+                memory.store(key, solution.cost() + delta)
+        if best_delta is None or delta < best_delta:
+            best_changes, best_delta = changes, delta
+    new_solution = solution.copy()
+    if best_changes is None:
+        return new_solution, 0
+    if callable(best_changes):
+        best_changes = best_changes()
+    for r, route in best_changes.items():
+        new_solution.set_route(r, route)
+    for r in sorted(best_changes, reverse=True):
+        if len(new_solution.routes[r]) <= 2:
+            new_solution.pop_route(r)
+    return new_solution, best_delta
+
+def _unless_tabu(solution, new_solution, delta, memory):
+    # a sampled move whose result is tabu is dropped: no change
+    if memory is not None and memory.tabu_tenure and memory.is_tabu(new_solution.zobrist(memory)):
+        return solution.copy(), 0
+    return new_solution, delta
+
+def _swap_next_to(solution, pos, a, b):
+    # swap a with b's successor (or predecessor) so that a ends up next to b
+    routes = solution.routes
+    rb, jb = pos[b]
+    x = routes[rb][jb + 1]
+    if x == 0 or x == a:
+        x = routes[rb][jb - 1]
+        if x == 0 or x == a:
+            return None
+    (ra, ia), (rx, ix) = pos[a], pos[x]
+
+    def changes():
+        new = {ra: routes[ra][:]}
+        new.setdefault(rx, routes[rx][:])
+        new[ra][ia], new[rx][ix] = x, a
+        return new
+
+    if ra == rx:
+        return None, changes, None
+    d, q = instance.dist, instance.demand
+    pa, na = routes[ra][ia - 1], routes[ra][ia + 1]
+    px, nx = routes[rx][ix - 1], routes[rx][ix + 1]
+    delta = (_route_delta(solution, ra, d[pa, x] + d[x, na] - d[pa, a] - d[a, na], q[x] - q[a])
+             + _route_delta(solution, rx, d[px, a] + d[a, nx] - d[px, x] - d[x, nx], q[a] - q[x]))
+    arcs = ([(pa, a), (a, na), (px, x), (x, nx)], [(pa, x), (x, na), (px, a), (a, nx)])
+    return float(delta), changes, arcs
+
+def _relocate_after(solution, pos, a, b):
+    routes = solution.routes
+    (ra, ia), (rb, jb) = pos[a], pos[b]
+    if ra == rb:
+        if jb == ia - 1:
+            return None
+
+        def changes():
+            route = routes[ra][:]
+            route.pop(ia)
+            route.insert(jb if ia < jb else jb + 1, a)
+            return {ra: route}
+        return None, changes, None
+
+    def changes():
+        return {ra: routes[ra][:ia] + routes[ra][ia+1:],
+                rb: routes[rb][:jb+1] + [a] + routes[rb][jb+1:]}
+
+    d, q = instance.dist, instance.demand
+    pa, na = routes[ra][ia - 1], routes[ra][ia + 1]
+    nb = routes[rb][jb + 1]
+    delta = (_route_delta(solution, ra, d[pa, na] - d[pa, a] - d[a, na], -q[a])
+             + _route_delta(solution, rb, d[b, a] + d[a, nb] - d[b, nb], q[a]))
+    # emptying route ra leaves no (0, 0) arc: empty routes hash to 0
+    closing = [(pa, na)] if pa or na else []
+    arcs = ([(pa, a), (a, na), (b, nb)], closing + [(b, a), (a, nb)])
+    return float(delta), changes, arcs
+
+def _two_opt_link(solution, pos, a, b):
+    # reverse the segment between a and b (same route) to create arc (a, b) or (b, a)
+    (ra, ia), (rb, ib) = pos[a], pos[b]
+    if ra != rb:
+        return None
+    if ib > ia + 1:
+        i, j = ia + 1, ib
+    elif ib < ia:
+        i, j = ib + 1, ia
+    else:
+        return None
+    route = solution.routes[ra]
+
+    def changes():
+        return {ra: route[:i] + route[i:j+1][::-1] + route[j+1:]}
+
+    if not instance.is_symmetric():
+        return None, changes, None
+    d = instance.dist
+    delta = d[route[i-1], route[j]] + d[route[i], route[j+1]] - d[route[i-1], route[i]] - d[route[j], route[j+1]]
+    return float(delta), changes, None
+
+def swap_customers(solution, neighbors=None, best=False, memory=None):
+    if neighbors is not None:
+        return _best_move(solution, neighbors, best, _swap_next_to, memory)
+    new_solution = solution.copy()
+    n = new_solution.num_customers()
+    if n < 2:
+        return new_solution, 0
+    old_cost = solution.cost()
+    ka, kb = random.sample(range(n), 2)
+    ra, ia = new_solution.position(ka)
+    rb, ib = new_solution.position(kb)
+    route_a = new_solution.route_for_write(ra)
+    route_b = new_solution.route_for_write(rb)
+    route_a[ia], route_b[ib] = route_b[ib], route_a[ia]
+    return _unless_tabu(solution, new_solution, new_solution.cost() - old_cost, memory)
+
+def relocate_customer(solution, neighbors=None, best=False, memory=None):
+    if neighbors is not None:
+        return _best_move(solution, neighbors, best, _relocate_after, memory)
+    new_solution = solution.copy()
+    n = new_solution.num_customers()
+    if n == 0:
+        return new_solution, 0
+    old_cost = solution.cost()
     # pick a random non-depot customer
-    all_customers = [(r_idx, i, c) for r_idx, route in enumerate(new_solution) 
-                     for i, c in enumerate(route) if c != 0]
-    if not all_customers:
-        return new_solution
-    r_idx, i, c = random.choice(all_customers)
-    new_solution[r_idx].pop(i)
+    r_idx, i = new_solution.position(random.randrange(n))
+    c = new_solution.route_for_write(r_idx).pop(i)
     # remove route if it only has depot left
-    if len(new_solution[r_idx]) <= 2:
-        new_solution.pop(r_idx)
+    if len(new_solution.routes[r_idx]) <= 2:
+        new_solution.pop_route(r_idx)
 
     # pick a route to insert
-    if not new_solution:
-        new_solution.append([0, c, 0])
-        return new_solution
+    if not len(new_solution):
+        new_solution.append_route([0, c, 0])
+        return _unless_tabu(solution, new_solution, new_solution.cost() - old_cost, memory)
 
     r_insert = random.randint(0, len(new_solution)-1)
-    route_len = len(new_solution[r_insert])
+    route = new_solution.route_for_write(r_insert)
     # insert between depots
-    pos_insert = 1 if route_len <= 2 else random.randint(1, route_len-1)
-    new_solution[r_insert].insert(pos_insert, c)
-    return new_solution
+    pos_insert = 1 if len(route) <= 2 else random.randint(1, len(route)-1)
+    route.insert(pos_insert, c)
+    return _unless_tabu(solution, new_solution, new_solution.cost() - old_cost, memory)
 
 def two_opt(route):
     if len(route) <= 4:
@@ -102,49 +264,147 @@ def two_opt(route):
     new_route = route[:i] + route[i:j+1][::-1] + route[j+1:]
     return new_route
 
-def two_opt_all(solution):
-    new_solution = copy.deepcopy(solution)
+def two_opt_all(solution, neighbors=None, best=False, memory=None):
+    if neighbors is not None:
+        return _best_move(solution, neighbors, best, _two_opt_link, memory)
+    new_solution = solution.copy()
+    old_cost = solution.cost()
     r_idx = random.randint(0, len(new_solution)-1)
-    new_solution[r_idx] = two_opt(new_solution[r_idx])
-    return new_solution
+    route = new_solution.routes[r_idx]
+    new_route = two_opt(route)
+    if new_route is not route:
+        new_solution.set_route(r_idx, new_route)
+    return _unless_tabu(solution, new_solution, new_solution.cost() - old_cost, memory)
+
+def optimize_routes(solution, optimizer):
+    """Best-improvement 2-opt/Or-opt descent of every route; capacity is unaffected."""
+    new_solution = solution.copy()
+    for r_idx, route in enumerate(solution.routes):
+        new_route, gain = optimizer.optimize(route)
+        if gain < 0:
+            new_solution.set_route(r_idx, new_route)
+    return new_solution, new_solution.cost() - solution.cost()
+
+def inter_route_descent(solution, search, termination=None):
+    """Relocate / 2-opt* / CROSS-exchange descent between routes."""
+    routes, _ = search.descend(solution.routes, termination)
+    if len(routes) != len(solution):
+        new_solution = Solution(instance, routes, penalty=solution.penalty)
+    else:
+        # keep the cached cost and hash of every route the descent left alone
+        new_solution = solution.copy()
+        for r_idx, route in enumerate(routes):
+            if route != solution.routes[r_idx]:
+                new_solution.set_route(r_idx, route)
+    return new_solution, new_solution.cost() - solution.cost()
 
 # ===========================
 # Variable Neighborhood Search (VNS)
 # ===========================
-def VNS(max_iterations=100):
-    current_solution = initial_solution()
-    best_solution = copy.deepcopy(current_solution)
-    best_cost = solution_cost(best_solution)
+def VNS(max_iterations=100, granular_k=None, telemetry=None, termination=None, inter_route=True,
+        memory=None):
+    """
+    granular_k: if set, every operator is restricted to the granular_k
+    nearest customers and the local search is a best-improvement descent
+    over those candidate moves instead of random sampling (after the
+    inter-route descent when inter_route is set).
+    The 2-opt local search is always an exhaustive best-improvement
+    2-opt/Or-opt descent (RouteOptimizer) rather than random sampling.
+    inter_route: the swap and relocate local searches become one
+    InterRouteSearch descent (relocate, 2-opt*, CROSS-exchange, O(1) move
+    evaluation, restricted to the granular lists when granular_k is set).
+    memory: optional vrp_core.SolutionMemory. Shaken solutions that hash to
+    a tabu entry are dropped before local search, accepted solutions are
+    made tabu, and granular moves are hashed in O(1) before being built.
+    Telemetry events carry its stats(); the caller can also read them.
+    telemetry: optional vrp_core.Telemetry receiving one event per shake
+    (several per iteration; the operator is the neighborhood).
+    termination: optional vrp_core.Termination, checked before every shake
+    and, for its time limit, between local-search moves; the best solution
+    so far is returned as soon as it fires. With max_iterations=None
+    stopping is left to it alone.
+    """
+    current_solution = Solution(instance, initial_solution())
+    best_solution = current_solution.copy()
+    best_cost = best_solution.cost()
+    neighbors = nearest_neighbors(instance, granular_k) if granular_k else None
+    optimizer = RouteOptimizer(instance)
+    search = InterRouteSearch(instance, neighbors=neighbors) if inter_route else None
     
     neighborhoods = [swap_customers, relocate_customer, two_opt_all]
-    
-    for iteration in range(max_iterations):
+    if telemetry is not None:
+        telemetry.start("VNS")
+    if termination is not None:
+        termination.start()
+    stopped = False
+
+    for iteration in itertools.count() if max_iterations is None else range(max_iterations):
         k = 0
         while k < len(neighborhoods):
+            if termination is not None and termination.should_stop(iteration, best_cost):
+                stopped = True
+                break
+            watch = telemetry.stopwatch() if telemetry is not None else None
+            operator = neighborhoods[k].__name__
             # Shake
-            neighbor = neighborhoods[k](current_solution)
+            neighbor, _ = neighborhoods[k](current_solution, neighbors, memory=memory)
+            if watch is not None:
+                watch.lap("shake")
+            if memory is not None and memory.tabu_tenure and memory.is_tabu(neighbor.zobrist(memory)):
+                # revisited: skip the local search and move on
+                k += 1
+                continue
             # Local search
             improved = True
+            if neighborhoods[k] is two_opt_all:
+                neighbor, _ = optimize_routes(neighbor, optimizer)
+                improved = False
+            elif search is not None:
+                neighbor, _ = inter_route_descent(neighbor, search, termination)
+                # the inter-route descent has no swap: with granular lists the
+                # operator's own best-improvement descent finishes the job
+                improved = neighbors is not None
             while improved:
-                new_neighbor = neighborhoods[k](neighbor)
-                if solution_cost(new_neighbor) < solution_cost(neighbor):
+                if termination is not None and termination.expired():
+                    stopped = True
+                    break
+                new_neighbor, delta = neighborhoods[k](neighbor, neighbors, best=neighbors is not None,
+                                                       memory=memory)
+                if delta < 0:
                     neighbor = new_neighbor
                 else:
                     improved = False
+            if watch is not None:
+                watch.lap("local_search")
             # Acceptance
-            if solution_cost(neighbor) < solution_cost(current_solution):
+            accepted = neighbor.cost() < current_solution.cost()
+            new_best = accepted and neighbor.cost() < best_cost
+            if accepted:
                 current_solution = neighbor
-                if solution_cost(current_solution) < best_cost:
-                    best_solution = copy.deepcopy(current_solution)
-                    best_cost = solution_cost(best_solution)
+                if memory is not None:
+                    memory.make_tabu(current_solution.zobrist(memory))
+                if new_best:
+                    best_solution = current_solution.copy()
+                    best_cost = best_solution.cost()
                 k = 0  # restart neighborhoods
             else:
                 k += 1  # move to next neighborhood
+            if watch is not None:
+                watch.lap("evaluate")
+                telemetry.emit(iteration, current_solution.cost(), best_cost, operator=operator,
+                               accepted=accepted, new_best=new_best, stopwatch=watch,
+                               memory=memory.stats() if memory is not None else None)
+            if termination is not None and termination.reason is not None:
+                # expired during the local search, whose result was still judged
+                stopped = True
+                break
 
+        if stopped:
+            break
         if iteration % 10 == 0:
             print(f"Iteration {iteration}, best cost: {best_cost}")
-    
-    return best_solution, best_cost
+
+    return best_solution.routes, best_cost
 
 # ===========================
 # Run VNS
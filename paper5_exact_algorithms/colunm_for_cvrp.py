@@ -1,5 +1,9 @@
-import pulp
 from itertools import permutations, combinations
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import Instance, SetPartitioningMaster
 
 # ===========================
 # Problem instance (small CVRP)
@@ -15,6 +19,8 @@ distance = {
     (3, 0): 20, (3, 1): 25, (3, 2): 30
 }
 
+instance = Instance.from_dicts(customers, demand, vehicle_capacity, distance)
+
 # ===========================
 # Step 1: Generate all feasible routes (all subsets of customers)
 # ===========================
@@ -37,33 +43,17 @@ print(f"Number of feasible routes: {len(feasible_routes)}")
 for r in feasible_routes:
     print(r)
 
-# Compute route costs
-route_costs = {tuple(r): sum(distance[(r[i], r[i+1])] for i in range(len(r)-1)) for r in feasible_routes}
-
 # ===========================
-# Step 2: Master problem (Set Partitioning LP)
+# Step 2: Master problem (Set Partitioning), solved in process by HiGHS
 # ===========================
-master_prob = pulp.LpProblem("CVRP_Master", pulp.LpMinimize)
-
-# Variables: x_r = 1 if route r is selected
-x_vars = {tuple(r): pulp.LpVariable(f"x_{i}", cat='Binary') for i, r in enumerate(feasible_routes)}
-
-# Objective: minimize total cost
-master_prob += pulp.lpSum([route_costs[tuple(r)] * x_vars[tuple(r)] for r in feasible_routes])
-
-# Constraints: each customer visited exactly once
-for c in customers[1:]:
-    master_prob += pulp.lpSum([x_vars[tuple(r)] for r in feasible_routes if c in r]) == 1
-
-# Solve
-master_prob.solve(pulp.PULP_CBC_CMD(msg=1))
+master = SetPartitioningMaster(instance, feasible_routes)
+x, objective = master.solve_ip()
 
 # ===========================
 # Step 3: Output
 # ===========================
 print("\nSelected routes in solution:")
-for r in feasible_routes:
-    if pulp.value(x_vars[tuple(r)]) > 0.5:
-        print(tuple(r), "cost:", route_costs[tuple(r)])
+for r, value in master.selected(x, tol=0.5):
+    print(tuple(r), "cost:", instance.route_cost(r))
 
-print("\nTotal cost:", pulp.value(master_prob.objective))
+print("\nTotal cost:", objective)
@@ -1,5 +1,9 @@
-import pulp
-from itertools import permutations, combinations
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vrp_core import Instance, SetPartitioningMaster
 
 # ===========================
 # Problem instance (small VRPTW)
@@ -26,65 +30,87 @@ time_window = {
 
 service_time = {0:0, 1:5, 2:5, 3:5}  # service duration at each customer
 
+instance = Instance.from_dicts(customers, demand, vehicle_capacity, distance,
+                               time_window=time_window, service_time=service_time)
+
 # ===========================
-# Step 1: Generate all feasible routes (small example)
+# Step 1: Generate feasible routes by forward dynamic programming
 # Include time windows and capacity
 # ===========================
-def all_feasible_routes(customers, demand, capacity, distance, time_window, service_time):
-    routes = []
-    cust_list = customers[1:]
-    for r_size in range(1, len(cust_list)+1):
-        for subset in combinations(cust_list, r_size):
-            for perm in permutations(subset):
-                route = [0] + list(perm) + [0]
-                load = sum(demand[c] for c in perm)
-                if load > capacity:
+def _add_label(level, key, label):
+    """Keep label unless another path with the same key is no later and no dearer."""
+    labels = level.setdefault(key, [])
+    time, cost = label[0], label[1]
+    for other in labels:
+        if other[0] <= time and other[1] <= cost:
+            return
+    labels[:] = [other for other in labels if not (time <= other[0] and cost <= other[1])]
+    labels.append(label)
+
+def all_feasible_routes(instance):
+    """
+    Yield, for every customer set one vehicle can serve, its cheapest
+    feasible route. Partial paths are extended one customer per level and
+    dropped as soon as they break capacity or a time window, or when a path
+    with the same customer set and last customer is no later and no dearer
+    (same set means same load). Only one level is held in memory.
+    """
+    n = instance.n
+    # row by row, so a LazyDistanceMatrix is never materialized as one array
+    dist = [np.asarray(instance.dist[i]).tolist() for i in range(n)]
+    demand, ready = instance.demand.tolist(), instance.ready.tolist()
+    due, service = instance.due.tolist(), instance.service.tolist()
+    capacity = instance.capacity
+    # level: {(visited bitmask, last customer): [(departure time, cost, load, path)]}
+    level = {}
+    for c in range(1, n):
+        time = max(dist[0][c], ready[c])
+        if demand[c] <= capacity and time <= due[c]:
+            _add_label(level, (1 << c, c), (time + service[c], dist[0][c], demand[c], (0, c)))
+    while level:
+        # close every path back to the depot; keep the cheapest per customer set
+        best = {}
+        for (mask, last), labels in level.items():
+            for time, cost, load, path in labels:
+                if max(time + dist[last][0], ready[0]) > due[0]:
                     continue
-                # check time windows
-                time = 0
-                feasible = True
-                for i in range(len(route)-1):
-                    from_c, to_c = route[i], route[i+1]
-                    time += distance[(from_c, to_c)]
-                    time = max(time, time_window[to_c][0])
-                    if time > time_window[to_c][1]:
-                        feasible = False
-                        break
-                    time += service_time[to_c]
-                if feasible:
-                    routes.append(route)
-    return routes
+                total = cost + dist[last][0]
+                if mask not in best or total < best[mask][0]:
+                    best[mask] = (total, path)
+        for total, path in best.values():
+            yield list(path) + [0]
 
-feasible_routes = all_feasible_routes(customers, demand, vehicle_capacity, distance, time_window, service_time)
-print(f"Number of feasible routes: {len(feasible_routes)}")
-for r in feasible_routes:
-    print(r)
+        next_level = {}
+        for (mask, last), labels in level.items():
+            for time, cost, load, path in labels:
+                for c in range(1, n):
+                    if mask >> c & 1 or load + demand[c] > capacity:
+                        continue
+                    arrival = max(time + dist[last][c], ready[c])
+                    if arrival > due[c]:
+                        continue
+                    _add_label(next_level, (mask | 1 << c, c),
+                               (arrival + service[c], cost + dist[last][c], load + demand[c], path + (c,)))
+        level = next_level
 
-# Compute route costs
-route_costs = {tuple(r): sum(distance[(r[i], r[i+1])] for i in range(len(r)-1)) for r in feasible_routes}
+# Collect the routes while streaming them
+feasible_routes = []
+for r in all_feasible_routes(instance):
+    print(r)
+    feasible_routes.append(r)
+print(f"Number of feasible routes: {len(feasible_routes)}")
 
 # ===========================
-# Step 2: Master problem (Set Partitioning)
+# Step 2: Master problem (Set Partitioning), solved in process by HiGHS
 # ===========================
-master_prob = pulp.LpProblem("VRPTW_Master", pulp.LpMinimize)
-x_vars = {tuple(r): pulp.LpVariable(f"x_{i}", cat='Binary') for i,r in enumerate(feasible_routes)}
-
-# Objective
-master_prob += pulp.lpSum([route_costs[tuple(r)] * x_vars[tuple(r)] for r in feasible_routes])
-
-# Each customer visited exactly once
-for c in customers[1:]:
-    master_prob += pulp.lpSum([x_vars[tuple(r)] for r in feasible_routes if c in r]) == 1
-
-# Solve
-master_prob.solve(pulp.PULP_CBC_CMD(msg=1))
+master = SetPartitioningMaster(instance, feasible_routes)
+x, objective = master.solve_ip()
 
 # ===========================
 # Step 3: Output
 # ===========================
 print("\nSelected routes in solution:")
-for r in feasible_routes:
-    if pulp.value(x_vars[tuple(r)]) > 0.5:
-        print(tuple(r), "cost:", route_costs[tuple(r)])
+for r, value in master.selected(x, tol=0.5):
+    print(tuple(r), "cost:", instance.route_cost(r))
 
-print("\nTotal cost:", pulp.value(master_prob.objective))
+print("\nTotal cost:", objective)
@@ -0,0 +1,55 @@
+import itertools
+
+import numpy as np
+
+from vrp_core import Instance, route_feasible
+
+
+def random_cvrp(seed, n=20, capacity=15):
+    rng = np.random.default_rng(seed)
+    return Instance.from_coords(rng.uniform(0, 100, size=(n, 2)),
+                                np.concatenate(([0], rng.integers(1, 6, size=n - 1))), capacity)
+
+
+def random_vrptw(seed, n_customers=6, capacity=6, horizon=250):
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, 100, size=(n_customers + 1, 2))
+    coords[0] = 50
+    demand = np.concatenate(([0], rng.integers(1, 4, size=n_customers)))
+    ready = np.concatenate(([0.0], rng.uniform(0, 120, size=n_customers)))
+    due = np.concatenate(([horizon], ready[1:] + rng.uniform(10, 60, size=n_customers)))
+    service = np.concatenate(([0.0], np.full(n_customers, 10.0)))
+    return Instance.from_coords(coords, demand, capacity, ready=ready, due=due, service=service)
+
+
+def feasible_routes(instance):
+    """Every elementary route meeting capacity and time windows."""
+    customers = range(1, instance.n)
+    for size in range(1, instance.n):
+        for subset in itertools.combinations(customers, size):
+            if sum(instance.demand[list(subset)]) > instance.capacity:
+                continue
+            for perm in itertools.permutations(subset):
+                route = [0, *perm, 0]
+                if route_feasible(instance, route):
+                    yield route
+
+
+def random_routes(rng, customers, max_len=4):
+    """Split a shuffled customer list into routes of 1..max_len customers."""
+    customers = list(customers)
+    rng.shuffle(customers)
+    routes, k = [], 0
+    while k < len(customers):
+        size = int(rng.integers(1, max_len + 1))
+        routes.append([0] + customers[k:k + size] + [0])
+        k += size
+    return routes
+
+
+def use_instance(module, instance):
+    """Point a paper script's module globals at `instance` (as the benchmark adapters do)."""
+    module.instance = instance
+    module.customers = list(range(instance.n))
+    module.demand = {i: int(d) for i, d in enumerate(instance.demand)}
+    module.vehicle_capacity = instance.capacity
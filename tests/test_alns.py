@@ -0,0 +1,101 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from helpers import random_cvrp, random_routes, use_instance
+
+
+@pytest.fixture
+def alns(load_script):
+    module = load_script("paper3_network_vrp/ALNS.py")
+    use_instance(module, random_cvrp(0, n=20, capacity=15))
+    return module
+
+
+def _fake_cpu_clock(monkeypatch, module, durations):
+    # process_time is read before and after every operator call
+    ticks, now = [], 0.0
+    for d in durations:
+        ticks += [now, now + d]
+        now += d
+    ticks = iter(ticks)
+    monkeypatch.setattr(module.time, "process_time", lambda: next(ticks))
+
+
+def test_segment_update_weights_scores_by_relative_cpu_time(alns, monkeypatch):
+    selector = alns.OperatorSelector({"a": lambda: None, "b": lambda: None, "c": lambda: None},
+                                     segment_length=4, reaction=0.5)
+    _fake_cpu_clock(monkeypatch, alns, [1.0, 1.0, 3.0, 3.0])
+    for name, outcome in [("a", 0), ("a", 1), ("b", 2), ("b", None)]:
+        selector(name)
+        selector.update(name, outcome)
+    # a: 42 / 2 calls over a relative time of 1/2; b: 13 / 2 calls over 3/2
+    assert selector.weights["a"] == pytest.approx(0.5 * 1 + 0.5 * 42)
+    assert selector.weights["b"] == pytest.approx(0.5 * 1 + 0.5 * 6.5 / 1.5)
+    assert selector.weights["c"] == 1.0
+    assert selector.stats()["b"] == (selector.weights["b"], 2, 6.0)
+
+
+def test_segment_update_without_time_weighting(alns, monkeypatch):
+    selector = alns.OperatorSelector({"a": lambda: None, "b": lambda: None},
+                                     segment_length=2, reaction=0.5, time_weighted=False)
+    _fake_cpu_clock(monkeypatch, alns, [1.0, 3.0])
+    selector("a")
+    selector.update("a", 0)
+    selector("b")
+    selector.update("b", 2)
+    assert selector.weights == pytest.approx({"a": 0.5 + 0.5 * 33, "b": 0.5 + 0.5 * 13})
+
+
+def test_weights_never_fall_below_the_floor(alns):
+    selector = alns.OperatorSelector({"a": lambda: None, "b": lambda: None},
+                                     segment_length=1, reaction=1.0)
+    for _ in range(3):
+        selector("a")
+        selector.update("a", None)
+    assert selector.weights == {"a": 1e-2, "b": 1.0}
+
+
+def test_roulette_follows_the_weights_with_a_seeded_rng(alns):
+    def selector(seed):
+        s = alns.OperatorSelector({"a": None, "b": None, "c": None}, rng=random.Random(seed))
+        s.weights = {"a": 1.0, "b": 3.0, "c": 0.0}
+        return s
+
+    s = selector(7)
+    picks = [s.select() for _ in range(4000)]
+    s = selector(7)
+    assert picks == [s.select() for _ in range(4000)]
+    assert "c" not in picks
+    assert picks.count("b") / len(picks) == pytest.approx(0.75, abs=0.03)
+
+
+@pytest.mark.parametrize("operator", ["random", "worst", "shaw"])
+@pytest.mark.parametrize("n_remove", [1, 3, 7])
+def test_removal_takes_exactly_n_remove_and_keeps_its_input(alns, operator, n_remove):
+    random.seed(n_remove)
+    solution = random_routes(np.random.default_rng(n_remove), range(1, 20))
+    before = copy.deepcopy(solution)
+    partial, removed = alns.DESTROY_OPERATORS[operator](solution, n_remove)
+    assert solution == before
+    assert len(removed) == len(set(removed)) == n_remove
+    left = [c for route in partial for c in route[1:-1]]
+    assert sorted(left + list(removed)) == list(range(1, 20))
+    assert all(route[0] == route[-1] == 0 for route in partial)
+
+
+@pytest.mark.parametrize("n_remove", [1, 3, 7])
+def test_route_removal_takes_whole_routes(alns, n_remove):
+    random.seed(n_remove)
+    solution = random_routes(np.random.default_rng(n_remove), range(1, 20))
+    before = copy.deepcopy(solution)
+    partial, removed = alns.route_removal(solution, n_remove)
+    assert solution == before
+    # whole routes go until at least n_remove customers are out, and no more
+    dropped = [route for route in solution if route not in partial]
+    assert sorted(removed) == sorted(c for route in dropped for c in route[1:-1])
+    assert len(removed) >= n_remove
+    assert len(removed) - max(len(route) - 2 for route in dropped) < n_remove
+    assert len(partial) + len(dropped) == len(solution)
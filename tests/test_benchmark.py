@@ -0,0 +1,60 @@
+import importlib
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from vrp_core import BranchAndPrice, Instance, read_instance
+
+SOLOMON = """TINY
+
+VEHICLE
+NUMBER     CAPACITY
+  25         10
+
+CUSTOMER
+CUST NO.  XCOORD.   YCOORD.    DEMAND   READY TIME  DUE DATE   SERVICE TIME
+
+    0      40         50          0          0       240          0
+    1      45         68          3          0        25         10
+    2      45         70          2          0        25         10
+    3      42         66          4          0       200         10
+    4      20         50          2         10        50         10
+    5      25         52          3          0       200         10
+    6      60         40          4        140       180         10
+"""
+
+
+@pytest.fixture
+def benchmark(monkeypatch):
+    # runs happen in spawned processes that unpickle _run by module name
+    monkeypatch.syspath_prepend(os.path.join(ROOT, "benchmarks"))
+    return importlib.import_module("benchmark")
+
+
+def test_solomon_instance_end_to_end(benchmark, tmp_path):
+    pytest.importorskip("pulp")
+    path = tmp_path / "tiny.txt"
+    path.write_text(SOLOMON)
+    instance = read_instance(str(path))
+    assert benchmark.has_time_windows(instance)
+    (tmp_path / "tiny.sol").write_text("Route #1: 1 2\nCost 200\n")
+
+    rows = benchmark.run_suite(str(tmp_path), solvers=["CG", "ALNS"], iterations=50, time_limit=120)
+    by_solver = {row["solver"]: row for row in rows}
+    assert by_solver["ALNS"]["status"] == "unsupported"
+    cg = by_solver["CG"]
+    assert cg["status"] == "ok" and cg["n"] == 7 and cg["bks"] == 200
+    # the CG cost is the root LP bound under the time windows, which bind:
+    # customers 1 and 2 are both due before either can be reached from the other
+    _, root_bound = BranchAndPrice(instance).column_generation(frozenset())
+    relaxed = Instance(np.asarray(instance.dist), instance.demand, instance.capacity)
+    assert root_bound > BranchAndPrice(relaxed).column_generation(frozenset())[1] + 1
+    assert cg["cost"] == pytest.approx(root_bound, rel=1e-6)
+    assert cg["gap"] == pytest.approx((root_bound - 200) / 200)
+
+    out = tmp_path / "results.csv"
+    benchmark.write_results(rows, str(out))
+    header, *lines = out.read_text().splitlines()
+    assert header.split(",") == benchmark.FIELDS and len(lines) == 2
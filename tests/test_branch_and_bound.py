@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.fixture
+def bnb(load_script):
+    return load_script("paper1_vrp_general/branch-and-bound-scipy.py")
+
+
+@pytest.mark.parametrize("strategy", ["best-first", "depth-first", "best-estimate"])
+def test_strategies_find_the_optimum(bnb, strategy):
+    (x, objective), stats, edges, node_values = bnb.branch_and_bound(strategy=strategy)
+    # max x1 + 0.64 x2 s.t. 50 x1 + 31 x2 <= 250, -3 x1 + 2 x2 <= 4, x integer
+    assert x == (5.0, 0.0)
+    assert objective == pytest.approx(5.0)
+    assert stats["gap"] == 0.0 and stats["open"] == 0
+    assert len(edges) == stats["explored"] - 1
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_node_limit_caps_the_solved_nodes(bnb, limit):
+    _, stats, edges, _ = bnb.branch_and_bound(node_limit=limit)
+    assert stats["explored"] == limit
+    assert stats["open"] > 0
+    assert len(edges) == limit - 1
+
+
+def test_node_limit_keeps_a_valid_gap(bnb):
+    (_, full), full_stats, _, _ = bnb.branch_and_bound()
+    for limit in range(1, full_stats["explored"]):
+        (x, objective), stats, _, _ = bnb.branch_and_bound(node_limit=limit)
+        if x[0] is not None:
+            assert objective <= full + 1e-9
+            # the optimum lies within the reported gap
+            assert objective * (1 + stats["gap"]) >= full - 1e-9
+
+
+def test_unknown_strategy(bnb):
+    with pytest.raises(ValueError):
+        bnb.branch_and_bound(strategy="breadth-first")
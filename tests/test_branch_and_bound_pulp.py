@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("highspy")
+pytest.importorskip("pulp")
+
+
+@pytest.fixture
+def pulp_bnb(load_script):
+    return load_script("paper1_vrp_general/branch-and-bound-pulp.py")
+
+
+def test_optimum_matches_the_scipy_version(load_script, pulp_bnb):
+    scipy_bnb = load_script("paper1_vrp_general/branch-and-bound-scipy.py")
+    (x, objective), _, _, _ = scipy_bnb.branch_and_bound()
+    pulp_bnb.branch_and_bound()
+    assert pulp_bnb.best_solution[0] == x
+    assert pulp_bnb.best_solution[1] == pytest.approx(objective)
+
+
+def test_children_start_from_their_parents_basis(pulp_bnb, monkeypatch):
+    calls = []
+    solve = pulp_bnb.node_lp.solve
+
+    def recording_solve(bounds, basis=None):
+        result = solve(bounds, basis)
+        calls.append((basis, result[2] if result else None))
+        return result
+
+    monkeypatch.setattr(pulp_bnb.node_lp, "solve", recording_solve)
+    pulp_bnb.branch_and_bound()
+    assert len(calls) == pulp_bnb.node_counter and pulp_bnb.edges
+    assert calls[0][0] is None
+    for parent, child in pulp_bnb.edges:
+        basis = calls[child][0]
+        assert basis is calls[parent][1] and basis.valid
@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from helpers import feasible_routes, random_cvrp, random_vrptw
+from vrp_core import BranchAndPrice, route_feasible
+
+
+def brute_force(instance):
+    """Optimal cost by enumerating every feasible route and partitioning, or inf."""
+    best_route = {}
+    for route in feasible_routes(instance):
+        mask = sum(1 << (c - 1) for c in route[1:-1])
+        best_route[mask] = min(best_route.get(mask, math.inf), instance.route_cost(route))
+    full = (1 << (instance.n - 1)) - 1
+    best = [math.inf] * (full + 1)
+    best[0] = 0.0
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        sub = mask
+        while sub:
+            if sub & low and sub in best_route:
+                best[mask] = min(best[mask], best[mask ^ sub] + best_route[sub])
+            sub = (sub - 1) & mask
+    return best[full]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_brute_force(seed):
+    instance = random_vrptw(seed)
+    expected = brute_force(instance)
+    routes, cost, stats = BranchAndPrice(instance).solve(verbose=False)
+    if math.isinf(expected):
+        assert stats["status"] == "infeasible"
+        return
+    assert stats["status"] == "optimal"
+    assert cost == pytest.approx(expected, abs=1e-6)
+    assert sorted(c for r in routes for c in r[1:-1]) == list(range(1, instance.n))
+    for route in routes:
+        assert route_feasible(instance, route)
+        assert instance.route_load(route) <= instance.capacity
+    assert sum(instance.route_cost(r) for r in routes) == pytest.approx(cost, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_ng_route_pricing_keeps_the_optimum(seed):
+    # ng memories of one customer let pricing return cycling routes; they
+    # only weaken the bound, the incumbent must still be elementary and optimal
+    instance = random_cvrp(seed, n=7, capacity=8)
+    routes, cost, stats = BranchAndPrice(instance, ng_size=1).solve(verbose=False)
+    assert stats["status"] == "optimal"
+    assert cost == pytest.approx(brute_force(instance), abs=1e-6)
+    assert sorted(c for r in routes for c in r[1:-1]) == list(range(1, instance.n))
@@ -0,0 +1,37 @@
+import pytest
+
+from helpers import random_cvrp
+from vrp_core import Decomposition, regret_insertion, sub_instance
+
+
+def regret_solver(instance):
+    # picklable stand-in for a metaheuristic adapter
+    routes = regret_insertion(instance, [], [], list(range(1, instance.n)), 2)
+    return routes, instance.solution_cost(routes)
+
+
+def test_sub_instance_maps_back():
+    instance = random_cvrp(0, n=30)
+    sub, idx = sub_instance(instance, [4, 9, 17])
+    assert idx.tolist() == [0, 4, 9, 17]
+    assert sub.dist[1, 3] == pytest.approx(instance.dist[4, 17])
+    assert sub.demand.tolist() == instance.demand[[0, 4, 9, 17]].tolist()
+
+
+@pytest.mark.parametrize("method", ["sweep", "kmeans"])
+def test_rounds_cover_every_customer_and_never_get_worse(method):
+    instance = random_cvrp(1, n=120, capacity=20)
+    decomposition = Decomposition(instance, regret_solver, size=25, method=method, max_workers=2)
+    routes, cost, stats = decomposition.solve(max_rounds=4, verbose=False)
+    assert sorted(c for r in routes for c in r[1:-1]) == list(range(1, instance.n))
+    assert all(instance.route_load(r) <= instance.capacity for r in routes)
+    assert cost == pytest.approx(instance.solution_cost(routes))
+    costs = [c for _, c, _ in stats["history"]]
+    assert all(b <= a + 1e-9 for a, b in zip(costs, costs[1:]))
+
+
+def test_needs_coordinates():
+    from vrp_core import Instance
+    instance = Instance([[0, 1], [1, 0]], [0, 1], 5)
+    with pytest.raises(ValueError):
+        Decomposition(instance, regret_solver)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from vrp_core import LazyDistanceMatrix, euclidean_matrix
+
+
+def test_lazy_matches_full_matrix():
+    coords = np.random.default_rng(0).uniform(0, 100, size=(300, 2))
+    full = euclidean_matrix(coords)
+    lazy = LazyDistanceMatrix(coords, block_size=64, max_bytes=64 * 300 * 8 * 2)
+    for i in (0, 5, 299, 64, 5):
+        np.testing.assert_allclose(lazy[i], full[i])
+    r = np.array([0, 7, 150, 299, 0])
+    np.testing.assert_allclose(lazy[r[:-1], r[1:]], full[r[:-1], r[1:]])
+    assert lazy[3, 200] == pytest.approx(full[3, 200])
+
+
+@pytest.mark.parametrize("n, max_bytes", [(200_000, 64 * 2**20), (1000, 10_000), (50, 1)])
+def test_one_block_fits_the_budget(n, max_bytes):
+    lazy = LazyDistanceMatrix(np.zeros((n, 2)), max_bytes=max_bytes)
+    block_bytes = lazy.block_size * n * lazy.dtype.itemsize
+    assert lazy.block_size >= 1
+    assert block_bytes <= max_bytes or lazy.block_size == 1
+    assert lazy.max_blocks * block_bytes <= max(max_bytes, block_bytes)
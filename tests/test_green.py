@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from vrp_core import FuelModel, GreenCost, Instance
+
+
+def test_no_range_allocates_no_tables_and_prices_load():
+    coords = [(0, 0), (3, 0), (3, 4)]
+    instance = Instance.from_coords(coords, [0, 2, 1], 5)
+    green = GreenCost(instance, FuelModel(empty_rate=1.0, load_rate=0.5))
+    assert green.best_station is None and green.reach is None
+    # loads carried on the three arcs: 3, 1, 0
+    assert green.route_cost([0, 1, 2, 0]) == pytest.approx(3 * 2.5 + 4 * 1.5 + 5 * 1.0)
+    assert green.plan([0, 1, 2, 0]) == [0, 1, 2, 0]
+
+
+def test_station_detour_is_inserted():
+    # depot 0, customer 1 at distance 80, station 2 half-way; range 90
+    instance = Instance.from_coords([(0, 0), (80, 0), (40, 0)], [0, 1, 0], 5)
+    green = GreenCost(instance, stations=[2], vehicle_range=90)
+    assert green.plan([0, 1, 0]) == [0, 2, 1, 2, 0]
+    fuel, load, violations = green.evaluate([0, 1, 0])
+    assert violations == 0 and fuel == pytest.approx(160)
+    # without the station the same route breaks the range
+    no_station = GreenCost(instance, vehicle_range=90)
+    assert no_station.evaluate([0, 1, 0])[2] > 0
+
+
+def test_best_station_table_matches_enumeration():
+    rng = np.random.default_rng(1)
+    n, R = 25, 70.0
+    instance = Instance.from_coords(rng.uniform(0, 100, size=(n, 2)), np.zeros(n, dtype=int), 10)
+    stations = [20, 21, 22, 23, 24]
+    green = GreenCost(instance, stations=stations, vehicle_range=R)
+    d = np.asarray(instance.dist)
+    reach = np.minimum(d[:, 0], d[:, stations].min(axis=1))
+    for i in range(n):
+        for j in range(n):
+            options = [(d[i, s] + d[s, j], s) for s in stations
+                       if d[i, s] <= R and d[s, j] + reach[j] <= R]
+            if not options:
+                assert green.best_station[i, j] == -1
+                continue
+            via, s = min(options)
+            assert green.best_station[i, j] == s
+            assert green.detour[i, j] == pytest.approx(via - d[i, j])
@@ -0,0 +1,25 @@
+import pytest
+
+from helpers import random_cvrp
+from vrp_core import insertion_deltas, regret_insertion
+
+
+def test_insertion_deltas_match_recosting():
+    instance = random_cvrp(1)
+    route = [0, 3, 7, 1, 0]
+    deltas = insertion_deltas(instance.dist, route, 5)
+    base = instance.route_cost(route)
+    for p in range(1, len(route)):
+        assert deltas[p - 1] == pytest.approx(instance.route_cost(route[:p] + [5] + route[p:]) - base)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_regret_insertion_inserts_every_customer_within_capacity(k):
+    instance = random_cvrp(2, n=25, capacity=12)
+    routes = [[0, 1, 2, 0], [0, 3, 0]]
+    loads = [instance.route_load(r) for r in routes]
+    pending = list(range(4, instance.n))
+    routes = regret_insertion(instance, routes, loads, pending, k)
+    assert sorted(c for r in routes for c in r[1:-1]) == list(range(1, instance.n))
+    assert loads == [instance.route_load(r) for r in routes]
+    assert all(load <= instance.capacity for load in loads)
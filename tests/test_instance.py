@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from helpers import random_cvrp
+from vrp_core import Instance
+
+
+def test_from_dicts_matches_the_dicts():
+    customers = [0, 1, 2]
+    distance = {(i, j): 10 * i + j for i in customers for j in customers if i != j}
+    instance = Instance.from_dicts(customers, {0: 0, 1: 4, 2: 3}, 5, distance,
+                                   time_window={0: (0, 100), 1: (5, 20), 2: (0, 50)})
+    assert instance.n == 3 and instance.dist.dtype == np.int64
+    for (i, j), d in distance.items():
+        assert instance.dist[i, j] == d
+    assert instance.ready.tolist() == [0, 5, 0] and instance.due.tolist() == [100, 20, 50]
+    with pytest.raises(ValueError):
+        Instance.from_dicts(customers, {0: 0, 1: 4, 2: 3}, 5, {(0, 1): 1})
+
+
+def test_route_and_solution_cost():
+    instance = random_cvrp(0, n=8, capacity=6)
+    route = [0, 3, 1, 5, 0]
+    expected = sum(instance.dist[i, j] for i, j in zip(route[:-1], route[1:]))
+    assert instance.route_cost(route) == pytest.approx(expected)
+    assert instance.route_load(route) == instance.demand[[3, 1, 5]].sum()
+    routes = [route, [0, 2, 4, 6, 7, 0]]
+    overload = sum(max(0, instance.route_load(r) - 6) for r in routes)
+    assert instance.solution_cost(routes, penalty=100) == pytest.approx(
+        sum(instance.route_cost(r) for r in routes) + 100 * overload)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    instance = random_cvrp(1, n=10)
+    instance.save(tmp_path)
+    loaded = Instance.load(tmp_path)
+    np.testing.assert_array_equal(loaded.dist, instance.dist)
+    np.testing.assert_array_equal(loaded.demand, instance.demand)
+    assert loaded.capacity == instance.capacity
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from helpers import random_cvrp, random_routes
+from vrp_core import InterRouteSearch, RouteData, nearest_neighbors
+
+
+def objective(search, routes):
+    return sum(search._objective(search.instance.route_cost(r), search.instance.route_load(r)) for r in routes)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_inter_route_moves_match_recosting(seed):
+    instance = random_cvrp(seed, n=16, capacity=12)
+    routes = random_routes(np.random.default_rng(seed), range(1, instance.n), max_len=5)
+    search = InterRouteSearch(instance, max_segment=2)
+    data = [RouteData(instance, r) for r in routes]
+
+    def check(result, move):
+        ra, route_a, rb, route_b = search._apply(routes, move)
+        cost_a, load_a, cost_b, load_b = result
+        assert cost_a == pytest.approx(instance.route_cost(route_a))
+        assert cost_b == pytest.approx(instance.route_cost(route_b))
+        assert load_a == instance.route_load(route_a) and load_b == instance.route_load(route_b)
+
+    for ra, A in enumerate(data):
+        for rb, B in enumerate(data):
+            if ra == rb:
+                continue
+            na, nb = len(A.route), len(B.route)
+            for i in range(1, na - 1):
+                for j in range(nb - 1):
+                    check(search._relocate(A, i, B, j), ("relocate", ra, i, rb, j))
+            for i in range(na - 1):
+                for j in range(nb - 1):
+                    check(search._two_opt_star(A, i, B, j), ("2opt*", ra, i, rb, j))
+            for i1 in range(1, na - 1):
+                for i2 in range(i1, min(i1 + 2, na - 1)):
+                    for j1 in range(1, nb - 1):
+                        for j2 in range(j1, min(j1 + 2, nb - 1)):
+                            check(search._cross(A, i1, i2, B, j1, j2), ("cross", ra, i1, i2, rb, j1, j2))
+
+
+@pytest.mark.parametrize("neighbors", [None, 5])
+def test_descend_reports_its_gain(neighbors):
+    instance = random_cvrp(4, n=30, capacity=15)
+    routes = random_routes(np.random.default_rng(4), range(1, instance.n))
+    knn = nearest_neighbors(instance, neighbors) if neighbors else None
+    search = InterRouteSearch(instance, neighbors=knn)
+    new, delta = search.descend(routes)
+    assert sorted(c for r in new for c in r[1:-1]) == list(range(1, instance.n))
+    assert all(len(r) > 2 for r in new)
+    assert delta < 0
+    assert delta == pytest.approx(objective(search, new) - objective(search, routes))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from vrp_core import Instance, RouteOptimizer, or_opt_deltas, two_opt_deltas
+
+
+def asymmetric_instance(seed, n=12):
+    rng = np.random.default_rng(seed)
+    dist = rng.uniform(1, 100, size=(n, n))
+    np.fill_diagonal(dist, 0)
+    return Instance(dist, np.ones(n, dtype=int), n)
+
+
+def cost(dist, route):
+    return sum(dist[i, j] for i, j in zip(route[:-1], route[1:]))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_two_opt_deltas_match_recosting(seed):
+    instance = asymmetric_instance(seed)
+    route = [0, *np.random.default_rng(seed).permutation(np.arange(1, instance.n)).tolist(), 0]
+    sub = instance.dist[np.ix_(route, route)]
+    delta = two_opt_deltas(sub)
+    base = cost(instance.dist, route)
+    for i in range(1, len(route) - 1):
+        for j in range(i + 1, len(route) - 1):
+            new = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+            assert delta[i - 1, j - 1] == pytest.approx(cost(instance.dist, new) - base)
+
+
+@pytest.mark.parametrize("length", [1, 2, 3])
+def test_or_opt_deltas_match_recosting(length):
+    instance = asymmetric_instance(length)
+    route = [0, *range(1, instance.n), 0]
+    sub = instance.dist[np.ix_(route, route)]
+    delta = or_opt_deltas(sub, length)
+    base = cost(instance.dist, route)
+    for s in range(1, len(route) - length):
+        segment = route[s:s + length]
+        rest = route[:s] + route[s + length:]
+        for p in range(len(route) - 1):
+            if s - 1 <= p <= s + length - 1:
+                assert delta[s - 1, p] == np.inf
+                continue
+            at = p + 1 if p < s else p + 1 - length
+            new = rest[:at] + segment + rest[at:]
+            assert delta[s - 1, p] == pytest.approx(cost(instance.dist, new) - base)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_route_optimizer_reports_its_gain(seed):
+    instance = asymmetric_instance(seed, n=15)
+    route = [0, *range(1, instance.n), 0]
+    optimizer = RouteOptimizer(instance)
+    new, gain = optimizer.optimize(route)
+    assert sorted(new) == sorted(route) and new[0] == new[-1] == 0
+    assert gain <= 0
+    assert gain == pytest.approx(cost(instance.dist, new) - cost(instance.dist, route))
+    evaluations = optimizer.evaluations
+    assert optimizer.optimize(new) == (new, 0.0) and optimizer.evaluations == evaluations
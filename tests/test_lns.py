@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from helpers import random_cvrp, use_instance
+from vrp_core import SolutionMemory
+
+
+@pytest.fixture
+def lns(load_script):
+    module = load_script("paper4_general_gvrp/LNS_for_generalvrp.py")
+    use_instance(module, random_cvrp(0, n=12, capacity=8))
+    return module
+
+
+def test_memory_skips_repeats_without_changing_the_search(lns, capsys):
+    random.seed(3)
+    routes, cost = lns.LNS(max_iterations=300)
+    memory = SolutionMemory()
+    random.seed(3)
+    routes_memo, cost_memo = lns.LNS(max_iterations=300, memory=memory)
+    assert cost_memo == pytest.approx(cost)
+    assert routes_memo == routes
+    assert memory.hits > 0
+
+
+def test_an_accepting_cache_hit_is_rebuilt(lns, capsys):
+    random.seed(5)
+    routes, cost = lns.LNS(max_iterations=50)
+    memory = SolutionMemory()
+    lookup = memory.lookup
+    # a hash collision: the first lookups claim an unbeatable cost
+    collisions = iter([-1e9] * 3)
+    memory.lookup = lambda h: next(collisions, None) or lookup(h)
+    random.seed(5)
+    assert lns.LNS(max_iterations=50, memory=memory) == (routes, cost)
+    assert "Solution memory" not in capsys.readouterr().out
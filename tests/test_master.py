@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from helpers import random_cvrp
+from vrp_core import SetPartitioningMaster, incidence_matrix, route_costs
+
+
+def test_master_matrix_costs_and_lp_duals():
+    instance = random_cvrp(3, n=6, capacity=100)
+    routes = [[0, c, 0] for c in range(1, 6)] + [[0, 1, 2, 0], [0, 3, 4, 5, 0], [0, 2, 3, 0]]
+    np.testing.assert_allclose(route_costs(instance, routes), [instance.route_cost(r) for r in routes])
+    A = incidence_matrix(routes, instance.n).toarray()
+    assert A[:, 5].tolist() == [1, 1, 0, 0, 0]
+    master = SetPartitioningMaster(instance, routes)
+    x, objective, duals = master.solve_lp()
+    assert objective == pytest.approx(master.costs @ x)
+    np.testing.assert_allclose(A @ x, 1)
+    # LP optimality: no column has a negative reduced cost
+    assert (master.costs - A.T @ duals[1:] >= -1e-7).all()
+    x_ip, objective_ip = master.solve_ip()
+    assert objective_ip >= objective - 1e-7
+    assert sorted(c for r, _ in master.selected(x_ip, tol=0.5) for c in r[1:-1]) == [1, 2, 3, 4, 5]
+
+
+def test_add_routes_grows_buffers_geometrically():
+    instance = random_cvrp(4, n=12, capacity=100)
+    rng = np.random.default_rng(0)
+    routes = [[0, *rng.choice(np.arange(1, 12), size=rng.integers(1, 5), replace=False).tolist(), 0]
+              for _ in range(300)]
+    routes.append([0, 3, 5, 3, 0])  # an ng-route visiting 3 twice
+    master = SetPartitioningMaster(instance, routes[:1])
+    reallocations, buffer = 0, master._data
+    for route in routes[1:]:
+        master.add_routes([route])
+        if master._data is not buffer:
+            reallocations, buffer = reallocations + 1, master._data
+    # one column at a time, yet the buffers were copied only O(log m) times
+    assert reallocations <= 12
+    np.testing.assert_array_equal(master.A.toarray(), incidence_matrix(routes, instance.n).toarray())
+    np.testing.assert_allclose(master.costs, route_costs(instance, routes))
+    assert master.A.shape == (11, len(routes)) and master.A[2, len(routes) - 1] == 2
+    x, objective, _ = master.solve_lp()
+    assert objective == pytest.approx(master.costs @ x)
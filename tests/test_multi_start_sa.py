@@ -0,0 +1,43 @@
+import importlib
+import os
+import random
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def sa(monkeypatch):
+    # the pool's workers unpickle _run_chain by module name, so import the
+    # script as a real module rather than through load_script
+    monkeypatch.syspath_prepend(os.path.join(ROOT, "paper2_gvrp_survey"))
+    return importlib.import_module("GVRP_SA")
+
+
+def test_chains_are_reproducible_and_the_best_one_wins(sa):
+    kwargs = dict(n_chains=3, max_iter=150, initial_temp=50, seed=11, max_workers=2)
+    routes, cost, traces = sa.multi_start_sa(**kwargs)
+    assert sa.multi_start_sa(**kwargs) == (routes, cost, traces)
+
+    # every chain replayed in process from its own seed gives the pool's trace
+    chain_costs = []
+    for k, s in enumerate(np.random.SeedSequence(11).generate_state(3)):
+        state = random.Random(int(s)).getstate()
+        _, chain_routes, chain_cost, _, _, trace = sa._run_chain((None, 50, 0, 150, 0.995, state))
+        assert trace == traces[k]
+        assert chain_cost == pytest.approx(sa.compute_cost(chain_routes))
+        chain_costs.append(chain_cost)
+    assert cost == min(chain_costs)
+    assert cost == pytest.approx(sa.compute_cost(routes))
+
+
+def test_migration_restarts_every_chain_from_the_best(sa):
+    routes, cost, traces = sa.multi_start_sa(n_chains=2, max_iter=100, initial_temp=50, seed=3,
+                                             migrate_every=50, max_workers=2)
+    # the second segment of every chain starts from the best after the first
+    best_after_first = min(min(c for i, c in trace if i < 50) for trace in traces)
+    for trace in traces:
+        assert (50, pytest.approx(best_after_first)) in trace
+    assert cost <= best_after_first + 1e-9
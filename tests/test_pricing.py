@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+import pytest
+
+from helpers import feasible_routes, random_cvrp, random_vrptw
+from vrp_core import BranchAndPrice, PricingProblem, route_feasible
+from vrp_core.pricing import _ng_feasible, ng_neighborhoods
+
+
+def reduced_cost(instance, duals, route):
+    return instance.route_cost(route) - sum(duals[c] for c in route[1:-1])
+
+
+@pytest.mark.parametrize("bidirectional", [True, False])
+@pytest.mark.parametrize("seed", range(10))
+def test_exact_pricing_finds_the_most_negative_route(seed, bidirectional):
+    instance = random_vrptw(seed, horizon=400)
+    duals = np.concatenate(([0.0], np.random.default_rng(seed).uniform(0, 80, size=instance.n - 1)))
+    expected = min(reduced_cost(instance, duals, r) for r in feasible_routes(instance))
+    pricing = PricingProblem(instance, bidirectional=bidirectional, ng_size=None)
+    priced = pricing.solve(duals, max_routes=1000)
+    if expected >= -1e-4:
+        assert priced == []
+        return
+    assert priced[0][0] == pytest.approx(expected, abs=1e-6)
+    for rc, route in priced:
+        assert route_feasible(instance, route)
+        assert instance.route_load(route) <= instance.capacity
+        assert len(set(route[1:-1])) == len(route) - 2
+        assert rc == pytest.approx(reduced_cost(instance, duals, route), abs=1e-6)
+
+
+def test_forbidden_arcs_are_never_used():
+    instance = random_vrptw(3, horizon=400)
+    duals = np.concatenate(([0.0], np.full(instance.n - 1, 60.0)))
+    forbidden = {(0, 1), (2, 3), (4, 0)}
+    pricing = PricingProblem(instance, ng_size=None, forbidden_arcs=forbidden)
+    priced = pricing.solve(duals, max_routes=1000)
+    allowed = [r for r in feasible_routes(instance) if not forbidden & set(zip(r[:-1], r[1:]))]
+    expected = min(reduced_cost(instance, duals, r) for r in allowed)
+    assert priced[0][0] == pytest.approx(expected, abs=1e-6)
+    for _, route in priced:
+        assert not forbidden & set(zip(route[:-1], route[1:]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ng_routes_relax_elementary_pricing(seed):
+    # no time windows, so that ng-routes with cycles exist
+    instance = random_cvrp(seed, n=8, capacity=12)
+    duals = np.concatenate(([0.0], np.random.default_rng(seed).uniform(20, 80, size=instance.n - 1)))
+    elementary = PricingProblem(instance, ng_size=None).solve(duals, max_routes=1000)
+    relaxed = PricingProblem(instance, ng_size=2).solve(duals, max_routes=1000)
+    masks = ng_neighborhoods(instance, 2)
+    if elementary:
+        assert relaxed[0][0] <= elementary[0][0] + 1e-6
+    for rc, route in relaxed:
+        assert _ng_feasible(route, masks)
+        assert instance.route_load(route) <= instance.capacity
+        assert rc == pytest.approx(reduced_cost(instance, duals, route), abs=1e-6)
+
+
+def test_root_lp_at_100_customers():
+    # elementary pricing does not finish this root LP in minutes; the
+    # default ng-route pricing takes about 10 s
+    instance = random_cvrp(0, n=101, capacity=8)
+    start = time.perf_counter()
+    x, objective = BranchAndPrice(instance).column_generation(frozenset())
+    assert time.perf_counter() - start < 60
+    assert x is not None
+    singletons = sum(instance.route_cost([0, c, 0]) for c in range(1, instance.n))
+    assert 0 < objective < singletons
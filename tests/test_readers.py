@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from vrp_core import compile_instance, is_bundle, read_instance
+
+VRP = """NAME : small
+TYPE : CVRP
+DIMENSION : 5
+EDGE_WEIGHT_TYPE : EUC_2D
+CAPACITY : 10
+NODE_COORD_SECTION
+1 0 0
+2 3 4
+3 6 8
+4 0 5
+5 10 0
+DEMAND_SECTION
+1 0
+2 3
+3 4
+4 2
+5 6
+DEPOT_SECTION
+1
+-1
+EOF
+"""
+
+
+@pytest.fixture
+def vrp_file(tmp_path):
+    path = tmp_path / "small.vrp"
+    path.write_text(VRP)
+    return str(path)
+
+
+def test_read_vrplib(vrp_file):
+    instance = read_instance(vrp_file)
+    assert instance.n == 5 and instance.capacity == 10
+    assert instance.demand.tolist() == [0, 3, 4, 2, 6]
+    assert instance.dist[0, 1] == 5 and instance.dist[1, 2] == 5
+
+
+@pytest.mark.parametrize("full_matrix", [True, False])
+def test_bundle_is_memory_mapped(vrp_file, tmp_path, full_matrix):
+    bundle = str(tmp_path / "bundle")
+    compile_instance(vrp_file, bundle, knn=2, full_matrix=full_matrix)
+    assert is_bundle(bundle) and not is_bundle(vrp_file)
+    text, mapped = read_instance(vrp_file), read_instance(bundle)
+    # views of the mapped files, not copies
+    assert not mapped.demand.flags.owndata
+    if full_matrix:
+        assert not mapped.dist.flags.owndata
+    r = np.array([0, 1, 2, 3, 4, 0])
+    np.testing.assert_allclose(mapped.dist[r[:-1], r[1:]], text.dist[r[:-1], r[1:]])
+    assert mapped.capacity == text.capacity
+    assert mapped.neighbors.shape == (5, 2)
@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+from helpers import feasible_routes, random_vrptw
+from vrp_core import BranchAndPrice, Instance, LazyDistanceMatrix
+
+
+@pytest.fixture
+def vrptw(load_script):
+    return load_script("paper5_exact_algorithms/colunm_for_vrptw.py")
+
+
+def cheapest_per_set(instance, routes):
+    best = {}
+    for route in routes:
+        key = frozenset(route[1:-1])
+        best[key] = min(best.get(key, math.inf), instance.route_cost(route))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dp_yields_the_cheapest_route_of_every_servable_set(vrptw, seed):
+    instance = random_vrptw(seed, n_customers=6, horizon=400)
+    generated = list(vrptw.all_feasible_routes(instance))
+    assert len({frozenset(r[1:-1]) for r in generated}) == len(generated)
+    expected = cheapest_per_set(instance, feasible_routes(instance))
+    got = cheapest_per_set(instance, generated)
+    assert got.keys() == expected.keys()
+    for key, cost in expected.items():
+        assert got[key] == pytest.approx(cost)
+
+
+def test_lazy_matrix_is_read_row_by_row(vrptw):
+    dense = random_vrptw(4, n_customers=6, horizon=400)
+    lazy = Instance(LazyDistanceMatrix(dense.coords), dense.demand, dense.capacity, ready=dense.ready,
+                    due=dense.due, service=dense.service, coords=dense.coords)
+    assert list(vrptw.all_feasible_routes(lazy)) == list(vrptw.all_feasible_routes(dense))
+    assert BranchAndPrice(lazy).master.costs[0] == pytest.approx(BranchAndPrice(dense).master.costs[0])
@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+
+def test_swap_and_undo_keep_the_cached_cost_exact(load_script):
+    sa = load_script("paper2_gvrp_survey/GVRP_SA.py")
+    rng = random.Random(0)
+    state = sa.SAState(sa.initial_solution(rng))
+    start_routes, start_cost = [r[:] for r in state.routes], state.cost
+    for _ in range(200):
+        record = sa.neighbor(state, rng)
+        assert state.cost == pytest.approx(sa.compute_cost(state.routes))
+        if record is not None and rng.random() < 0.5:
+            state.undo(record)
+            assert state.cost == pytest.approx(sa.compute_cost(state.routes))
+    assert sorted(c for r in state.routes for c in r) == sorted(c for r in start_routes for c in r)
+    assert start_cost == pytest.approx(sa.compute_cost(start_routes))
+
+
+def test_snapshot_round_trip(load_script):
+    sa = load_script("paper2_gvrp_survey/GVRP_SA.py")
+    state = sa.SAState([[0, 1, 2, 0], [0, 3, 4, 0]])
+    assert sa.routes_from_snapshot(state.snapshot()) == [[0, 1, 2, 0], [0, 3, 4, 0]]
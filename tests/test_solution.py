@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from helpers import random_cvrp, random_routes
+from vrp_core import Solution, SolutionMemory
+
+
+def test_copy_on_write_and_cached_cost():
+    instance = random_cvrp(0)
+    routes = random_routes(np.random.default_rng(0), range(1, instance.n))
+    solution = Solution(instance, routes)
+    assert solution.cost() == pytest.approx(instance.solution_cost(routes))
+    copy = solution.copy()
+    route = copy.route_for_write(0)
+    route[1], route[-2] = route[-2], route[1]
+    copy.pop_route(len(copy) - 1)
+    assert solution.routes == routes
+    assert solution.cost() == pytest.approx(instance.solution_cost(routes))
+    assert copy.cost() == pytest.approx(instance.solution_cost(copy.routes))
+
+
+def test_zobrist_rehashes_only_changed_routes():
+    instance = random_cvrp(1)
+    rng = np.random.default_rng(1)
+    solution = Solution(instance, random_routes(rng, range(1, instance.n)))
+    memory = SolutionMemory()
+    assert solution.zobrist(memory) == memory.solution_hash(solution.routes)
+    hashed = []
+    route_hash = memory.route_hash
+    memory.route_hash = lambda route: hashed.append(route) or route_hash(route)
+    for step in range(40):
+        copy = solution.copy()
+        ra, rb = rng.choice(len(copy), size=2, replace=False)
+        a, b = copy.route_for_write(ra), copy.route_for_write(rb)
+        a.insert(1, b.pop(1))
+        if step % 5 == 0:
+            copy.append_route([0, a.pop(1), 0])
+        if len(b) <= 2:
+            copy.pop_route(rb)
+        hashed.clear()
+        h = copy.zobrist(memory)
+        # the two (or three) changed routes only
+        assert len(hashed) <= 3
+        assert h == memory.solution_hash(copy.routes)
+        assert solution.zobrist(memory) == memory.solution_hash(solution.routes)
+        solution = copy
+    # another memory starts over
+    other = SolutionMemory(seed=1)
+    assert solution.zobrist(other) == other.solution_hash(solution.routes)
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from helpers import random_cvrp, use_instance
+from vrp_core import Counters, JsonlSink, RingBuffer, Stopwatch, Telemetry
+
+
+def test_stopwatch_accumulates_laps_in_microseconds(monkeypatch):
+    clock = iter([0, 5_000, 12_000, 20_500])
+    monkeypatch.setattr("vrp_core.telemetry.time.perf_counter_ns", lambda: next(clock))
+    watch = Stopwatch()
+    watch.lap("shake")
+    watch.lap("repair")
+    watch.lap("shake")
+    assert watch.phases == {"shake": 5 + 8, "repair": 7}
+
+
+def test_emit_fans_one_event_out_to_every_sink():
+    ring, counters = RingBuffer(size=2), Counters()
+    telemetry = Telemetry(ring, counters, solver="X")
+    watch = telemetry.stopwatch()
+    watch.lap("move")
+    telemetry.emit(0, 10.0, 10.0, operator="a", accepted=True, new_best=True, stopwatch=watch)
+    telemetry.emit(1, 12.0, 10.0, operator="b", accepted=False, extra_field=3)
+    telemetry.emit(2, 9.0, 9.0, operator="a", accepted=True, new_best=True, temperature=1.5)
+    event = ring.events[-1]
+    assert set(event) == {"solver", "iteration", "elapsed", "current", "best", "operator",
+                          "accepted", "new_best", "temperature", "phases"}
+    assert (event["solver"], event["iteration"], event["temperature"]) == ("X", 2, 1.5)
+    assert event["phases"] == {} and event["elapsed"] >= 0
+    # the ring buffer keeps the last `size` events only
+    assert [e["iteration"] for e in ring.events] == [1, 2] and ring.events[0]["extra_field"] == 3
+    assert ring.anytime_curve() == [(ring.events[0]["elapsed"], 10.0), (event["elapsed"], 9.0)]
+    summary = counters.summary()
+    assert counters.iterations == 3
+    assert summary["a"]["calls"] == 2 and summary["a"]["accepted"] == 2 and summary["a"]["new_best"] == 2
+    assert "move_us" in summary["a"]
+    assert summary["b"] == {"calls": 1, "accepted": 0, "new_best": 0}
+
+
+def test_jsonl_sink_writes_one_json_object_per_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    telemetry = Telemetry(JsonlSink(path), solver="X")
+    telemetry.emit(0, 10.0, 10.0, operator="a", accepted=True)
+    telemetry.emit(1, 8.0, 8.0, operator="a", accepted=True, new_best=True)
+    telemetry.close()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    events = [json.loads(line) for line in lines]
+    assert [e["iteration"] for e in events] == [0, 1]
+    assert events[1]["best"] == 8.0 and events[1]["new_best"] is True and events[1]["phases"] == {}
+
+
+@pytest.mark.parametrize("script, run, phases", [
+    ("paper3_network_vrp/ALNS.py", lambda m, t: m.ALNS(max_iterations=20, n_remove=2, telemetry=t),
+     {"destroy", "repair", "evaluate"}),
+    ("paper4_general_gvrp/LNS_for_generalvrp.py", lambda m, t: m.LNS(max_iterations=20, telemetry=t),
+     {"destroy", "repair", "evaluate"}),
+    ("paper4_general_gvrp/VSN.py", lambda m, t: m.VNS(max_iterations=5, telemetry=t),
+     {"shake", "local_search", "evaluate"}),
+])
+def test_solvers_emit_consistent_events(load_script, script, run, phases):
+    module = load_script(script)
+    use_instance(module, random_cvrp(0, n=12, capacity=8))
+    ring = RingBuffer()
+    routes, cost = run(module, Telemetry(ring))
+    events = list(ring.events)
+    assert events and events[0]["solver"] is not None
+    elapsed = [e["elapsed"] for e in events]
+    assert elapsed == sorted(elapsed)
+    best = [e["best"] for e in events]
+    assert all(b1 >= b2 for b1, b2 in zip(best, best[1:]))
+    assert best[-1] == pytest.approx(cost)
+    assert all(e["new_best"] <= bool(e["accepted"]) for e in events)
+    assert all(set(e["phases"]) <= phases for e in events)
+    assert any(set(e["phases"]) == phases for e in events)
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from helpers import random_cvrp, use_instance
+from vrp_core import SolutionMemory, Termination
+
+
+@pytest.mark.parametrize("script, run", [
+    ("paper3_network_vrp/ALNS.py", lambda m, t: m.ALNS(max_iterations=None, n_remove=2, termination=t)),
+    ("paper4_general_gvrp/LNS_for_generalvrp.py", lambda m, t: m.LNS(max_iterations=None, termination=t)),
+    ("paper4_general_gvrp/VSN.py", lambda m, t: m.VNS(max_iterations=None, termination=t)),
+    ("paper2_gvrp_survey/GVRP_SA.py", lambda m, t: m.simulated_annealing(max_iter=None, termination=t)),
+])
+def test_unbounded_run_stops_on_termination(load_script, script, run):
+    module = load_script(script)
+    if not script.endswith("GVRP_SA.py"):
+        use_instance(module, random_cvrp(0, n=12, capacity=8))
+    termination = Termination(max_iterations=30)
+    routes, cost = run(module, termination)
+    assert termination.reason == "max_iterations"
+    assert routes and cost < float("inf")
+
+
+def test_stall_and_target():
+    termination = Termination(max_stall=2, target=5.0)
+    assert not termination.should_stop(0, 10.0)
+    assert not termination.should_stop(1, 10.0)
+    assert not termination.should_stop(2, 10.0)
+    assert termination.should_stop(3, 10.0) and termination.reason == "stall"
+    termination.start()
+    assert termination.should_stop(0, 4.0) and termination.reason == "target"
+
+
+def test_expired_checks_time_without_counting_a_stall():
+    termination = Termination(time_limit=60, max_stall=0)
+    assert not termination.expired()
+    assert termination.stall == 0 and termination.reason is None
+    termination.time_limit = 0
+    assert termination.expired() and termination.reason == "time_limit"
+
+
+@pytest.mark.parametrize("inter_route", [True, False])
+def test_vns_stops_inside_a_long_local_search(load_script, inter_route):
+    vsn = load_script("paper4_general_gvrp/VSN.py")
+    use_instance(vsn, random_cvrp(0, n=300, capacity=15))
+    termination = Termination(time_limit=0.2)
+    start = time.perf_counter()
+    routes, cost = vsn.VNS(max_iterations=None, granular_k=10, inter_route=inter_route,
+                           memory=SolutionMemory(), termination=termination)
+    # a single local search on 300 customers takes seconds
+    assert time.perf_counter() - start < 1.5
+    assert termination.reason == "time_limit"
+    assert sorted(c for r in routes for c in r[1:-1]) == list(range(1, 300))
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from helpers import random_vrptw
+from vrp_core import RouteTimes, Segment, concat, route_feasible, route_segment
+
+
+def simulate(instance, route):
+    """Plain forward simulation: True if every service starts by its due date."""
+    t = float(instance.ready[route[0]])
+    for i, j in zip(route[:-1], route[1:]):
+        t = max(float(instance.ready[j]), t + float(instance.service[i]) + float(instance.dist[i, j]))
+        if t > instance.due[j] + 1e-9:
+            return False
+    return True
+
+
+def random_route(rng, instance, length):
+    customers = rng.permutation(np.arange(1, instance.n))[:length]
+    return [0, *customers.tolist(), 0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_segment_feasibility_matches_simulation(seed):
+    instance = random_vrptw(seed, n_customers=8, horizon=500)
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        route = random_route(rng, instance, int(rng.integers(1, 6)))
+        assert route_feasible(instance, route) == simulate(instance, route)
+
+
+def test_concat_is_associative():
+    instance = random_vrptw(1, n_customers=8)
+    nodes = [Segment.node(instance, i) for i in (0, 3, 5, 1)]
+    left = concat(instance, concat(instance, concat(instance, nodes[0], nodes[1]), nodes[2]), nodes[3])
+    right = concat(instance, nodes[0], concat(instance, nodes[1], concat(instance, nodes[2], nodes[3])))
+    for field in Segment.__slots__:
+        assert getattr(left, field) == pytest.approx(getattr(right, field))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_route_times_moves_match_rebuilt_routes(seed):
+    instance = random_vrptw(seed, n_customers=9, horizon=600)
+    rng = np.random.default_rng(seed)
+    checked = 0
+    for _ in range(100):
+        route = random_route(rng, instance, int(rng.integers(2, 5)))
+        times = RouteTimes(instance, route)
+        assert times.feasible() == route_feasible(instance, route)
+        # splices are checked on any route
+        other = random_route(rng, instance, 2)
+        for i in range(len(route) - 1):
+            for j in range(i + 1, len(route)):
+                seg = route_segment(instance, other[1:-1])
+                expected = route_feasible(instance, route[:i + 1] + other[1:-1] + route[j:])
+                assert times.can_splice(i, seg, j) == expected
+        if not times.feasible():
+            continue
+        outside = [c for c in range(1, instance.n) if c not in route]
+        for pos in range(1, len(route)):
+            for c in outside:
+                assert times.can_insert(c, pos) == route_feasible(instance, route[:pos] + [c] + route[pos:])
+        for pos in range(1, len(route) - 1):
+            assert times.can_remove(pos) == route_feasible(instance, route[:pos] + route[pos + 1:])
+        checked += 1
+    assert checked
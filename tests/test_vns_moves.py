@@ -0,0 +1,107 @@
+import random
+
+import numpy as np
+import pytest
+
+from helpers import random_cvrp, random_routes, use_instance
+from vrp_core import RingBuffer, Solution, SolutionMemory, Telemetry, nearest_neighbors
+
+
+@pytest.fixture
+def vsn(load_script):
+    return load_script("paper4_general_gvrp/VSN.py")
+
+
+def random_solution(seed):
+    instance = random_cvrp(seed, n=30, capacity=15)
+    # short routes, so that relocates empty some of them
+    routes = random_routes(np.random.default_rng(seed), range(1, instance.n), max_len=4)
+    return instance, Solution(instance, routes)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("move", ["_swap_next_to", "_relocate_after", "_two_opt_link"])
+def test_move_delta_and_hash(vsn, seed, move):
+    instance, solution = random_solution(seed)
+    vsn.instance = instance
+    memory = SolutionMemory()
+    h = memory.solution_hash(solution.routes)
+    pos = solution.positions()
+    neighbors = nearest_neighbors(instance, 8)
+    checked = 0
+    for a, b in vsn._granular_arcs(solution, neighbors, best=True):
+        result = getattr(vsn, move)(solution, pos, a, b)
+        if result is None:
+            continue
+        delta, changes, arcs = result
+        changes = changes()
+        routes = [changes.get(r, route) for r, route in enumerate(solution.routes)]
+        if delta is not None:
+            new_cost = Solution(instance, [r for r in routes if len(r) > 2]).cost()
+            assert delta == pytest.approx(new_cost - solution.cost(), abs=1e-6)
+        if arcs is not None:
+            assert memory.move_hash(h, *arcs) == memory.solution_hash(routes)
+        checked += 1
+    assert checked
+
+
+def test_default_vns_runs_the_granular_descent(vsn, monkeypatch):
+    instance = random_cvrp(0, n=30, capacity=15)
+    use_instance(vsn, instance)
+    calls = []
+    best_move = vsn._best_move
+
+    def spy(solution, neighbors, best, move, memory=None):
+        calls.append((best, move.__name__))
+        return best_move(solution, neighbors, best, move, memory)
+
+    monkeypatch.setattr(vsn, "_best_move", spy)
+    random.seed(0)
+    routes, cost = vsn.VNS(max_iterations=5, granular_k=8)
+    # inter_route is on by default, and the granular best-improvement
+    # descent still runs for swap and relocate after it
+    assert {("_swap_next_to", True), ("_relocate_after", True)} <= {(m, b) for b, m in calls}
+    assert sorted(c for r in routes for c in r[1:-1]) == list(range(1, instance.n))
+    assert cost == pytest.approx(instance.solution_cost(routes, penalty=1000))
+
+
+@pytest.mark.parametrize("operator", ["swap_customers", "relocate_customer", "two_opt_all"])
+def test_granular_descent_keeps_the_hash_incremental(vsn, operator):
+    instance, solution = random_solution(1)
+    vsn.instance = instance
+    memory = SolutionMemory()
+    solution_hash = memory.solution_hash
+    neighbors = nearest_neighbors(instance, 8)
+    solution.zobrist(memory)
+
+    def full_rehash(routes):
+        raise AssertionError("the whole solution was rehashed")
+
+    memory.solution_hash = full_rehash
+    for _ in range(10):
+        solution, delta = getattr(vsn, operator)(solution, neighbors, best=True, memory=memory)
+        assert solution.zobrist(memory) == solution_hash(solution.routes)
+        assert solution.cost() == pytest.approx(instance.solution_cost(solution.routes, penalty=1000))
+
+
+@pytest.mark.parametrize("operator", ["swap_customers", "relocate_customer", "two_opt_all"])
+def test_sampled_moves_drop_tabu_results(vsn, operator):
+    instance, solution = random_solution(2)
+    vsn.instance = instance
+    memory = SolutionMemory(tabu_tenure=5)
+    random.seed(4)
+    moved, _ = getattr(vsn, operator)(solution, memory=memory)
+    memory.make_tabu(moved.zobrist(memory))
+    random.seed(4)
+    again, delta = getattr(vsn, operator)(solution, memory=memory)
+    assert again.routes == solution.routes and delta == 0
+
+
+def test_vns_reports_memory_stats_through_telemetry(vsn, capsys):
+    use_instance(vsn, random_cvrp(0, n=20, capacity=15))
+    memory, ring = SolutionMemory(tabu_tenure=20), RingBuffer()
+    random.seed(0)
+    vsn.VNS(max_iterations=5, granular_k=8, memory=memory, telemetry=Telemetry(ring))
+    assert "Solution memory" not in capsys.readouterr().out
+    assert ring.events[-1]["memory"] == memory.stats()
+    assert memory.hits + memory.misses > 0
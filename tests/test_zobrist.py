@@ -0,0 +1,49 @@
+import pytest
+
+from vrp_core import SolutionMemory
+
+
+def test_hash_ignores_route_order_and_empty_routes():
+    memory = SolutionMemory(seed=7)
+    routes = [[0, 1, 2, 0], [0, 3, 0]]
+    h = memory.solution_hash(routes)
+    assert h == memory.solution_hash([[0, 3, 0], [0, 0], [0, 1, 2, 0]])
+    assert h != memory.solution_hash([[0, 2, 1, 0], [0, 3, 0]])
+    assert memory.route_hash([0, 1, 2, 0]) == memory.arc(0, 1) ^ memory.arc(1, 2) ^ memory.arc(2, 0)
+
+
+def test_move_hash_matches_rehashing():
+    memory = SolutionMemory()
+    before = [[0, 1, 2, 0], [0, 3, 4, 0]]
+    after = [[0, 1, 4, 0], [0, 3, 2, 0]]  # swap 2 and 4
+    h = memory.move_hash(memory.solution_hash(before),
+                         [(1, 2), (2, 0), (3, 4), (4, 0)], [(1, 4), (4, 0), (3, 2), (2, 0)])
+    assert h == memory.solution_hash(after)
+
+
+def test_set_hash_is_order_free():
+    memory = SolutionMemory()
+    assert memory.set_hash([3, 1, 2]) == memory.set_hash([1, 2, 3]) != memory.set_hash([1, 2])
+
+
+def test_lru_cache_and_stats():
+    memory = SolutionMemory(cache_size=2)
+    memory.store(1, 10.0)
+    memory.store(2, 20.0)
+    assert memory.lookup(1) == 10.0  # 1 is now the most recent
+    memory.store(3, 30.0)
+    assert memory.lookup(2) is None
+    assert memory.lookup(3) == 30.0
+    stats = memory.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1 and stats["size"] == 2
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_tabu_tenure():
+    memory = SolutionMemory(tabu_tenure=2)
+    for h in (1, 2, 3):
+        memory.make_tabu(h)
+    assert not memory.is_tabu(1) and memory.is_tabu(2) and memory.is_tabu(3)
+    disabled = SolutionMemory()
+    disabled.make_tabu(1)
+    assert not disabled.is_tabu(1)
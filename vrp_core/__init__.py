@@ -0,0 +1,64 @@
+from .branch_and_price import BranchAndPrice
+from .bundle import compile_instance, read_csv
+from .decomposition import Decomposition, kmeans_groups, sub_instance, sweep_groups
+from .distances import LazyDistanceMatrix, euclidean_matrix
+from .green import FuelModel, GreenCost
+from .instance import Instance
+from .insertion import best_insertion, insertion_deltas, regret_insertion
+from .interroute import InterRouteSearch, RouteData
+from .intraroute import RouteOptimizer, or_opt_deltas, two_opt_deltas
+from .master import SetPartitioningMaster, incidence_matrix, route_costs
+from .neighbors import nearest_neighbors
+from .pricing import PricingProblem
+from .readers import is_bundle, read_instance, read_solomon, read_solution, read_vrplib
+from .solution import Solution
+from .telemetry import Counters, JsonlSink, RingBuffer, Stopwatch, Telemetry
+from .termination import Termination
+from .timewindows import RouteTimes, Segment, concat, route_feasible, route_segment
+from .zobrist import SolutionMemory
+
+__all__ = [
+    "BranchAndPrice",
+    "Counters",
+    "Decomposition",
+    "FuelModel",
+    "GreenCost",
+    "Instance",
+    "InterRouteSearch",
+    "JsonlSink",
+    "LazyDistanceMatrix",
+    "PricingProblem",
+    "RingBuffer",
+    "RouteData",
+    "RouteOptimizer",
+    "RouteTimes",
+    "Segment",
+    "SetPartitioningMaster",
+    "Solution",
+    "SolutionMemory",
+    "Stopwatch",
+    "Telemetry",
+    "Termination",
+    "best_insertion",
+    "compile_instance",
+    "concat",
+    "euclidean_matrix",
+    "incidence_matrix",
+    "insertion_deltas",
+    "is_bundle",
+    "kmeans_groups",
+    "nearest_neighbors",
+    "or_opt_deltas",
+    "read_csv",
+    "read_instance",
+    "read_solomon",
+    "read_solution",
+    "read_vrplib",
+    "regret_insertion",
+    "route_costs",
+    "route_feasible",
+    "route_segment",
+    "sub_instance",
+    "sweep_groups",
+    "two_opt_deltas",
+]
@@ -0,0 +1,199 @@
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from .master import SetPartitioningMaster
+from .pricing import PricingProblem
+from .timewindows import route_feasible
+
+# ===========================
+# Branch-and-price on arc flows
+# ===========================
+# Every node is the set-partitioning LP restricted by a set of forbidden
+# arcs, solved by column generation. Columns live in one pool shared by all
+# nodes; a node just bounds the columns that use one of its forbidden arcs
+# to 0, and pricing skips those arcs. Branching on arc (i, j) with
+# fractional flow gives two children: "never use (i, j)" and "always use
+# (i, j)", the latter by forbidding every other arc out of i and into j.
+
+
+def _arcs(route):
+    return zip(route[:-1], route[1:])
+
+
+def _forcing(n, i, j):
+    """Arcs to forbid so that any route visiting i or j uses arc (i, j)."""
+    arcs = set()
+    if i != 0:
+        arcs.update((i, k) for k in range(n) if k != j and k != i)
+    if j != 0:
+        arcs.update((k, j) for k in range(n) if k != i and k != j)
+    return arcs
+
+
+def _routes_from_flows(flows):
+    """Split an integral arc flow into depot-to-depot routes."""
+    succ = defaultdict(list)
+    for (i, j), f in flows.items():
+        succ[i].extend([j] * int(round(f)))
+    routes = []
+    while succ[0]:
+        route = [0, succ[0].pop()]
+        while route[-1] != 0:
+            route.append(succ[route[-1]].pop())
+        routes.append(route)
+    return routes
+
+
+class BranchAndPrice:
+    """
+    Best-first branch-and-price for the CVRP / VRPTW over an Instance.
+    Pricing is the labeling of PricingProblem (heuristic label limit first,
+    exact when that finds nothing), so node bounds are exact for its route
+    set: ng-routes by default (ng_size=8), elementary routes with
+    ng_size=None. Either way an integral arc flow only uses elementary
+    routes, so the incumbent is optimal.
+    """
+
+    def __init__(self, instance, bidirectional=True, ng_size=8, max_routes=50,
+                 heuristic_labels=20, tol=1e-6):
+        self.instance = instance
+        self.bidirectional = bidirectional
+        self.ng_size = ng_size
+        self.max_routes = max_routes
+        self.heuristic_labels = heuristic_labels
+        self.tol = tol
+        n = instance.n
+        # artificial columns: one per customer, dearer than any feasible plan
+        # (which has at most 2(n-1) arcs), so they only stay in an infeasible LP
+        # (the longest arc is found row by row: a lazy matrix stays lazy)
+        big_m = 2 * (n - 1) * max(float(np.max(instance.dist[i])) for i in range(n)) + 1
+        artificial = [[0, c, 0] for c in range(1, n)]
+        self.master = SetPartitioningMaster(instance, artificial, [big_m] * (n - 1))
+        self.n_artificial = n - 1
+        self._keys = set()
+        self._arc_columns = defaultdict(list)
+        # only the single-customer routes that are feasible: an unreachable
+        # customer leaves its artificial column in every LP, so no node is
+        # feasible and the instance is reported infeasible
+        self.add_columns([[0, c, 0] for c in range(1, n)
+                          if instance.demand[c] <= instance.capacity
+                          and route_feasible(instance, [0, c, 0])])
+
+    def add_columns(self, routes):
+        new = [list(r) for r in routes if tuple(r) not in self._keys]
+        for k, route in enumerate(new, start=len(self.master)):
+            self._keys.add(tuple(route))
+            for arc in _arcs(route):
+                self._arc_columns[arc].append(k)
+        self.master.add_routes(new)
+        return len(new)
+
+    def _upper(self, forbidden):
+        # set partitioning already implies x <= 1; a finite bound would let a
+        # column with negative reduced cost sit nonbasic at it, unpriced
+        upper = np.full(len(self.master), np.inf)
+        for arc in forbidden:
+            upper[self._arc_columns.get(arc, [])] = 0
+        return upper
+
+    def column_generation(self, forbidden):
+        """
+        Node LP under `forbidden` arcs: (x, objective), or (None, inf) if the
+        node is infeasible.
+        """
+        pricing = PricingProblem(self.instance, bidirectional=self.bidirectional,
+                                 ng_size=self.ng_size, forbidden_arcs=forbidden)
+        while True:
+            x, objective, duals = self.master.solve_lp(self._upper(forbidden))
+            if x is None:
+                return None, math.inf
+            # exact pricing whenever the capped pass yields no new column, so
+            # the node bound is proven when the loop ends
+            priced = pricing.solve(duals, self.max_routes, label_limit=self.heuristic_labels)
+            if not self.add_columns(r for _, r in priced):
+                priced = pricing.solve(duals, self.max_routes)
+                if not self.add_columns(r for _, r in priced):
+                    break
+        if x[:self.n_artificial].sum() > self.tol:
+            return None, math.inf
+        return x, objective
+
+    def arc_flows(self, x):
+        flows = defaultdict(float)
+        for k in np.flatnonzero(x > self.tol):
+            for arc in _arcs(self.master.routes[k]):
+                flows[arc] += x[k]
+        return flows
+
+    def _incumbent_from_pool(self, time_limit=None):
+        # restricted master IP over the current pool: a cheap first incumbent
+        x, objective = self.master.solve_ip(time_limit=time_limit)
+        if x is None or x[:self.n_artificial].sum() > 0.5:
+            return None, math.inf
+        return [route for route, _ in self.master.selected(x, tol=0.5)], objective
+
+    def solve(self, termination=None, verbose=True):
+        """
+        Returns (routes, cost, stats). stats holds the lower bound, the gap,
+        node counts, a history of (elapsed, nodes, lower, upper) and the
+        status: "optimal", "infeasible" or the termination reason (the
+        incumbent is then the best plan found so far).
+        """
+        start = time.perf_counter()
+        if termination is not None:
+            termination.start()
+        best_routes, best_cost = None, math.inf
+        counter = itertools.count()
+        queue = [(-math.inf, next(counter), frozenset())]
+        stats = {"explored": 0, "pruned": 0, "open": 0, "columns": 0, "lower_bound": -math.inf,
+                 "gap": None, "status": None, "history": []}
+
+        while queue:
+            if termination is not None and termination.should_stop(stats["explored"], best_cost):
+                stats["status"] = termination.reason
+                break
+            bound, _, forbidden = heapq.heappop(queue)
+            if bound >= best_cost - self.tol:
+                stats["pruned"] += 1
+                continue
+            stats["explored"] += 1
+            x, objective = self.column_generation(forbidden)
+            if x is None or objective >= best_cost - self.tol:
+                stats["pruned"] += 1
+            else:
+                if stats["explored"] == 1:
+                    routes, cost = self._incumbent_from_pool()
+                    if cost < best_cost:
+                        best_routes, best_cost = routes, cost
+                flows = self.arc_flows(x)
+                fractional = [(abs(f - 0.5), arc) for arc, f in flows.items()
+                              if abs(f - round(f)) > self.tol]
+                if not fractional:
+                    best_routes, best_cost = _routes_from_flows(flows), objective
+                elif objective < best_cost - self.tol:
+                    _, (i, j) = min(fractional)
+                    heapq.heappush(queue, (objective, next(counter), forbidden | {(i, j)}))
+                    heapq.heappush(queue, (objective, next(counter),
+                                           forbidden | _forcing(self.instance.n, i, j)))
+            # open nodes carry their parent's bound
+            lower = min([best_cost] + [node[0] for node in queue])
+            stats["lower_bound"] = lower
+            stats["gap"] = (best_cost - lower) / best_cost if best_cost < math.inf and best_cost else None
+            stats["history"].append((time.perf_counter() - start, stats["explored"], lower, best_cost))
+            if verbose:
+                gap = f"{100 * stats['gap']:.2f}%" if stats["gap"] is not None else "-"
+                print(f"Node {stats['explored']}, open: {len(queue)}, columns: {len(self.master)}, "
+                      f"LB: {lower:.2f}, UB: {best_cost:.2f}, gap: {gap}")
+
+        stats["open"] = len(queue)
+        stats["columns"] = len(self.master) - self.n_artificial
+        if stats["status"] is None:
+            stats["status"] = "optimal" if best_routes is not None else "infeasible"
+            if best_routes is not None:
+                stats["lower_bound"], stats["gap"] = best_cost, 0.0
+        return best_routes, best_cost, stats
@@ -0,0 +1,81 @@
+"""
+Compile text instances into memory-mapped `.npy` bundles.
+
+    python -m vrp_core.bundle X-n1001-k43.vrp bundles/X-n1001-k43 --knn 50
+
+Parsing a large text instance and building its distance matrix can take
+longer than a solve, so it is done once here. `Instance.load` then opens
+the bundle with np.load(mmap_mode='r'): startup is near-instant, nothing is
+copied, and worker processes that open the same bundle share its pages.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from .distances import LazyDistanceMatrix
+from .instance import Instance
+from .neighbors import nearest_neighbors
+from .readers import read_instance
+
+
+def read_csv(path, capacity, max_bytes=None):
+    """
+    CSV with header `id,x,y,demand[,ready,due,service]`, depot first.
+    Distances are Euclidean (computed lazily if written as a sparse bundle).
+    """
+    data = np.genfromtxt(path, delimiter=",", names=True)
+    names = data.dtype.names
+    coords = np.column_stack([data["x"], data["y"]])
+    columns = {name: data[name] if name in names else None for name in ("ready", "due", "service")}
+    return Instance.from_coords(coords, data["demand"].astype(int), capacity,
+                                max_bytes=max_bytes, **columns)
+
+
+def compile_instance(src, dst, knn=None, full_matrix=True, dtype=None, capacity=None, **kwargs):
+    """
+    Read `src` (CVRPLIB/TSPLIB .vrp, Solomon .txt or .csv) and save it as a
+    bundle in directory `dst`. knn stores each customer's knn nearest
+    neighbours (the candidate lists of granular search). With full_matrix
+    False only coordinates are kept and distances are computed lazily, the
+    sparse option for instances whose n x n matrix does not fit; the
+    coordinate matrix is then never built. `dtype` (e.g. np.float32)
+    converts a stored matrix. Returns the compiled Instance.
+    """
+    if not full_matrix:
+        # any budget smaller than the matrix makes the readers go lazy
+        kwargs.setdefault("max_bytes", 1)
+    if src.endswith(".csv"):
+        if capacity is None:
+            raise ValueError("a CSV instance needs an explicit capacity")
+        instance = read_csv(src, capacity, **kwargs)
+    else:
+        instance = read_instance(src, **kwargs)
+    if not full_matrix and not isinstance(instance.dist, LazyDistanceMatrix):
+        if instance.coords is None:
+            raise ValueError(f"{src} has no coordinates; it needs the full matrix")
+        instance.dist = LazyDistanceMatrix(instance.coords)
+    elif dtype is not None and not isinstance(instance.dist, LazyDistanceMatrix):
+        instance.dist = instance.dist.astype(dtype)
+    if knn:
+        instance.neighbors = nearest_neighbors(instance, knn)
+    instance.save(dst)
+    return instance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a text instance into an .npy bundle.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--knn", type=int, default=None, help="store k-nearest candidate lists")
+    parser.add_argument("--sparse", action="store_true", help="keep coordinates only, no n x n matrix")
+    parser.add_argument("--float32", action="store_true", help="store the matrix as float32")
+    parser.add_argument("--capacity", type=int, default=None, help="vehicle capacity (CSV input)")
+    args = parser.parse_args(argv)
+    instance = compile_instance(args.src, args.dst, knn=args.knn, full_matrix=not args.sparse,
+                                dtype=np.float32 if args.float32 else None, capacity=args.capacity)
+    print(f"{args.src} -> {os.path.abspath(args.dst)} ({instance.n} nodes)")
+
+
+if __name__ == "__main__":
+    main()
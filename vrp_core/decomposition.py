@@ -0,0 +1,175 @@
+import contextlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.cluster.vq import kmeans2
+
+from .instance import Instance
+
+# ===========================
+# Decomposition for large instances
+# ===========================
+# The customers are split into groups of about `size` customers, each group
+# becomes a small sub-instance (depot + its customers) solved by any
+# metaheuristic in a worker process, and the sub-solutions are merged. The
+# first round groups customers; later rounds group routes of the current
+# solution (POPMUSIC style), with the group boundaries moved every round,
+# and keep a sub-solution only if it beats the routes it replaces. A round
+# costs O(n log n) plus n / size fixed-size solves, so wall time grows
+# linearly with n and shrinks with the number of workers.
+
+
+def sub_instance(instance, customers):
+    """(Instance over the depot and `customers`, node ids of its nodes in `instance`)."""
+    idx = np.concatenate(([0], np.asarray(customers, dtype=int)))
+    dist = np.asarray(instance.dist[idx[:, None], idx[None, :]])
+    coords = None if instance.coords is None else instance.coords[idx]
+    sub = Instance(dist, instance.demand[idx], instance.capacity, ready=instance.ready[idx],
+                   due=instance.due[idx], service=instance.service[idx], coords=coords)
+    return sub, idx
+
+
+def _angles(instance, points):
+    depot = instance.coords[0]
+    return np.arctan2(points[:, 1] - depot[1], points[:, 0] - depot[0])
+
+
+def _chunks(order, weights, size, offset=0):
+    """Split `order` (rotated by offset) into consecutive groups of about `size` total weight."""
+    order = np.roll(order, -offset)
+    groups, group, total = [], [], 0
+    for k in order.tolist():
+        group.append(k)
+        total += weights[k]
+        if total >= size:
+            groups.append(group)
+            group, total = [], 0
+    if group:
+        groups.append(group)
+    return groups
+
+
+def sweep_groups(instance, points, weights, size, offset=0):
+    """Groups of points by polar angle around the depot."""
+    return _chunks(np.argsort(_angles(instance, points), kind="stable"), weights, size, offset)
+
+
+def kmeans_groups(instance, points, weights, size, seed=0):
+    """Groups of points by k-means on their coordinates (sizes are not balanced)."""
+    k = min(len(points), max(1, int(round(sum(weights) / size))))
+    if k == 1:
+        return [list(range(len(points)))]
+    _, labels = kmeans2(points, k, minit="++", seed=seed)
+    return [np.flatnonzero(labels == c).tolist() for c in range(k) if (labels == c).any()]
+
+
+def _solve_part(args):
+    solver, sub, seed, quiet = args
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    if quiet:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            routes, _ = solver(sub)
+    else:
+        routes, _ = solver(sub)
+    return [list(map(int, r)) for r in routes or [] if len(r) > 2]
+
+
+class Decomposition:
+    """
+    Solve a large instance by repeatedly solving sub-instances of about
+    `size` customers in parallel. `solver(sub_instance)` returns (routes,
+    cost) like the benchmark adapters and must be picklable (a top-level
+    function or a functools.partial of one). `method` is "sweep" or
+    "kmeans"; both need instance.coords.
+    """
+
+    def __init__(self, instance, solver, size=100, method="sweep", max_workers=None, penalty=1000,
+                 seed=0, quiet=True):
+        if instance.coords is None:
+            raise ValueError("decomposition needs node coordinates")
+        if method not in ("sweep", "kmeans"):
+            raise ValueError(f"unknown decomposition method {method!r}")
+        self.instance = instance
+        self.solver = solver
+        self.size = size
+        self.method = method
+        self.max_workers = max_workers
+        self.penalty = penalty
+        self.seed = seed
+        self.quiet = quiet
+
+    def cost(self, routes):
+        return self.instance.solution_cost(routes, penalty=self.penalty)
+
+    def _groups(self, points, weights, round_):
+        if self.method == "kmeans":
+            return kmeans_groups(self.instance, points, weights, self.size, seed=self.seed + round_)
+        # move the sector boundaries by half a group every round
+        per_group = max(1, len(points) * self.size // max(1, sum(weights)))
+        offset = (round_ * max(1, per_group // 2)) % len(points)
+        return sweep_groups(self.instance, points, weights, self.size, offset)
+
+    def partition(self, routes, round_):
+        """
+        [(customers, routes they replace)]: clusters of customers (each on
+        its own route) when there are no routes yet, else clusters of routes.
+        """
+        if routes is None:
+            customers = np.arange(1, self.instance.n)
+            groups = self._groups(self.instance.coords[customers], [1] * len(customers), round_)
+            return [(customers[g].tolist(), [[0, int(c), 0] for c in customers[g]]) for g in groups]
+        centroids = np.array([self.instance.coords[r[1:-1]].mean(axis=0) for r in routes])
+        groups = self._groups(centroids, [len(r) - 2 for r in routes], round_)
+        return [([c for k in g for c in routes[k][1:-1]], [routes[k] for k in g]) for g in groups]
+
+    def _round(self, pool, routes, round_):
+        parts = self.partition(routes, round_)
+        jobs = []
+        for k, (customers, _) in enumerate(parts):
+            sub, _ = sub_instance(self.instance, customers)
+            jobs.append((self.solver, sub, self.seed + 1000 * round_ + k, self.quiet))
+        merged, improved = [], 0
+        for (customers, old), sub_routes in zip(parts, pool.map(_solve_part, jobs)):
+            idx = np.concatenate(([0], np.asarray(customers, dtype=int)))
+            new = [idx[r].tolist() for r in sub_routes]
+            covered = sorted(c for r in new for c in r[1:-1]) == sorted(customers)
+            if covered and self.cost(new) < self.cost(old) - 1e-9:
+                merged.extend(new)
+                improved += 1
+            else:
+                merged.extend(old)
+        return merged, improved
+
+    def solve(self, routes=None, max_rounds=10, max_stall=2, termination=None, verbose=True):
+        """
+        Improve `routes` (or build a solution from customer clusters when
+        None) for up to max_rounds rounds, stopping early after max_stall
+        rounds in a row that improve no group or when `termination` fires. Returns (routes, cost,
+        stats) with per-round history of (round, cost, improved groups).
+        """
+        if termination is not None:
+            termination.start()
+        routes = None if routes is None else [list(r) for r in routes if len(r) > 2]
+        cost = self.cost(routes) if routes is not None else float("inf")
+        stats = {"rounds": 0, "history": [], "status": "max_rounds"}
+        stall = 0
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            for round_ in range(max_rounds):
+                if termination is not None and termination.should_stop(round_, cost):
+                    stats["status"] = termination.reason
+                    break
+                first = routes is None
+                routes, improved = self._round(pool, routes, round_)
+                cost = self.cost(routes)
+                stats["rounds"] += 1
+                stats["history"].append((round_, cost, improved))
+                if verbose:
+                    print(f"Round {round_}, routes: {len(routes)}, cost: {cost:.2f}, improved groups: {improved}")
+                stall = 0 if first or improved else stall + 1
+                if stall >= max_stall:
+                    stats["status"] = "converged"
+                    break
+        return routes, cost, stats
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+# ===========================
+# Euclidean distances from coordinates
+# ===========================
+def euclidean_matrix(coords, dtype=np.float64):
+    """Full n x n Euclidean distance matrix, computed once with cdist."""
+    coords = np.asarray(coords, dtype=np.float64)
+    return cdist(coords, coords).astype(dtype, copy=False)
+
+
+class LazyDistanceMatrix:
+    """
+    Euclidean distance "matrix" for instances too large to materialize.
+    Rows are computed in blocks of `block_size` (fewer if one block would
+    exceed `max_bytes`) on first use and kept in an LRU cache of at most
+    `max_bytes`. Indexing with a pair of index arrays
+    (`D[r[:-1], r[1:]]`) is computed straight from the coordinates. With
+    rounded, distances are rounded to the nearest integer (TSPLIB EUC_2D).
+    """
+
+    def __init__(self, coords, dtype=np.float64, block_size=256, max_bytes=256 * 2**20, rounded=False):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self.rounded = rounded
+        n = len(self.coords)
+        self.shape = (n, n)
+        self.dtype = np.dtype(dtype)
+        # a single block must fit the budget too (one row at the least)
+        self.block_size = max(1, min(block_size, max_bytes // max(1, n * self.dtype.itemsize)))
+        block_bytes = self.block_size * n * self.dtype.itemsize
+        self.max_blocks = max(1, max_bytes // block_bytes)
+        self._blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _block(self, b):
+        block = self._blocks.get(b)
+        if block is not None:
+            self.hits += 1
+            self._blocks.move_to_end(b)
+            return block
+        self.misses += 1
+        lo = b * self.block_size
+        block = cdist(self.coords[lo:lo + self.block_size], self.coords)
+        if self.rounded:
+            block = np.rint(block)
+        block = block.astype(self.dtype, copy=False)
+        self._blocks[b] = block
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    def row(self, i):
+        b, k = divmod(int(i), self.block_size)
+        return self._block(b)[k]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self.row(key)
+        i, j = key
+        if np.ndim(i) == 0 and np.ndim(j) == 0:
+            return self.row(i)[j]
+        diff = self.coords[i] - self.coords[j]
+        d = np.sqrt((diff * diff).sum(axis=-1))
+        if self.rounded:
+            d = np.rint(d)
+        return d.astype(self.dtype, copy=False)
@@ -0,0 +1,167 @@
+import math
+
+import numpy as np
+
+# ===========================
+# Green VRP cost: load-dependent fuel, range limit, refuelling stations
+# ===========================
+# Fuel on an arc is d * (empty_rate + load_rate * load), with the load the
+# vehicle carries on that arc (deliveries, so it drops along the route).
+# Vehicles have a driving range and refuel at the depot or at a station.
+# A station detour does not change the load, so on every arc (i, j) the
+# best station is the one with the shortest detour whatever the load; it is
+# looked up once in an n x n table and route evaluation is a single pass.
+
+
+class FuelModel:
+    """
+    Fuel cost per distance unit: empty_rate when empty plus load_rate per
+    unit of load carried.
+    """
+
+    __slots__ = ("empty_rate", "load_rate")
+
+    def __init__(self, empty_rate=1.0, load_rate=0.0):
+        self.empty_rate = empty_rate
+        self.load_rate = load_rate
+
+    def rate(self, load):
+        return self.empty_rate + self.load_rate * load
+
+    @classmethod
+    def cmem(cls, speed=15.0, curb_weight=6350.0, unit_weight=100.0, distance_unit=1000.0,
+             fuel_price=1.0, engine_friction=0.2, engine_speed=33.0, displacement=5.0,
+             drag=0.7, air_density=1.2041, frontal_area=3.912, rolling=0.01, road_angle=0.0,
+             drivetrain=0.4, engine_efficiency=0.9, heating_value=44.0, fuel_density=737.0):
+        """
+        Rates of the comprehensive modal emission model at a constant speed
+        (m/s). Weights are in kg (unit_weight per demand unit), distances in
+        units of distance_unit metres and fuel_price per litre. Defaults are
+        the heavy-duty vehicle of Bektas & Laporte (2011).
+        """
+        lam = 1.0 / (heating_value * fuel_density)
+        gamma = 1.0 / (1000 * drivetrain * engine_efficiency)
+        alpha = 9.81 * (math.sin(road_angle) + rolling * math.cos(road_angle))
+        beta = 0.5 * drag * air_density * frontal_area
+        per_metre = lam * (engine_friction * engine_speed * displacement / speed
+                           + gamma * alpha * curb_weight + gamma * beta * speed ** 2)
+        per_metre_kg = lam * gamma * alpha
+        scale = fuel_price * distance_unit
+        return cls(scale * per_metre, scale * per_metre_kg * unit_weight)
+
+
+class GreenCost:
+    """
+    Station-aware route evaluation over an Instance whose `stations` nodes
+    (zero demand, never routed as customers) are refuelling points. With
+    vehicle_range=None there is no range limit and no station is visited.
+
+    best_station[i, j] is the station of the shortest detour on arc (i, j)
+    among those reachable on a full tank from i that leave enough range to
+    refuel again after j (-1 if none), and detour[i, j] its extra distance.
+    A route refuels greedily: an arc is driven directly when the vehicle
+    still reaches a refuelling point after it, otherwise through its best
+    station. Arcs where neither works count as one range violation each.
+    The n x n tables exist only with a range and at least one station.
+    """
+
+    def __init__(self, instance, model=None, stations=(), vehicle_range=None, penalty=1000):
+        self.instance = instance
+        self.model = model if model is not None else FuelModel()
+        self.stations = np.asarray(stations, dtype=int)
+        self.vehicle_range = vehicle_range
+        self.penalty = penalty
+        self.best_station = self.detour = self.station_in = self.station_out = None
+        self.reach = None
+        if vehicle_range is not None:
+            self._build_tables()
+
+    def _build_tables(self):
+        dist, n, R = self.instance.dist, self.instance.n, self.vehicle_range
+        nodes = np.arange(n)
+        S = self.stations
+        # distance to the nearest refuelling point (depot or station)
+        self.reach = np.asarray(dist[nodes, np.zeros(n, dtype=int)], dtype=float)
+        if not len(S):
+            return
+        self.best_station = np.full((n, n), -1, dtype=np.int32)
+        self.detour = np.zeros((n, n))
+        self.station_in = np.zeros((n, n))
+        self.station_out = np.zeros((n, n))
+        to_s = np.asarray(dist[nodes[:, None], S[None, :]], dtype=float)
+        from_s = np.asarray(dist[S[:, None], nodes[None, :]], dtype=float)
+        self.reach = np.minimum(self.reach, to_s.min(axis=1))
+        best = np.full((n, n), np.inf)
+        for k, s in enumerate(S):
+            via = to_s[:, k, None] + from_s[None, k, :]
+            ok = (to_s[:, k, None] <= R) & (from_s[None, k, :] + self.reach[None, :] <= R)
+            better = ok & (via < best)
+            best[better] = via[better]
+            self.best_station[better] = s
+            self.station_in[better] = np.broadcast_to(to_s[:, k, None], (n, n))[better]
+            self.station_out[better] = np.broadcast_to(from_s[None, k, :], (n, n))[better]
+        rows, cols = np.nonzero(self.best_station >= 0)
+        self.detour[rows, cols] = best[rows, cols] - np.asarray(dist[rows, cols], dtype=float)
+
+    # ===========================
+    # Route evaluation
+    # ===========================
+    def _refuels(self, i, j, d):
+        """Per-arc station flags and the number of range violations."""
+        stops = np.zeros(len(d), dtype=bool)
+        if self.vehicle_range is None:
+            return stops, 0
+        R = self.vehicle_range
+        # gather the route's table entries once, then walk plain lists
+        reach = self.reach[j].tolist()
+        if self.best_station is None:
+            best = [-1] * len(d)
+        else:
+            best = self.best_station[i, j].tolist()
+            station_in = self.station_in[i, j].tolist()
+            station_out = self.station_out[i, j].tolist()
+        remaining, violations = R, 0
+        for k, dk in enumerate(d.tolist()):
+            if remaining - dk >= reach[k]:
+                remaining -= dk
+            elif best[k] >= 0 and station_in[k] <= remaining:
+                stops[k] = True
+                remaining = R - station_out[k]
+            else:
+                violations += 1
+                remaining = R
+        return stops, violations
+
+    def evaluate(self, route):
+        """(fuel cost, load, range violations) of a route [0, ..., 0]."""
+        r = np.asarray(route)
+        i, j = r[:-1], r[1:]
+        d = np.asarray(self.instance.dist[i, j], dtype=float)
+        q = self.instance.demand[r]
+        load = q.sum().item()
+        carried = load - np.cumsum(q)[:-1]
+        stops, violations = self._refuels(i, j, d)
+        if stops.any():
+            d = d + np.where(stops, self.detour[i, j], 0.0)
+        fuel = (d * (self.model.empty_rate + self.model.load_rate * carried)).sum().item()
+        return fuel, load, violations
+
+    def route_cost(self, route):
+        """Fuel cost plus `penalty` per unit of overload and per range violation."""
+        fuel, load, violations = self.evaluate(route)
+        return fuel + self.penalty * (max(0, load - self.instance.capacity) + violations)
+
+    def solution_cost(self, routes):
+        return sum(self.route_cost(route) for route in routes)
+
+    def plan(self, route):
+        """The route with the refuelling stations it visits inserted."""
+        r = np.asarray(route)
+        i, j = r[:-1], r[1:]
+        stops, _ = self._refuels(i, j, np.asarray(self.instance.dist[i, j], dtype=float))
+        planned = [int(r[0])]
+        for a, b, stop in zip(i.tolist(), j.tolist(), stops.tolist()):
+            if stop:
+                planned.append(int(self.best_station[a, b]))
+            planned.append(b)
+        return planned
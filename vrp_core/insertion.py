@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+
+# ===========================
+# Delta-cost insertion
+# ===========================
+def insertion_deltas(dist, route, c):
+    """
+    Cost increase of inserting customer c at every position 1..len(route)-1,
+    i.e. d[i,c] + d[c,j] - d[i,j] for each arc (i, j) of the route.
+    """
+    r = np.asarray(route)
+    prev, nxt = r[:-1], r[1:]
+    return dist[prev, c] + dist[c, nxt] - dist[prev, nxt]
+
+
+def best_insertion(instance, routes, loads, c):
+    """
+    Cheapest capacity-feasible insertion of c into `routes`, whose current
+    loads are cached in `loads`. Returns (delta, route_idx, pos), with
+    route_idx None when no route can take c.
+    """
+    best_delta, best_route_idx, best_pos = math.inf, None, None
+    limit = instance.capacity - instance.demand[c]
+    for r_idx, route in enumerate(routes):
+        if loads[r_idx] > limit:
+            continue
+        deltas = insertion_deltas(instance.dist, route, c)
+        i = int(deltas.argmin())
+        if deltas[i] < best_delta:
+            best_delta, best_route_idx, best_pos = deltas[i].item(), r_idx, i + 1
+    return best_delta, best_route_idx, best_pos
+
+
+# ===========================
+# Regret-k insertion with a cached cost table
+# ===========================
+def regret_insertion(instance, routes, loads, customers, k=2):
+    """
+    Insert `customers` into `routes` (in place, with `loads` kept in step) in
+    regret-k order: next is the customer with the largest summed gap between
+    its best and its 2nd..k-th best route, where opening a new route counts
+    as one more option. The cheapest insertion per (customer, route) is kept
+    in a table, and after each insertion only the modified route's column is
+    recomputed. Returns routes.
+    """
+    dist, demand = instance.dist, instance.demand
+    pending = np.asarray(customers, dtype=np.int64)
+    m = len(pending)
+    if m == 0:
+        return routes
+    # room for one new route per customer
+    cost = np.full((m, len(routes) + m), np.inf)
+    pos = np.zeros(cost.shape, dtype=np.int64)
+    new_route = np.asarray(dist[0, pending] + dist[pending, 0], dtype=float)
+    limit = instance.capacity - demand[pending]
+    active = np.ones(m, dtype=bool)
+
+    def update_column(r_idx):
+        rows = np.flatnonzero(active)
+        r = np.asarray(routes[r_idx])
+        prev, nxt = r[:-1], r[1:]
+        c = pending[rows, None]
+        deltas = dist[prev[None, :], c] + dist[c, nxt[None, :]] - dist[prev, nxt][None, :]
+        best = deltas.argmin(axis=1)
+        col = deltas[np.arange(len(rows)), best].astype(float)
+        col[loads[r_idx] > limit[rows]] = np.inf
+        cost[rows, r_idx] = col
+        pos[rows, r_idx] = best + 1
+
+    for r_idx in range(len(routes)):
+        update_column(r_idx)
+
+    for _ in range(m):
+        rows = np.flatnonzero(active)
+        options = np.column_stack([cost[rows, :len(routes)], new_route[rows]])
+        kk = min(k, options.shape[1])
+        top = np.sort(np.partition(options, kk - 1, axis=1)[:, :kk], axis=1)
+        regret = (top[:, 1:] - top[:, :1]).sum(axis=1)
+        # largest regret first, ties broken by the cheaper insertion
+        i = rows[np.lexsort((top[:, 0], -regret))[0]]
+        c = int(pending[i])
+        active[i] = False
+        r_idx = int(cost[i, :len(routes)].argmin()) if routes else None
+        if r_idx is None or not cost[i, r_idx] <= new_route[i]:
+            routes.append([0, c, 0])
+            loads.append(demand[c])
+            r_idx = len(routes) - 1
+        else:
+            routes[r_idx].insert(int(pos[i, r_idx]), c)
+            loads[r_idx] += demand[c]
+        if active.any():
+            update_column(r_idx)
+    return routes
@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+
+from .distances import LazyDistanceMatrix, euclidean_matrix
+
+# ===========================
+# Array-backed problem instance
+# ===========================
+# Node ids are the row/column indices of the distance matrix, 0 = depot.
+_ARRAYS = ("dist", "demand", "ready", "due", "service")
+
+
+class Instance:
+    """
+    Distances, demands and time windows of a VRP instance as contiguous
+    NumPy arrays. `dist` may be any 2-D array-like, including a float32
+    matrix, a read-only np.memmap (see `load`) or a LazyDistanceMatrix.
+    `neighbors` optionally holds precomputed k-nearest candidate lists
+    (see nearest_neighbors).
+    """
+
+    def __init__(self, dist, demand, capacity, ready=None, due=None, service=None, coords=None,
+                 neighbors=None):
+        if isinstance(dist, LazyDistanceMatrix):
+            self.dist = dist
+        else:
+            self.dist = np.ascontiguousarray(dist)  # a contiguous memmap stays zero-copy
+        n = self.dist.shape[0]
+        if self.dist.shape != (n, n):
+            raise ValueError(f"distance matrix must be square, got {self.dist.shape}")
+        self.demand = np.ascontiguousarray(demand)
+        self.capacity = capacity
+        self.ready = np.zeros(n) if ready is None else np.ascontiguousarray(ready, dtype=float)
+        self.due = np.full(n, np.inf) if due is None else np.ascontiguousarray(due, dtype=float)
+        self.service = np.zeros(n) if service is None else np.ascontiguousarray(service, dtype=float)
+        for name in _ARRAYS[1:]:
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"{name} must have one entry per node ({n})")
+        self.coords = None if coords is None else np.ascontiguousarray(coords, dtype=float)
+        self.neighbors = neighbors
+
+    @property
+    def n(self):
+        return self.dist.shape[0]
+
+    def is_symmetric(self):
+        """Whether d[i, j] == d[j, i]; computed once (lazy matrices are Euclidean)."""
+        if getattr(self, "_symmetric", None) is None:
+            if isinstance(self.dist, LazyDistanceMatrix):
+                self._symmetric = True
+            else:
+                self._symmetric = bool(np.allclose(self.dist, self.dist.T))
+        return self._symmetric
+
+    @classmethod
+    def from_dicts(cls, customers, demand, capacity, distance,
+                   time_window=None, service_time=None, dtype=None):
+        """
+        Build an instance from the `{(i, j): cost}` / `{i: value}` dicts used by
+        the scripts. `dtype` defaults to the type of the arc costs (e.g. int64);
+        pass np.float32 to halve the matrix footprint.
+        """
+        n = len(customers)
+        if sorted(customers) != list(range(n)):
+            raise ValueError("customer ids must be 0..n-1 with 0 = depot")
+        if dtype is None:
+            dtype = np.result_type(*distance.values()) if distance else np.float64
+        dist = np.zeros((n, n), dtype=dtype)
+        missing = [(i, j) for i in range(n) for j in range(n) if i != j and (i, j) not in distance]
+        if missing:
+            raise ValueError(f"distance is missing arcs, e.g. {missing[0]}")
+        for (i, j), d in distance.items():
+            dist[i, j] = d
+        dem = np.array([demand[c] for c in range(n)])
+        ready = due = service = None
+        if time_window is not None:
+            ready = [time_window[c][0] for c in range(n)]
+            due = [time_window[c][1] for c in range(n)]
+        if service_time is not None:
+            service = [service_time[c] for c in range(n)]
+        return cls(dist, dem, capacity, ready, due, service)
+
+    @classmethod
+    def from_coords(cls, coords, demand, capacity, ready=None, due=None, service=None,
+                    dtype=np.float64, max_bytes=None):
+        """
+        Euclidean instance from an (n, 2) coordinate array. The full matrix is
+        built once with cdist unless it would exceed `max_bytes`, in which case
+        rows are computed lazily within that memory budget.
+        """
+        coords = np.asarray(coords, dtype=float)
+        n = len(coords)
+        if max_bytes is not None and n * n * np.dtype(dtype).itemsize > max_bytes:
+            dist = LazyDistanceMatrix(coords, dtype=dtype, max_bytes=max_bytes)
+        else:
+            dist = euclidean_matrix(coords, dtype=dtype)
+        return cls(dist, demand, capacity, ready, due, service, coords=coords)
+
+    # ===========================
+    # Persistence (memory-mapped matrix)
+    # ===========================
+    def save(self, path):
+        """
+        Write every array as `<path>/<name>.npy` plus the capacity. A lazy
+        distance matrix is not materialized; only its coordinates (and
+        whether it rounds) are saved.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            if name == "dist" and isinstance(self.dist, LazyDistanceMatrix):
+                np.save(os.path.join(path, "rounded.npy"), np.array(self.dist.rounded))
+                continue
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        for name in ("coords", "neighbors"):
+            if getattr(self, name) is not None:
+                np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        np.save(os.path.join(path, "capacity.npy"), np.array(self.capacity))
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """Open a bundle written by `save`; with mmap_mode='r' nothing is copied."""
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in _ARRAYS + ("coords", "neighbors")
+                  if os.path.exists(os.path.join(path, f"{name}.npy"))}
+        if "dist" not in arrays:
+            rounded = np.load(os.path.join(path, "rounded.npy")).item()
+            arrays["dist"] = LazyDistanceMatrix(arrays["coords"], rounded=rounded)
+        capacity = np.load(os.path.join(path, "capacity.npy")).item()
+        return cls(capacity=capacity, **arrays)
+
+    # ===========================
+    # Route evaluation
+    # ===========================
+    def route_cost(self, route):
+        r = np.asarray(route)
+        return self.dist[r[:-1], r[1:]].sum().item()
+
+    def route_load(self, route):
+        # the depot has zero demand, so it needs no masking
+        return self.demand[np.asarray(route)].sum().item()
+
+    def solution_cost(self, solution, penalty=1000):
+        """Total distance plus `penalty` per unit of capacity overflow."""
+        total = 0
+        for route in solution:
+            load = self.route_load(route)
+            if load > self.capacity:
+                total += penalty * (load - self.capacity)
+            total += self.route_cost(route)
+        return total
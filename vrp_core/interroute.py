@@ -0,0 +1,197 @@
+import numpy as np
+
+# ===========================
+# Inter-route local search with O(1) move evaluation
+# ===========================
+# Each route keeps prefix arrays: load[p] = demand of positions 0..p and
+# dist[p] = distance from the start to position p. The load and inner
+# distance of any segment i..j are then two lookups, so 2-opt* (tail
+# exchange), CROSS-exchange (swap two segments) and relocate are all
+# scored in O(1) from the few arcs they break and create.
+
+
+class RouteData:
+    __slots__ = ("route", "load", "dist")
+
+    def __init__(self, instance, route):
+        r = np.asarray(route)
+        self.route = list(route)
+        self.load = np.cumsum(instance.demand[r]).tolist()
+        self.dist = np.concatenate(([0.0], np.cumsum(instance.dist[r[:-1], r[1:]]))).tolist()
+
+    def inner(self, i, j):
+        """Distance travelled from position i to position j."""
+        return self.dist[j] - self.dist[i]
+
+    def segment_load(self, i, j):
+        return self.load[j] - self.load[i - 1]
+
+
+class InterRouteSearch:
+    """
+    Best-improvement descent over relocate, 2-opt* and CROSS-exchange
+    (segments of up to max_segment customers) between pairs of routes, with
+    the capacity penalty of Solution. Customers are scanned with don't-look
+    bits: a customer with no improving move is skipped until one of the two
+    routes involved in a later move contains it. With `neighbors` (k-nearest
+    candidate lists) only moves that bring a customer next to one of its
+    neighbours are tried. `evaluations` counts scored moves.
+    """
+
+    def __init__(self, instance, penalty=1000, max_segment=2, neighbors=None, tol=1e-9):
+        self.instance = instance
+        self.penalty = penalty
+        self.max_segment = max_segment
+        self.neighbors = neighbors
+        self.tol = tol
+        self.evaluations = 0
+
+    def _objective(self, cost, load):
+        over = load - self.instance.capacity
+        return cost + (self.penalty * over if over > 0 else 0)
+
+    # ===========================
+    # Move evaluation
+    # ===========================
+    def _relocate(self, A, i, B, j):
+        # customer A[i] to between B[j] and B[j+1]
+        d, q = self.instance.dist, self.instance.demand
+        a, b = A.route, B.route
+        c = a[i]
+        cost_a = A.dist[-1] - d[a[i-1], c] - d[c, a[i+1]] + d[a[i-1], a[i+1]]
+        cost_b = B.dist[-1] - d[b[j], b[j+1]] + d[b[j], c] + d[c, b[j+1]]
+        return cost_a, A.load[-1] - q[c], cost_b, B.load[-1] + q[c]
+
+    def _two_opt_star(self, A, i, B, j):
+        # A[:i+1] + B[j+1:] and B[:j+1] + A[i+1:]
+        d = self.instance.dist
+        a, b = A.route, B.route
+        cost_a = A.dist[i] + d[a[i], b[j+1]] + B.dist[-1] - B.dist[j+1]
+        cost_b = B.dist[j] + d[b[j], a[i+1]] + A.dist[-1] - A.dist[i+1]
+        load_a = A.load[i] + B.load[-1] - B.load[j]
+        load_b = B.load[j] + A.load[-1] - A.load[i]
+        return cost_a, load_a, cost_b, load_b
+
+    def _cross(self, A, i1, i2, B, j1, j2):
+        # swap A[i1..i2] with B[j1..j2]
+        d = self.instance.dist
+        a, b = A.route, B.route
+        cost_a = (A.dist[-1] - d[a[i1-1], a[i1]] - d[a[i2], a[i2+1]] - A.inner(i1, i2)
+                  + d[a[i1-1], b[j1]] + B.inner(j1, j2) + d[b[j2], a[i2+1]])
+        cost_b = (B.dist[-1] - d[b[j1-1], b[j1]] - d[b[j2], b[j2+1]] - B.inner(j1, j2)
+                  + d[b[j1-1], a[i1]] + A.inner(i1, i2) + d[a[i2], b[j2+1]])
+        load_a = A.load[-1] - A.segment_load(i1, i2) + B.segment_load(j1, j2)
+        load_b = B.load[-1] - B.segment_load(j1, j2) + A.segment_load(i1, i2)
+        return cost_a, load_a, cost_b, load_b
+
+    def _partners(self, c, ra, data, pos):
+        """(route index, position) anchors in other routes to try for c."""
+        if self.neighbors is not None:
+            for b in self.neighbors[c]:
+                rb, jb = pos[int(b)]
+                if rb != ra:
+                    yield rb, jb
+            return
+        for rb, B in enumerate(data):
+            if rb != ra:
+                for jb in range(1, len(B.route) - 1):
+                    yield rb, jb
+                if len(B.route) == 2:
+                    yield rb, 0
+
+    def _best_move(self, c, data, pos):
+        ra, i = pos[c]
+        A = data[ra]
+        na = len(A.route)
+        old = {}
+        best_delta, best_move = -self.tol, None
+
+        def consider(rb, result, move):
+            nonlocal best_delta, best_move
+            self.evaluations += 1
+            B = data[rb]
+            if rb not in old:
+                old[rb] = self._objective(B.dist[-1], B.load[-1])
+            cost_a, load_a, cost_b, load_b = result
+            delta = (self._objective(cost_a, load_a) + self._objective(cost_b, load_b)
+                     - old[ra] - old[rb])
+            if delta < best_delta:
+                best_delta, best_move = delta, move
+
+        old[ra] = self._objective(A.dist[-1], A.load[-1])
+        for rb, jb in self._partners(c, ra, data, pos):
+            B = data[rb]
+            nb = len(B.route)
+            # relocate c before or after the anchor
+            for j in {max(jb - 1, 0), min(jb, nb - 2)}:
+                consider(rb, self._relocate(A, i, B, j), ("relocate", ra, i, rb, j))
+            # 2-opt*: cut A around c and B around the anchor
+            for ia in (i - 1, i):
+                for j in {max(jb - 1, 0), min(jb, nb - 2)}:
+                    if (ia == 0 and j == 0) or (ia == na - 2 and j == nb - 2):
+                        continue
+                    consider(rb, self._two_opt_star(A, ia, B, j), ("2opt*", ra, ia, rb, j))
+            # CROSS-exchange of segments starting at c and at the anchor
+            if jb == 0:
+                continue
+            for la in range(1, self.max_segment + 1):
+                if i + la - 1 > na - 2:
+                    break
+                for lb in range(1, self.max_segment + 1):
+                    if jb + lb - 1 > nb - 2:
+                        break
+                    consider(rb, self._cross(A, i, i + la - 1, B, jb, jb + lb - 1),
+                             ("cross", ra, i, i + la - 1, rb, jb, jb + lb - 1))
+        return best_delta, best_move
+
+    # ===========================
+    # Descent
+    # ===========================
+    @staticmethod
+    def _apply(routes, move):
+        kind = move[0]
+        if kind == "relocate":
+            _, ra, i, rb, j = move
+            a, b = routes[ra], routes[rb]
+            return ra, a[:i] + a[i+1:], rb, b[:j+1] + [a[i]] + b[j+1:]
+        if kind == "2opt*":
+            _, ra, i, rb, j = move
+            a, b = routes[ra], routes[rb]
+            return ra, a[:i+1] + b[j+1:], rb, b[:j+1] + a[i+1:]
+        _, ra, i1, i2, rb, j1, j2 = move
+        a, b = routes[ra], routes[rb]
+        return ra, a[:i1] + b[j1:j2+1] + a[i2+1:], rb, b[:j1] + a[i1:i2+1] + b[j2+1:]
+
+    def descend(self, routes, termination=None):
+        """
+        Improve `routes` (lists [0, ..., 0]) until no move helps, or until
+        the optional vrp_core.Termination expires. Returns (new routes
+        without empty ones, objective change).
+        """
+        routes = [list(r) for r in routes]
+        data = [RouteData(self.instance, r) for r in routes]
+        pos = {c: (r_idx, p) for r_idx, r in enumerate(routes) for p, c in enumerate(r) if c != 0}
+        dont_look = set()
+        queue = list(pos)
+        total = 0.0
+        while queue:
+            c = queue.pop()
+            if c in dont_look:
+                continue
+            if termination is not None and termination.expired():
+                break
+            delta, move = self._best_move(c, data, pos)
+            if move is None:
+                dont_look.add(c)
+                continue
+            total += delta
+            ra, route_a, rb, route_b = self._apply(routes, move)
+            for r_idx, route in ((ra, route_a), (rb, route_b)):
+                routes[r_idx] = route
+                data[r_idx] = RouteData(self.instance, route)
+                for p, v in enumerate(route):
+                    if v != 0:
+                        pos[v] = (r_idx, p)
+                        dont_look.discard(v)
+                        queue.append(v)
+        return [r for r in routes if len(r) > 2], float(total)
@@ -0,0 +1,99 @@
+import numpy as np
+
+# ===========================
+# Best-improvement intra-route descent
+# ===========================
+# Every candidate move of a route is scored at once as a NumPy delta matrix
+# over the route's sub-matrix of distances, the best one is applied and the
+# scoring repeats until nothing improves. Asymmetric distances are handled:
+# reversing a segment also pays for its reversed inner arcs.
+
+
+def two_opt_deltas(sub):
+    """
+    delta[i-1, j-1] = cost change of reversing positions i..j (1 <= i < j <=
+    m-2) of a route whose distances are sub = dist[route][:, route]; inf
+    where the move does not exist.
+    """
+    m = len(sub)
+    k = np.arange(m - 1)
+    # reversing inner arcs: sum of d[k+1, k] - d[k, k+1] over the segment
+    flip = np.concatenate(([0.0], np.cumsum(sub[k + 1, k] - sub[k, k + 1])))
+    I = np.arange(1, m - 1)[:, None]
+    J = np.arange(1, m - 1)[None, :]
+    delta = (sub[I - 1, J] + sub[I, J + 1] - sub[I - 1, I] - sub[J, J + 1]
+             + flip[J] - flip[I]).astype(float)
+    delta[J <= I] = np.inf
+    return delta
+
+
+def or_opt_deltas(sub, length):
+    """
+    delta[s-1, p] = cost change of moving positions s..s+length-1 to between
+    positions p and p+1 (original indexing); inf where the move does not exist.
+    """
+    m = len(sub)
+    S = np.arange(1, m - length)[:, None]
+    P = np.arange(m - 1)[None, :]
+    end = S + length - 1
+    removal = sub[S - 1, S] + sub[end, end + 1] - sub[S - 1, end + 1]
+    insertion = sub[P, S] + sub[end, P + 1] - sub[P, P + 1]
+    delta = (insertion - removal).astype(float)
+    delta[(P >= S - 1) & (P <= end)] = np.inf
+    return delta
+
+
+class RouteOptimizer:
+    """
+    Best-improvement 2-opt + Or-opt (segments of 1..or_opt customers) for
+    single routes. Routes already known to be local optima are skipped
+    (don't-look bits, keyed by route content so any change re-arms them).
+    `evaluations` counts scored candidate moves.
+    """
+
+    def __init__(self, instance, or_opt=3, tol=1e-9, cache_size=100000):
+        self.dist = instance.dist
+        self.or_opt = or_opt
+        self.tol = tol
+        self.cache_size = cache_size
+        self.local_optima = set()
+        self.evaluations = 0
+
+    def optimize(self, route):
+        """Returns (locally optimal route, cost change <= 0)."""
+        key = tuple(route)
+        if len(route) <= 3 or key in self.local_optima:
+            return route, 0.0
+        r = np.asarray(route)
+        total = 0.0
+        while True:
+            sub = np.asarray(self.dist[r[:, None], r[None, :]], dtype=float)
+            best, move = -self.tol, None
+            delta = two_opt_deltas(sub)
+            self.evaluations += delta.size
+            idx = np.unravel_index(np.argmin(delta), delta.shape)
+            if delta[idx] < best:
+                best, move = delta[idx], ("2opt", idx[0] + 1, idx[1] + 1)
+            for length in range(1, min(self.or_opt, len(r) - 3) + 1):
+                delta = or_opt_deltas(sub, length)
+                self.evaluations += delta.size
+                idx = np.unravel_index(np.argmin(delta), delta.shape)
+                if delta[idx] < best:
+                    best, move = delta[idx], ("oropt", idx[0] + 1, idx[1], length)
+            if move is None:
+                break
+            total += float(best)
+            if move[0] == "2opt":
+                _, i, j = move
+                r = np.concatenate((r[:i], r[i:j + 1][::-1], r[j + 1:]))
+            else:
+                _, s, p, length = move
+                segment = r[s:s + length]
+                rest = np.concatenate((r[:s], r[s + length:]))
+                at = p + 1 if p < s else p + 1 - length
+                r = np.concatenate((rest[:at], segment, rest[at:]))
+        new_route = r.tolist()
+        if len(self.local_optima) >= self.cache_size:
+            self.local_optima.clear()
+        self.local_optima.add(tuple(new_route))
+        return new_route, total
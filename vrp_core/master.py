@@ -0,0 +1,123 @@
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+from scipy.sparse import csc_matrix
+
+# ===========================
+# Set-partitioning master problem
+# ===========================
+# min c^T x  s.t.  A x = 1,  x >= 0 (LP) or x in {0, 1} (IP), where row
+# c-1 of A is customer c and column k counts how often route k visits it.
+# Both are solved in process by HiGHS.
+
+
+def route_costs(instance, routes):
+    """Distance of every route, in one vectorized pass over all arcs."""
+    lengths = np.fromiter((len(r) for r in routes), dtype=np.int64, count=len(routes))
+    flat = np.fromiter((c for r in routes for c in r), dtype=np.int64, count=int(lengths.sum()))
+    arcs = np.zeros(len(flat))
+    arcs[:-1] = instance.dist[flat[:-1], flat[1:]]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    # the "arc" from the end of one route to the start of the next is not one
+    arcs[starts[1:] - 1] = 0
+    return np.add.reduceat(arcs, starts)
+
+
+def incidence_matrix(routes, n):
+    """(n-1) x len(routes) CSC matrix of customer visits, built in one pass."""
+    counts = np.fromiter((len(r) - 2 for r in routes), dtype=np.int64, count=len(routes))
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    rows = np.fromiter((c - 1 for r in routes for c in r[1:-1]), dtype=np.int64, count=int(indptr[-1]))
+    A = csc_matrix((np.ones(len(rows)), rows, indptr), shape=(n - 1, len(routes)))
+    A.sum_duplicates()  # a route visiting a customer twice (ng-routes) counts 2
+    return A
+
+
+def _grow(buffer, size):
+    """`buffer`, or a copy at least twice as long when it is shorter than `size`."""
+    if size <= len(buffer):
+        return buffer
+    grown = np.zeros(max(size, 2 * len(buffer)), dtype=buffer.dtype)
+    grown[:len(buffer)] = buffer
+    return grown
+
+
+class SetPartitioningMaster:
+    """
+    Column pool plus its incidence matrix. Columns are appended with
+    `add_routes` into CSC buffers that double when full, so a run of column
+    generation copies each column O(1) times on average; `A` wraps the
+    filled part of the buffers without copying.
+    """
+
+    def __init__(self, instance, routes=(), costs=None):
+        self.instance = instance
+        self.routes = []
+        self._costs = np.zeros(0)
+        self._data = np.zeros(0)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._indptr = np.zeros(1, dtype=np.int32)
+        self._A = None
+        if len(routes):
+            self.add_routes(routes, costs)
+
+    def __len__(self):
+        return len(self.routes)
+
+    @property
+    def costs(self):
+        return self._costs[:len(self)]
+
+    @property
+    def A(self):
+        if self._A is None:
+            m = len(self)
+            nnz = self._indptr[m]
+            self._A = csc_matrix((self._data[:nnz], self._indices[:nnz], self._indptr[:m + 1]),
+                                 shape=(self.instance.n - 1, m))
+        return self._A
+
+    def add_routes(self, routes, costs=None):
+        routes = [list(r) for r in routes]
+        if not routes:
+            return
+        costs = route_costs(self.instance, routes) if costs is None else np.asarray(costs, dtype=float)
+        block = incidence_matrix(routes, self.instance.n)
+        m, k = len(self), len(routes)
+        nnz = self._indptr[m]
+        self._data = _grow(self._data, nnz + block.nnz)
+        self._indices = _grow(self._indices, nnz + block.nnz)
+        self._indptr = _grow(self._indptr, m + k + 1)
+        self._costs = _grow(self._costs, m + k)
+        self._data[nnz:nnz + block.nnz] = block.data
+        self._indices[nnz:nnz + block.nnz] = block.indices
+        self._indptr[m + 1:m + k + 1] = nnz + block.indptr[1:]
+        self._costs[m:m + k] = costs
+        self.routes.extend(routes)
+        self._A = None
+
+    def solve_lp(self, upper=None):
+        """
+        LP relaxation. Returns (x, objective, duals) with duals indexed by
+        node (depot 0 = 0.0), or (None, None, None) if infeasible. `upper`
+        optionally bounds each column: 0 forbids it, inf leaves it free (the
+        partitioning rows already imply x <= 1).
+        """
+        bounds = (0, None) if upper is None else np.column_stack((np.zeros(len(self)), upper))
+        res = linprog(self.costs, A_eq=self.A, b_eq=np.ones(self.A.shape[0]),
+                      bounds=bounds, method="highs")
+        if not res.success:
+            return None, None, None
+        return res.x, res.fun, np.concatenate(([0.0], res.eqlin.marginals))
+
+    def solve_ip(self, time_limit=None):
+        """Integer set partitioning: (x, objective), or (None, None) if infeasible."""
+        options = {} if time_limit is None else {"time_limit": time_limit}
+        res = milp(self.costs, constraints=LinearConstraint(self.A, 1, 1),
+                   integrality=np.ones(len(self)), bounds=Bounds(0, 1), options=options)
+        if res.x is None:
+            return None, None
+        return res.x, res.fun
+
+    def selected(self, x, tol=1e-6):
+        """[(route, value)] for the columns with a positive value in x."""
+        return [(self.routes[k], x[k]) for k in np.flatnonzero(x > tol)]
@@ -0,0 +1,36 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+# ===========================
+# Granular candidate lists
+# ===========================
+def nearest_neighbors(instance, k, block_size=1024):
+    """
+    (n, k) int array: row c lists the k customers nearest to customer c
+    (never c itself or the depot); row 0 is unused. Uses a KD-tree on the
+    coordinates when the instance has them, otherwise a partial argsort of
+    the distance matrix, a block of rows at a time. Lists stored on the
+    instance (e.g. from a compiled bundle) are reused when long enough.
+    """
+    n = instance.n
+    k = min(k, n - 2)
+    if instance.neighbors is not None and instance.neighbors.shape[1] >= k:
+        return instance.neighbors[:, :k]
+    out = np.zeros((n, max(k, 0)), dtype=np.int64)
+    if k <= 0:
+        return out
+    if instance.coords is not None:
+        # query k + 2 points: the customer itself and possibly the depot
+        _, idx = cKDTree(instance.coords).query(instance.coords[1:], k=k + 2)
+        for row, c in zip(idx, range(1, n)):
+            out[c] = [j for j in row if j != c and j != 0][:k]
+        return out
+    for lo in range(1, n, block_size):
+        hi = min(lo + block_size, n)
+        rows = np.array([np.asarray(instance.dist[i], dtype=np.float64) for i in range(lo, hi)])
+        rows[:, 0] = np.inf
+        rows[np.arange(hi - lo), np.arange(lo, hi)] = np.inf
+        part = np.argpartition(rows, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(rows, part, axis=1).argsort(axis=1)
+        out[lo:hi] = np.take_along_axis(part, order, axis=1)
+    return out
@@ -0,0 +1,239 @@
+import heapq
+import math
+from collections import deque
+
+import numpy as np
+
+# ===========================
+# ESPPRC pricing by labeling
+# ===========================
+# Reduced cost of a route = distance - sum of the duals of the customers it
+# visits. A label is a partial path: forward labels start at the depot,
+# backward labels end at it. With bidirectional labeling each direction is
+# only extended while its load is at most Q/2, and full routes are found by
+# joining a forward label at i with a backward label at j across arc (i, j).
+
+
+class Label:
+    __slots__ = ("node", "cost", "load", "time", "visits", "parent", "alive")
+
+    def __init__(self, node, cost, load, time, visits, parent):
+        self.node = node
+        self.cost = cost
+        self.load = load
+        # forward: earliest service start at node; backward: latest one
+        self.time = time
+        # bitmask of visited customers (ng memory under the ng relaxation)
+        self.visits = visits
+        self.parent = parent
+        self.alive = True
+
+    def path(self):
+        nodes = []
+        label = self
+        while label is not None:
+            nodes.append(label.node)
+            label = label.parent
+        return nodes
+
+
+def ng_neighborhoods(instance, size):
+    """Bitmask per node of its `size` nearest customers, itself included."""
+    n = instance.n
+    masks = [0] * n
+    for i in range(1, n):
+        row = np.asarray(instance.dist[i])[1:]
+        k = min(size, n - 1)
+        nearest = np.argpartition(row, k - 1)[:k] + 1
+        mask = 1 << i
+        for j in nearest:
+            mask |= 1 << int(j)
+        masks[i] = mask
+    return masks
+
+
+def _dominated(bucket, cost, load, time, visits, forward):
+    """Whether a label in bucket dominates a new one with these resources."""
+    # checked before the new Label is even built: most candidate labels are
+    # dominated, so this loop is the hot path and compares plain attributes
+    if forward:
+        for old in bucket:
+            if old.cost <= cost and old.load <= load and old.time <= time and not old.visits & ~visits:
+                return True
+    else:
+        for old in bucket:
+            if old.cost <= cost and old.load <= load and old.time >= time and not old.visits & ~visits:
+                return True
+    return False
+
+
+def _insert(bucket, label, forward, label_limit=None):
+    """
+    Add a non-dominated label to its node's bucket; drops labels it
+    dominates. With label_limit, a full bucket only keeps the cheapest labels.
+    """
+    cost, load, time, visits = label.cost, label.load, label.time, label.visits
+    sign = 1 if forward else -1
+    dead = [old for old in bucket
+            if cost <= old.cost and load <= old.load and sign * time <= sign * old.time
+            and not visits & ~old.visits]
+    if dead:
+        for old in dead:
+            old.alive = False
+        bucket[:] = [old for old in bucket if old.alive]
+    if label_limit is not None and len(bucket) >= label_limit:
+        worst = max(range(len(bucket)), key=lambda k: bucket[k].cost)
+        if bucket[worst].cost <= cost:
+            return False
+        bucket[worst].alive = False
+        bucket.pop(worst)
+    bucket.append(label)
+    return True
+
+
+def _ng_feasible(path, ng_masks):
+    memory = 0
+    for v in path[1:-1]:
+        if memory >> v & 1:
+            return False
+        memory = (memory & ng_masks[v]) | (1 << v)
+    return True
+
+
+class PricingProblem:
+    """
+    Resource-constrained shortest path pricing over an Instance (capacity and
+    the instance's time windows). Build once, then call `solve(duals)` each
+    column-generation iteration.
+
+    forbidden_arcs: set of (i, j) arcs pricing may not use.
+    ng_size: elementarity is relaxed to ng-routes with neighborhoods of that
+        many nearest customers; routes may then revisit a customer, so the
+        LP bound is slightly weaker. None prices elementary routes only, which
+        is exact but only practical up to about 50 customers.
+    """
+
+    def __init__(self, instance, bidirectional=True, ng_size=8, forbidden_arcs=()):
+        self.instance = instance
+        self.bidirectional = bidirectional
+        n = instance.n
+        self.n = n
+        self.dist = [np.asarray(instance.dist[i]).tolist() for i in range(n)]
+        self.demand = instance.demand.tolist()
+        self.ready = instance.ready.tolist()
+        self.due = instance.due.tolist()
+        self.service = instance.service.tolist()
+        self.capacity = instance.capacity
+        self.ng_masks = ng_neighborhoods(instance, ng_size) if ng_size else None
+        forbidden = set(forbidden_arcs)
+        d, q, a, b, s = self.dist, self.demand, self.ready, self.due, self.service
+        # static arc filter: capacity and time windows of the two endpoints.
+        # succ[i] holds customers only; pred[0] holds customers that may end a route.
+        self.succ = [[] for _ in range(n)]
+        self.pred = [[] for _ in range(n)]
+        for i in range(n):
+            for j in range(n):
+                if i == j or (i, j) in forbidden or q[j] > self.capacity:
+                    continue
+                if a[i] + s[i] + d[i][j] > b[j]:
+                    continue
+                if j != 0:
+                    self.succ[i].append(j)
+                if i != 0:
+                    self.pred[j].append(i)
+        self.closes = set(self.pred[0])
+
+    def _sweep(self, pi, forward, limit, label_limit):
+        d, q, a, b, s = self.dist, self.demand, self.ready, self.due, self.service
+        ng = self.ng_masks
+        Q = self.capacity
+        root = Label(0, 0.0, 0, a[0] if forward else b[0], 0, None)
+        buckets = [[] for _ in range(self.n)]
+        buckets[0].append(root)
+        queue = deque([root])
+        arcs = self.succ if forward else self.pred
+        while queue:
+            label = queue.popleft()
+            if not label.alive or label.load > limit:
+                continue
+            v = label.node
+            for w in arcs[v]:
+                if label.visits >> w & 1:
+                    continue
+                load = label.load + q[w]
+                if load > Q:
+                    continue
+                if forward:
+                    time = max(label.time + s[v] + d[v][w], a[w])
+                    if time > b[w] or time + s[w] + d[w][0] > b[0]:
+                        continue
+                    cost = label.cost + d[v][w] - pi[w]
+                else:
+                    time = min(b[w], label.time - s[w] - d[w][v])
+                    if time < a[w] or a[0] + s[0] + d[0][w] > time:
+                        continue
+                    cost = label.cost + d[w][v] - pi[w]
+                visits = (label.visits if ng is None else label.visits & ng[w]) | 1 << w
+                if _dominated(buckets[w], cost, load, time, visits, forward):
+                    continue
+                new = Label(w, cost, load, time, visits, label)
+                if _insert(buckets[w], new, forward, label_limit):
+                    queue.append(new)
+        return buckets
+
+    def solve(self, duals, max_routes=50, label_limit=None, tol=1e-4):
+        """
+        Negative reduced-cost routes as a list of (reduced_cost, route), best
+        first. `duals` is indexed by node; duals[0] is ignored. With
+        label_limit only that many labels are kept per node: the search is
+        then heuristic, and an empty result proves nothing.
+        """
+        pi = [0.0] + [float(x) for x in list(duals)[1:self.n]]
+        Q = self.capacity
+        limit = Q / 2 if self.bidirectional else math.inf
+        fw = self._sweep(pi, True, limit, label_limit)
+        if self.bidirectional:
+            bw = self._sweep(pi, False, limit, label_limit)
+        else:
+            bw = [[] for _ in range(self.n)]
+            bw[0].append(Label(0, 0.0, 0, self.due[0], 0, None))
+        for bucket in fw + bw:
+            bucket.sort(key=lambda label: label.cost)
+
+        d, s = self.dist, self.service
+        # max-heap (negated) of the best max_routes reduced costs found so far
+        best = []
+        found = {}
+        for i in range(self.n):
+            targets = self.succ[i] + [0] if i in self.closes else self.succ[i]
+            # cheapest completion of any forward label at i: buckets are sorted,
+            # so once a label plus it cannot beat the threshold no later one can
+            tail = min((d[i][j] + bw[j][0].cost for j in targets if bw[j]), default=math.inf)
+            for f in fw[i]:
+                if f.cost + tail >= (-best[0] if len(best) == max_routes else -tol):
+                    break
+                for j in targets:
+                    if f.visits >> j & 1:
+                        continue
+                    base = f.cost + d[i][j]
+                    for g in bw[j]:
+                        rc = base + g.cost
+                        threshold = -best[0] if len(best) == max_routes else -tol
+                        if rc >= threshold:
+                            break
+                        if f.load + g.load > Q or f.time + s[i] + d[i][j] > g.time:
+                            continue
+                        if self.ng_masks is None and f.visits & g.visits:
+                            continue
+                        route = f.path()[::-1] + g.path()
+                        if self.ng_masks is not None and not _ng_feasible(route, self.ng_masks):
+                            continue
+                        key = tuple(route)
+                        if key in found:
+                            continue
+                        found[key] = rc
+                        heapq.heappush(best, -rc)
+                        if len(best) > max_routes:
+                            heapq.heappop(best)
+        routes = sorted((rc, list(r)) for r, rc in found.items())
+        return routes[:max_routes]
@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+
+from .distances import LazyDistanceMatrix, euclidean_matrix
+from .instance import Instance
+
+# ===========================
+# Standard instance formats
+# ===========================
+# CVRPLIB / TSPLIB (.vrp, .sol) and Solomon VRPTW (.txt). Node 0 is always
+# the depot, customers follow in file order, so CVRPLIB .sol customer ids
+# (1..n-1) index the instance directly.
+
+
+def _vrplib_sections(path):
+    header, sections, current = {}, {}, None
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line == "EOF":
+                continue
+            key = line.split(":")[0].strip()
+            if key.endswith("SECTION"):
+                current = sections.setdefault(key, [])
+            elif ":" in line and not line[0].isdigit() and line[0] != "-":
+                header[key] = line.split(":", 1)[1].strip()
+                current = None
+            elif current is not None:
+                current.extend(line.split())
+    return header, sections
+
+
+def _explicit_matrix(values, n, fmt):
+    dist = np.zeros((n, n))
+    if fmt == "FULL_MATRIX":
+        return np.asarray(values, dtype=float)[:n * n].reshape(n, n)
+    if fmt in ("LOWER_ROW", "LOWER_DIAG_ROW"):
+        cells = [(i, j) for i in range(n) for j in range(i + (fmt == "LOWER_DIAG_ROW"))]
+    elif fmt in ("UPPER_ROW", "UPPER_DIAG_ROW"):
+        cells = [(i, j) for i in range(n) for j in range(i + (fmt == "UPPER_ROW"), n)]
+    else:
+        raise ValueError(f"unsupported EDGE_WEIGHT_FORMAT {fmt}")
+    rows, cols = np.array(cells).T
+    dist[rows, cols] = np.asarray(values[:len(cells)], dtype=float)
+    dist[cols, rows] = dist[rows, cols]
+    return dist
+
+
+def read_vrplib(path, round_distances=True, max_bytes=None):
+    """
+    CVRPLIB/TSPLIB .vrp file. EUC_2D distances are rounded to the nearest
+    integer as TSPLIB prescribes (best-known costs assume it) unless
+    round_distances is False; EXPLICIT matrices are read as given. If a
+    coordinate matrix would exceed `max_bytes` it is computed lazily.
+    Optional TIME_WINDOW_SECTION / SERVICE_TIME_SECTION are honoured; TSP
+    files (no CAPACITY / DEMAND_SECTION) get zero demands.
+    """
+    header, sections = _vrplib_sections(path)
+    n = int(header["DIMENSION"])
+    capacity = int(float(header.get("CAPACITY", 0)))
+    depot = int(sections.get("DEPOT_SECTION", ["1"])[0])
+
+    def table(name, width):
+        values = sections[name]
+        rows = np.asarray(values[:n * (width + 1)], dtype=float).reshape(n, width + 1)
+        return {int(r[0]): r[1:] for r in rows}
+
+    ids = [depot] + [i for i in range(1, n + 1) if i != depot]
+    if "DEMAND_SECTION" in sections:
+        demand = table("DEMAND_SECTION", 1)
+        demands = np.array([int(demand[i][0]) for i in ids])
+    else:
+        demands = np.zeros(n, dtype=int)
+    coords = None
+    if "NODE_COORD_SECTION" in sections:
+        xy = table("NODE_COORD_SECTION", 2)
+        coords = np.array([xy[i] for i in ids])
+
+    weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    if weight_type == "EXPLICIT":
+        full = _explicit_matrix(sections["EDGE_WEIGHT_SECTION"], n,
+                                header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"))
+        order = np.array(ids) - 1
+        dist = full[np.ix_(order, order)]
+    elif coords is not None and max_bytes is not None and n * n * 8 > max_bytes:
+        dist = LazyDistanceMatrix(coords, max_bytes=max_bytes,
+                                  rounded=round_distances and weight_type == "EUC_2D")
+    elif coords is not None:
+        dist = euclidean_matrix(coords)
+        if round_distances and weight_type == "EUC_2D":
+            dist = np.rint(dist)
+    else:
+        raise ValueError(f"{path}: no coordinates for EDGE_WEIGHT_TYPE {weight_type}")
+
+    ready = due = service = None
+    if "TIME_WINDOW_SECTION" in sections:
+        tw = table("TIME_WINDOW_SECTION", 2)
+        ready = [tw[i][0] for i in ids]
+        due = [tw[i][1] for i in ids]
+    if "SERVICE_TIME_SECTION" in sections:
+        st = table("SERVICE_TIME_SECTION", 1)
+        service = [st[i][0] for i in ids]
+    return Instance(dist, demands, capacity, ready, due, service, coords=coords)
+
+
+def read_solomon(path, decimals=None, max_bytes=None):
+    """
+    Solomon VRPTW file (VEHICLE / CUSTOMER tables). Distances are plain
+    Euclidean; pass `decimals` to truncate them as some papers do. Without
+    decimals, a matrix over `max_bytes` is computed lazily.
+    """
+    with open(path) as f:
+        lines = [line.split() for line in f]
+    capacity, rows = None, []
+    for k, tokens in enumerate(lines):
+        if tokens[:1] == ["NUMBER"] and "CAPACITY" in tokens:
+            capacity = int(next(t for t in lines[k + 1:] if t)[1])
+        elif len(tokens) == 7 and all(t.replace(".", "", 1).isdigit() for t in tokens):
+            rows.append([float(t) for t in tokens])
+    if capacity is None or not rows:
+        raise ValueError(f"{path} is not a Solomon instance")
+    data = np.array(rows)
+    coords = data[:, 1:3]
+    n = len(coords)
+    if decimals is None and max_bytes is not None and n * n * 8 > max_bytes:
+        dist = LazyDistanceMatrix(coords, max_bytes=max_bytes)
+    else:
+        dist = euclidean_matrix(coords)
+    if decimals is not None:
+        dist = np.trunc(dist * 10 ** decimals) / 10 ** decimals
+    return Instance(dist, data[:, 3].astype(int), capacity,
+                    ready=data[:, 4], due=data[:, 5], service=data[:, 6], coords=coords)
+
+
+def read_solution(path):
+    """CVRPLIB .sol file: (routes with depots added, cost or None)."""
+    routes, cost = [], None
+    with open(path) as f:
+        for line in f:
+            if line.lower().startswith("route"):
+                routes.append([0] + [int(c) for c in line.split(":", 1)[1].split()] + [0])
+            elif line.lower().startswith("cost"):
+                cost = float(line.split()[1])
+    return routes, cost
+
+
+def is_bundle(path):
+    """Whether `path` is a directory written by Instance.save / vrp_core.bundle."""
+    return os.path.isfile(os.path.join(path, "capacity.npy"))
+
+
+def read_instance(path, mmap_mode="r", **kwargs):
+    """
+    Dispatch on content: a compiled bundle directory is memory-mapped with
+    Instance.load (zero-copy, pages shared across processes), TSPLIB-style
+    headers mean CVRPLIB, else Solomon.
+    """
+    if is_bundle(path):
+        return Instance.load(path, mmap_mode=mmap_mode)
+    with open(path) as f:
+        head = f.read(2048)
+    if "DIMENSION" in head or os.path.splitext(path)[1] == ".vrp":
+        return read_vrplib(path, **kwargs)
+    return read_solomon(path, **kwargs)
@@ -0,0 +1,171 @@
+# ===========================
+# Solution with cached per-route cost and load
+# ===========================
+class Solution:
+    """
+    A list of routes (each [0, ..., 0]) that caches every route's cost and
+    load. Operators call `route_for_write` before changing a route; only
+    those routes are re-evaluated by `cost`. Copies share unchanged route
+    lists (copy-on-write), so copying is O(routes), not O(customers).
+    Route Zobrist hashes are cached the same way, so `zobrist` after a move
+    rehashes only the changed routes and XORs them into the base hash.
+    """
+
+    def __init__(self, instance, routes, penalty=1000):
+        self.instance = instance
+        self.penalty = penalty
+        self.routes = [list(r) for r in routes]
+        self._owned = [True] * len(self.routes)
+        self._cost = [0] * len(self.routes)
+        self._load = [0] * len(self.routes)
+        self._dirty = set(range(len(self.routes)))
+        self._total = 0
+        self._memory = None
+        self._hash = [0] * len(self.routes)
+        self._hash_dirty = set(range(len(self.routes)))
+        self._hash_total = 0
+
+    def copy(self):
+        new = Solution.__new__(Solution)
+        new.instance = self.instance
+        new.penalty = self.penalty
+        new.routes = self.routes[:]
+        new._owned = [False] * len(self.routes)
+        self._owned = [False] * len(self.routes)
+        new._cost = self._cost[:]
+        new._load = self._load[:]
+        new._dirty = set(self._dirty)
+        new._total = self._total
+        new._memory = self._memory
+        new._hash = self._hash[:]
+        new._hash_dirty = set(self._hash_dirty)
+        new._hash_total = self._hash_total
+        return new
+
+    def __len__(self):
+        return len(self.routes)
+
+    # ===========================
+    # Mutation
+    # ===========================
+    def route_for_write(self, r_idx):
+        """Return route r_idx for in-place editing and mark it dirty."""
+        if not self._owned[r_idx]:
+            self.routes[r_idx] = self.routes[r_idx][:]
+            self._owned[r_idx] = True
+        self._dirty.add(r_idx)
+        self._hash_dirty.add(r_idx)
+        return self.routes[r_idx]
+
+    def set_route(self, r_idx, route):
+        self.routes[r_idx] = route
+        self._owned[r_idx] = True
+        self._dirty.add(r_idx)
+        self._hash_dirty.add(r_idx)
+
+    def append_route(self, route):
+        self.routes.append(route)
+        self._owned.append(True)
+        self._cost.append(0)
+        self._load.append(0)
+        self._hash.append(0)
+        self._dirty.add(len(self.routes) - 1)
+        self._hash_dirty.add(len(self.routes) - 1)
+
+    def pop_route(self, r_idx):
+        self._refresh()
+        self._total -= self._route_objective(r_idx)
+        for cache in (self._owned, self._cost, self._load):
+            cache.pop(r_idx)
+        self._refresh_hash()
+        self._hash_total ^= self._hash.pop(r_idx)
+        return self.routes.pop(r_idx)
+
+    # ===========================
+    # Evaluation
+    # ===========================
+    def _route_objective(self, r_idx):
+        over = self._load[r_idx] - self.instance.capacity
+        return self._cost[r_idx] + (self.penalty * over if over > 0 else 0)
+
+    def _refresh(self):
+        for r_idx in self._dirty:
+            self._total -= self._route_objective(r_idx)
+            route = self.routes[r_idx]
+            self._cost[r_idx] = self.instance.route_cost(route)
+            self._load[r_idx] = self.instance.route_load(route)
+            self._total += self._route_objective(r_idx)
+        self._dirty.clear()
+
+    def evaluate(self, route):
+        """Objective (cost plus penalty) of a route that is not stored yet."""
+        over = self.instance.route_load(route) - self.instance.capacity
+        return self.instance.route_cost(route) + (self.penalty * over if over > 0 else 0)
+
+    def route_objective(self, r_idx):
+        self._refresh()
+        return self._route_objective(r_idx)
+
+    def route_cost(self, r_idx):
+        self._refresh()
+        return self._cost[r_idx]
+
+    def route_load(self, r_idx):
+        self._refresh()
+        return self._load[r_idx]
+
+    def cost(self):
+        """Distance plus capacity penalty; re-evaluates only dirty routes."""
+        self._refresh()
+        return self._total
+
+    def num_customers(self):
+        return sum(len(r) - 2 for r in self.routes)
+
+    def customers(self):
+        return [c for route in self.routes for c in route[1:-1]]
+
+    def positions(self):
+        """{customer: (route_idx, pos)} for the whole solution."""
+        return {c: (r_idx, i) for r_idx, route in enumerate(self.routes)
+                for i, c in enumerate(route) if c != 0}
+
+    def position(self, k):
+        """(route_idx, pos) of the k-th customer in route order."""
+        for r_idx, route in enumerate(self.routes):
+            if k < len(route) - 2:
+                return r_idx, k + 1
+            k -= len(route) - 2
+        raise IndexError("customer index out of range")
+
+    # ===========================
+    # Zobrist hash
+    # ===========================
+    def _refresh_hash(self):
+        if self._memory is None:
+            self._hash_dirty.clear()
+            return
+        for r_idx in self._hash_dirty:
+            self._hash_total ^= self._hash[r_idx]
+            self._hash[r_idx] = self._memory.route_hash(self.routes[r_idx])
+            self._hash_total ^= self._hash[r_idx]
+        self._hash_dirty.clear()
+
+    def zobrist(self, memory):
+        """
+        Hash of the solution under `memory` (a SolutionMemory). Only routes
+        changed since the last call are rehashed; the first call, or one
+        with another memory, hashes every route.
+        """
+        if memory is not self._memory:
+            self._memory = memory
+            self._hash_total = 0
+            self._hash = [0] * len(self.routes)
+            self._hash_dirty = set(range(len(self.routes)))
+        self._refresh_hash()
+        return self._hash_total
+
+    def route_zobrist(self, r_idx, memory):
+        """Cached hash of route r_idx under `memory`."""
+        self.zobrist(memory)
+        return self._hash[r_idx]
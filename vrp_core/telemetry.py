@@ -0,0 +1,136 @@
+import json
+import time
+from collections import defaultdict, deque
+
+# ===========================
+# Per-iteration telemetry
+# ===========================
+# Solvers take `telemetry=None`. When it is None they skip every telemetry
+# call behind one `is not None` test, so disabled telemetry costs nothing
+# measurable. When set, each iteration emits one event dict:
+#
+#   solver, iteration, elapsed (s since start), current, best, operator,
+#   accepted, new_best, temperature (SA-type acceptance only), and
+#   phases = {phase name: microseconds}
+#
+# and every sink (any callable taking the event) receives it.
+
+
+class Stopwatch:
+    """Splits one iteration into named phases, in microseconds."""
+
+    __slots__ = ("phases", "_last")
+
+    def __init__(self):
+        self.phases = {}
+        self._last = time.perf_counter_ns()
+
+    def lap(self, name):
+        now = time.perf_counter_ns()
+        self.phases[name] = self.phases.get(name, 0) + (now - self._last) // 1000
+        self._last = now
+
+
+class Telemetry:
+    """Fan events out to sinks; `Telemetry(RingBuffer(), Counters())`."""
+
+    def __init__(self, *sinks, solver=None):
+        self.sinks = list(sinks)
+        self.solver = solver
+        self._start = time.perf_counter()
+
+    def start(self, solver=None):
+        """Reset the clock; solvers call this once before their first iteration."""
+        self.solver = solver or self.solver
+        self._start = time.perf_counter()
+
+    def stopwatch(self):
+        return Stopwatch()
+
+    def emit(self, iteration, current, best, operator=None, accepted=None, new_best=False,
+             temperature=None, stopwatch=None, **extra):
+        event = {
+            "solver": self.solver,
+            "iteration": iteration,
+            "elapsed": time.perf_counter() - self._start,
+            "current": current,
+            "best": best,
+            "operator": operator,
+            "accepted": accepted,
+            "new_best": new_best,
+            "temperature": temperature,
+            "phases": stopwatch.phases if stopwatch is not None else {},
+        }
+        event.update(extra)
+        for sink in self.sinks:
+            sink(event)
+
+    def close(self):
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+
+# ===========================
+# Built-in sinks
+# ===========================
+class RingBuffer:
+    """Keep the last `size` events in memory."""
+
+    def __init__(self, size=10000):
+        self.events = deque(maxlen=size)
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def anytime_curve(self):
+        """[(elapsed, best)] at every improvement of the best cost."""
+        curve = []
+        for event in self.events:
+            if not curve or event["best"] < curve[-1][1]:
+                curve.append((event["elapsed"], event["best"]))
+        return curve
+
+
+class JsonlSink:
+    """Append one JSON line per event to `path`."""
+
+    def __init__(self, path, mode="w"):
+        self.file = open(path, mode)
+
+    def __call__(self, event):
+        self.file.write(json.dumps(event, default=float) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class Counters:
+    """
+    Aggregates per operator: calls, accepted, new bests, and total
+    microseconds per phase, for profiling where the time goes.
+    """
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.accepted = defaultdict(int)
+        self.new_best = defaultdict(int)
+        self.phase_us = defaultdict(lambda: defaultdict(int))
+        self.iterations = 0
+
+    def __call__(self, event):
+        op = event["operator"]
+        self.iterations += 1
+        self.calls[op] += 1
+        self.accepted[op] += bool(event["accepted"])
+        self.new_best[op] += bool(event["new_best"])
+        for phase, us in event["phases"].items():
+            self.phase_us[op][phase] += us
+
+    def summary(self):
+        """{operator: {"calls", "accepted", "new_best", "<phase>_us", ...}}."""
+        return {op: {"calls": self.calls[op], "accepted": self.accepted[op],
+                     "new_best": self.new_best[op],
+                     **{f"{phase}_us": us for phase, us in self.phase_us[op].items()}}
+                for op in self.calls}
@@ -0,0 +1,81 @@
+import math
+import time
+
+# ===========================
+# Anytime stopping criteria
+# ===========================
+class Termination:
+    """
+    When to stop a metaheuristic. Any combination of
+
+        time_limit      wall-clock seconds since `start`
+        max_stall       iterations in a row without a new best
+        target          stop once the best cost is <= target
+        cancel          any object with is_set(), e.g. threading.Event or
+                        multiprocessing.Event, set from outside
+        max_iterations  iteration cap
+
+    Solvers call `start()` once and `should_stop(iteration, best_cost)` at
+    the top of every iteration, then return their incumbent; `reason` tells
+    which criterion fired and `iteration` where. Long inner loops (local
+    search) may also poll `expired()`. One object serves one run at a time.
+    """
+
+    def __init__(self, time_limit=None, max_stall=None, target=None, cancel=None,
+                 max_iterations=None, tol=1e-9):
+        self.time_limit = time_limit
+        self.max_stall = max_stall
+        self.target = target
+        self.cancel = cancel
+        self.max_iterations = max_iterations
+        self.tol = tol
+        self.start()
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._best = math.inf
+        self.stall = 0
+        self.iteration = 0
+        self.reason = None
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def progress(self, iteration):
+        """Fraction of the iteration or time budget used (0 when neither is set)."""
+        fractions = [0.0]
+        if self.max_iterations:
+            fractions.append(iteration / self.max_iterations)
+        if self.time_limit:
+            fractions.append(self.elapsed() / self.time_limit)
+        return min(1.0, max(fractions))
+
+    def expired(self):
+        """
+        Time limit or cancellation only, for checks inside a long iteration:
+        unlike should_stop it counts no iteration, so stall is unaffected.
+        """
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+        elif self.time_limit is not None and self.elapsed() >= self.time_limit:
+            self.reason = "time_limit"
+        return self.reason is not None
+
+    def should_stop(self, iteration, best_cost):
+        self.iteration = iteration
+        if best_cost < self._best - self.tol:
+            self._best = best_cost
+            self.stall = 0
+        else:
+            self.stall += 1
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+        elif self.target is not None and best_cost <= self.target:
+            self.reason = "target"
+        elif self.max_iterations is not None and iteration >= self.max_iterations:
+            self.reason = "max_iterations"
+        elif self.time_limit is not None and self.elapsed() >= self.time_limit:
+            self.reason = "time_limit"
+        elif self.max_stall is not None and self.stall > self.max_stall:
+            self.reason = "stall"
+        return self.reason is not None
@@ -0,0 +1,137 @@
+# ===========================
+# Time-window segment data
+# ===========================
+# A route segment is summarized by its duration (travel + service + waiting),
+# its time warp (how much it would have to go back in time to meet every
+# due date; 0 = feasible), and the earliest / latest service start at its
+# first node that achieves that duration and time warp. Two segments join
+# in O(1), so a move that splices together prefix, moved part and suffix
+# is checked without simulating the route.
+
+
+class Segment:
+    __slots__ = ("first", "last", "duration", "time_warp", "earliest", "latest")
+
+    def __init__(self, first, last, duration, time_warp, earliest, latest):
+        self.first = first
+        self.last = last
+        self.duration = duration
+        self.time_warp = time_warp
+        self.earliest = earliest
+        self.latest = latest
+
+    @classmethod
+    def node(cls, instance, i):
+        return cls(i, i, float(instance.service[i]), 0.0,
+                   float(instance.ready[i]), float(instance.due[i]))
+
+    def feasible(self, tol=1e-9):
+        return self.time_warp <= tol
+
+
+def concat(instance, a, b):
+    """Segment for a followed by b, joined by the arc (a.last, b.first)."""
+    delta = a.duration - a.time_warp + float(instance.dist[a.last, b.first])
+    wait = max(b.earliest - delta - a.latest, 0.0)
+    warp = max(a.earliest + delta - b.latest, 0.0)
+    return Segment(a.first, b.last,
+                   a.duration + b.duration + float(instance.dist[a.last, b.first]) + wait,
+                   a.time_warp + b.time_warp + warp,
+                   max(b.earliest - delta, a.earliest) - wait,
+                   min(b.latest - delta, a.latest) + warp)
+
+
+def route_segment(instance, nodes):
+    """Segment data of a node sequence, folded left to right in O(len)."""
+    seg = Segment.node(instance, nodes[0])
+    for i in nodes[1:]:
+        seg = concat(instance, seg, Segment.node(instance, i))
+    return seg
+
+
+# ===========================
+# Per-route schedule with O(1) move checks
+# ===========================
+class RouteTimes:
+    """
+    Schedule of one route [0, ..., 0] using the instance's ready/due/service
+    arrays. `earliest[p]` is the earliest service start at position p when
+    leaving the depot as early as possible; `latest[p]` is the latest service
+    start at p from which the rest of the route still meets its due dates
+    (forward time slack = latest - earliest). Prefix and suffix segments are
+    stored too, so inserting, removing or splicing is decided in O(1).
+    Rebuild (O(len)) after the route changes.
+    """
+
+    def __init__(self, instance, route):
+        self.instance = instance
+        self.route = list(route)
+        dist = instance.dist
+        ready, due, service = instance.ready, instance.due, instance.service
+        n = len(self.route)
+        earliest = [0.0] * n
+        earliest[0] = float(ready[self.route[0]])
+        for p in range(1, n):
+            i, j = self.route[p - 1], self.route[p]
+            earliest[p] = max(float(ready[j]), earliest[p - 1] + float(service[i]) + float(dist[i, j]))
+        latest = [0.0] * n
+        latest[-1] = float(due[self.route[-1]])
+        for p in range(n - 2, -1, -1):
+            i, j = self.route[p], self.route[p + 1]
+            latest[p] = min(float(due[i]), latest[p + 1] - float(dist[i, j]) - float(service[i]))
+        self.earliest, self.latest = earliest, latest
+
+        self._prefix = [Segment.node(instance, self.route[0])]
+        for j in self.route[1:]:
+            self._prefix.append(concat(instance, self._prefix[-1], Segment.node(instance, j)))
+        self._suffix = [Segment.node(instance, self.route[-1])]
+        for j in reversed(self.route[:-1]):
+            self._suffix.append(concat(instance, Segment.node(instance, j), self._suffix[-1]))
+        self._suffix.reverse()
+
+    def feasible(self, tol=1e-9):
+        return all(e <= l + tol for e, l in zip(self.earliest, self.latest))
+
+    def slack(self, p):
+        """How far service at position p can be delayed without breaking the route."""
+        return self.latest[p] - self.earliest[p]
+
+    def prefix(self, p):
+        """Segment of positions 0..p."""
+        return self._prefix[p]
+
+    def suffix(self, p):
+        """Segment of positions p..end."""
+        return self._suffix[p]
+
+    def _start_after(self, p, j):
+        # earliest service start at node j when coming straight from position p
+        i = self.route[p]
+        return max(float(self.instance.ready[j]),
+                   self.earliest[p] + float(self.instance.service[i]) + float(self.instance.dist[i, j]))
+
+    def can_insert(self, c, pos, tol=1e-9):
+        """Whether c can be inserted before position pos (1..len-1)."""
+        start = self._start_after(pos - 1, c)
+        if start > float(self.instance.due[c]) + tol:
+            return False
+        nxt = self.route[pos]
+        arrival = start + float(self.instance.service[c]) + float(self.instance.dist[c, nxt])
+        return max(arrival, float(self.instance.ready[nxt])) <= self.latest[pos] + tol
+
+    def can_remove(self, pos, tol=1e-9):
+        """Whether dropping the customer at pos keeps the route feasible."""
+        return self._start_after(pos - 1, self.route[pos + 1]) <= self.latest[pos + 1] + tol
+
+    def can_splice(self, i, segment, j, tol=1e-9):
+        """
+        Whether positions 0..i, then `segment`, then positions j..end form a
+        feasible route. Covers relocate, exchange and 2-opt* between routes.
+        """
+        seg = concat(self.instance, self._prefix[i], segment) if segment is not None else self._prefix[i]
+        return concat(self.instance, seg, self._suffix[j]).time_warp <= tol
+
+
+def route_feasible(instance, route, tol=1e-9):
+    """Time-window feasibility of a whole route, O(len)."""
+    return route_segment(instance, route).time_warp <= tol
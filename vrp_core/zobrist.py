@@ -0,0 +1,121 @@
+from collections import OrderedDict, deque
+
+import numpy as np
+
+# ===========================
+# Zobrist hashing of solutions
+# ===========================
+# A solution is identified by its set of arcs (customer arcs are unique, and
+# depot arcs (0, c) / (c, 0) name the customer), so its hash is the XOR of a
+# random 64-bit key per arc. The key is splitmix64 of (i, j), so nothing of
+# size n x n is stored. XOR makes the hash independent of route order and
+# lets a move update it in O(1): XOR out the arcs it breaks, XOR in the arcs
+# it creates.
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(x):
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def _mix_array(x):
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class SolutionMemory:
+    """
+    Zobrist hashes plus a bounded LRU cache of solution costs and an optional
+    tabu list (the last `tabu_tenure` hashes marked tabu). `stats()` reports
+    cache hits, misses and hit rate for sizing.
+    """
+
+    def __init__(self, cache_size=10000, tabu_tenure=None, seed=0):
+        self.seed = _mix(seed)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.tabu_tenure = tabu_tenure
+        self._tabu = set()
+        self._tabu_order = deque()
+
+    # ===========================
+    # Hashing
+    # ===========================
+    def arc(self, i, j):
+        return _mix(((int(i) << 32) | int(j)) ^ self.seed)
+
+    def route_hash(self, route):
+        # empty routes [0, 0] are no part of the solution
+        r = np.asarray(route, dtype=np.uint64)
+        if len(r) <= 2:
+            return 0
+        keys = _mix_array(((r[:-1] << np.uint64(32)) | r[1:]) ^ np.uint64(self.seed))
+        return int(np.bitwise_xor.reduce(keys))
+
+    def solution_hash(self, routes):
+        h = 0
+        for route in routes:
+            h ^= self.route_hash(route)
+        return h
+
+    def set_hash(self, nodes):
+        """Hash of a set of nodes, from self-loop keys (i, i) that no route uses."""
+        h = 0
+        for i in nodes:
+            h ^= self.arc(i, i)
+        return h
+
+    def move_hash(self, h, removed, added):
+        """Hash after a move that breaks the `removed` arcs and creates the `added` ones."""
+        for i, j in removed:
+            h ^= self.arc(i, j)
+        for i, j in added:
+            h ^= self.arc(i, j)
+        return h
+
+    # ===========================
+    # Cost cache (LRU)
+    # ===========================
+    def lookup(self, h):
+        """Cached cost of the solution with hash h, or None."""
+        cost = self._cache.get(h)
+        if cost is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(h)
+        return cost
+
+    def store(self, h, cost):
+        self._cache[h] = cost
+        self._cache.move_to_end(h)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ===========================
+    # Tabu list
+    # ===========================
+    def is_tabu(self, h):
+        return h in self._tabu
+
+    def make_tabu(self, h):
+        if not self.tabu_tenure or h in self._tabu:
+            return
+        self._tabu.add(h)
+        self._tabu_order.append(h)
+        if len(self._tabu_order) > self.tabu_tenure:
+            self._tabu.discard(self._tabu_order.popleft())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache),
+                "hit_rate": self.hits / lookups if lookups else 0.0, "tabu": len(self._tabu)}